@@ -0,0 +1,291 @@
+"""
+Cache d'embeddings persistant - Semantic Pulse X
+Stockage adressé par contenu (hash modèle + texte) sur matrice float32 mmap,
+index SQLite partagé entre processus (allocation des lignes transactionnelle)
+"""
+
+import atexit
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.backend.core.config import settings
+
+# Limite de variables SQLite par requête
+LOOKUP_CHUNK = 500
+
+
+class EmbeddingCache:
+    """Cache disque des embeddings avec éviction LRU bornée"""
+
+    def __init__(self, model_name: str, dimension: int, cache_dir: str = None, max_entries: int = None):
+        self.model_name = model_name
+        self.dimension = dimension
+        self.cache_dir = Path(cache_dir or settings.embedding_cache_dir)
+        self.max_entries = max_entries or settings.embedding_cache_max_entries
+
+        slug = re.sub(r'[^\w.-]', '_', model_name)
+        self.matrix_path = self.cache_dir / f"{slug}.f32"
+        self.index_path = self.cache_dir / f"{slug}.index.sqlite"
+        self.legacy_index_path = self.cache_dir / f"{slug}.index.json"
+
+        # Index: clé -> ligne dans la matrice, dernier accès (table SQLite, WAL)
+        self.connection: sqlite3.Connection | None = None
+        self.capacity = 0
+        self.matrix = None
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+
+        self._open()
+        atexit.register(self.close)
+
+    def _open(self):
+        """Ouvre (ou crée) l'index SQLite et la matrice mmap"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # Transactions explicites: BEGIN IMMEDIATE sérialise les écrivains entre processus
+        connection = sqlite3.connect(
+            self.index_path, timeout=settings.sqlite_busy_timeout / 1000,
+            check_same_thread=False, isolation_level=None
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, row INTEGER NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS ix_entries_accessed ON entries (accessed_at)")
+        connection.execute("CREATE TABLE IF NOT EXISTS free_rows (row INTEGER PRIMARY KEY)")
+        connection.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self.connection = connection
+
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            dimension = self._get_meta('dimension')
+            if dimension != self.dimension:
+                if dimension is not None:
+                    print("⚠️ Dimension du cache d'embeddings différente, réinitialisation")
+                connection.execute("DELETE FROM entries")
+                connection.execute("DELETE FROM free_rows")
+                self._set_meta('dimension', self.dimension)
+                self._set_meta('next_row', 0)
+                if dimension is not None or not self._import_legacy_index():
+                    with open(self.matrix_path, 'ab') as f:
+                        f.truncate(0)
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+        self._remap()
+
+    def _import_legacy_index(self) -> bool:
+        """Reprend l'ancien index JSON (même matrice) à la création de l'index SQLite"""
+        if not self.legacy_index_path.exists() or not self.matrix_path.exists():
+            return False
+
+        try:
+            with open(self.legacy_index_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('dimension') != self.dimension:
+                return False
+
+            # L'ancienne horloge logique préserve l'ordre LRU (entrées plus anciennes que les nouvelles)
+            self.connection.executemany(
+                "INSERT INTO entries VALUES (?, ?, ?)",
+                [(key, row, clock) for key, (row, clock) in meta.get('entries', {}).items()]
+            )
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO free_rows VALUES (?)", [(row,) for row in meta.get('free_rows', [])]
+            )
+            self._set_meta('next_row', meta.get('next_row', len(meta.get('entries', {}))))
+            self.legacy_index_path.unlink()
+            print(f"✅ Index du cache d'embeddings migré vers SQLite: {self.index_path}")
+            return True
+        except Exception as e:
+            print(f"⚠️ Ancien index du cache d'embeddings ignoré: {e}")
+            return False
+
+    def _get_meta(self, name: str) -> int | None:
+        row = self.connection.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, name: str, value: int):
+        self.connection.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (name, value))
+
+    def _remap(self):
+        """Mappe la matrice à sa taille courante sur disque (agrandie éventuellement par un autre processus)"""
+        if self.matrix is not None:
+            self.matrix.flush()
+            self.matrix = None
+
+        size = self.matrix_path.stat().st_size if self.matrix_path.exists() else 0
+        self.capacity = size // (4 * self.dimension)
+        if self.capacity:
+            self.matrix = np.memmap(self.matrix_path, dtype=np.float32, mode='r+',
+                                    shape=(self.capacity, self.dimension))
+
+    def _ensure_mapped(self, row: int):
+        if row >= self.capacity:
+            self._remap()
+
+    def _grow(self, rows: int):
+        """Agrandit le fichier de la matrice (appelé dans une transaction d'écriture)"""
+        capacity = min(max(rows, self.capacity * 2, 4096), self.max_entries)
+        if capacity * self.dimension * 4 > (self.matrix_path.stat().st_size if self.matrix_path.exists() else 0):
+            with open(self.matrix_path, 'ab') as f:
+                f.truncate(capacity * self.dimension * 4)
+        self._remap()
+
+    def make_key(self, cleaned_text: str) -> str:
+        """Clé de contenu: hash(modèle, texte nettoyé)"""
+        return hashlib.sha1(f"{self.model_name}\x00{cleaned_text}".encode()).hexdigest()
+
+    def _lookup(self, keys: list[str]) -> dict[str, int]:
+        rows = {}
+        for start in range(0, len(keys), LOOKUP_CHUNK):
+            chunk = keys[start:start + LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows.update(self.connection.execute(
+                f"SELECT key, row FROM entries WHERE key IN ({placeholders})", chunk
+            ).fetchall())
+        return rows
+
+    def get_many(self, cleaned_texts: list[str]) -> dict[int, np.ndarray]:
+        """Retourne {position: vecteur} pour les textes présents en cache"""
+        if not cleaned_texts:
+            return {}
+
+        keys = [self.make_key(text) for text in cleaned_texts]
+        found = {}
+        with self._lock:
+            try:
+                rows = self._lookup(list(dict.fromkeys(keys)))
+                if rows:
+                    now = time.time()
+                    self.connection.executemany(
+                        "UPDATE entries SET accessed_at = ? WHERE key = ?", [(now, key) for key in rows]
+                    )
+                    self._ensure_mapped(max(rows.values()))
+                    found = {i: np.array(self.matrix[rows[key]]) for i, key in enumerate(keys) if key in rows}
+            except sqlite3.Error as e:
+                print(f"⚠️ Cache d'embeddings indisponible: {e}")
+
+            self.stats['hits'] += len(found)
+            self.stats['misses'] += len(cleaned_texts) - len(found)
+
+        return found
+
+    def put_many(self, cleaned_texts: list[str], vectors: np.ndarray):
+        """Ajoute des embeddings au cache (éviction LRU si plein), persistés immédiatement"""
+        if len(cleaned_texts) == 0:
+            return
+
+        new_vectors = {}
+        for text, vector in zip(cleaned_texts, vectors, strict=False):
+            new_vectors.setdefault(self.make_key(text), vector)
+
+        if len(new_vectors) > self.max_entries:
+            # Le cache ne peut contenir que max_entries vecteurs: seuls les derniers sont gardés
+            new_vectors = dict(list(new_vectors.items())[-self.max_entries:])
+
+        with self._lock:
+            try:
+                self.connection.execute("BEGIN IMMEDIATE")
+                try:
+                    # Index relu dans la transaction: un autre processus a pu écrire entre-temps
+                    now = time.time()
+                    existing = self._lookup(list(new_vectors))
+                    keys = [key for key in new_vectors if key not in existing]
+                    rows = self._allocate_rows(len(keys))
+
+                    if rows:
+                        self._ensure_mapped(max(rows))
+                        self.matrix[rows] = np.asarray([new_vectors[key] for key in keys], dtype=np.float32)
+                        self.matrix.flush()
+
+                    self.connection.executemany(
+                        "INSERT OR REPLACE INTO entries VALUES (?, ?, ?)",
+                        [(key, row, now) for key, row in zip(keys, rows, strict=False)]
+                    )
+                    self.connection.executemany(
+                        "UPDATE entries SET accessed_at = ? WHERE key = ?", [(now, key) for key in existing]
+                    )
+                    self.connection.execute("COMMIT")
+                except Exception:
+                    self.connection.execute("ROLLBACK")
+                    raise
+            except Exception as e:
+                print(f"❌ Erreur sauvegarde cache d'embeddings: {e}")
+
+    def _allocate_rows(self, count: int) -> list[int]:
+        """Réserve des lignes libres, en agrandissant ou en évinçant (dans la transaction)"""
+        rows = []
+        next_row = self._get_meta('next_row') or 0
+
+        while len(rows) < count:
+            free = self.connection.execute(
+                "SELECT row FROM free_rows LIMIT ?", (count - len(rows),)
+            ).fetchall()
+            if free:
+                self.connection.executemany("DELETE FROM free_rows WHERE row = ?", free)
+                rows.extend(row for (row,) in free)
+                continue
+
+            if next_row < self.max_entries:
+                take = min(count - len(rows), self.max_entries - next_row)
+                if next_row + take > self.capacity:
+                    self._grow(next_row + take)
+                rows.extend(range(next_row, next_row + take))
+                next_row += take
+                continue
+
+            if not self._evict(max(count - len(rows), self.max_entries // 10, 1)):
+                raise RuntimeError(f"Cache d'embeddings plein: {count} lignes demandées pour {self.max_entries}")
+
+        self._set_meta('next_row', next_row)
+        return rows
+
+    def _evict(self, count: int) -> int:
+        """Évince les entrées les moins récemment utilisées (retourne le nombre de lignes libérées)"""
+        oldest = self.connection.execute(
+            "SELECT key, row FROM entries ORDER BY accessed_at LIMIT ?", (count,)
+        ).fetchall()
+        self.connection.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in oldest])
+        self.connection.executemany("INSERT OR IGNORE INTO free_rows VALUES (?)", [(row,) for _, row in oldest])
+        self.stats['evictions'] += len(oldest)
+        return len(oldest)
+
+    def flush(self):
+        """Persiste la matrice sur disque (l'index est validé à chaque écriture)"""
+        with self._lock:
+            if self.matrix is not None:
+                self.matrix.flush()
+
+    def close(self):
+        """Ferme l'index et la matrice (déchargement du moteur ou arrêt du processus)"""
+        atexit.unregister(self.close)
+        with self._lock:
+            if self.matrix is not None:
+                self.matrix.flush()
+                self.matrix = None
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    def get_stats(self) -> dict[str, float]:
+        """Statistiques du cache"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        with self._lock:
+            entries = self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0] if self.connection else 0
+        return {
+            **self.stats,
+            'entries': entries,
+            'capacity': self.capacity,
+            'hit_rate': self.stats['hits'] / lookups if lookups else 0.0
+        }
@@ -7,9 +7,9 @@ from functools import lru_cache
 from typing import Any
 
 import numpy as np
-import torch
-from sentence_transformers import SentenceTransformer
 
+from app.backend.ai.embedding_cache import EmbeddingCache
+from app.backend.ai.model_registry import model_registry
 from app.backend.core.config import settings
 
 
@@ -17,13 +17,21 @@ class EmbeddingEngine:
     """Moteur d'embeddings optimisé"""
 
     def __init__(self, model_name: str = None):
+        import torch
+
         self.model_name = model_name or settings.embedding_model
         self.model = None
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.cache = None
+        self.onnx_encoder = None
         self._load_model()
+        self._load_onnx_backend()
+        self._init_cache()
 
     def _load_model(self):
         """Charge le modèle d'embeddings"""
+        from sentence_transformers import SentenceTransformer
+
         try:
             self.model = SentenceTransformer(self.model_name, device=self.device)
             print(f"✅ Modèle d'embeddings chargé: {self.model_name}")
@@ -32,6 +40,43 @@ class EmbeddingEngine:
             # Fallback vers un modèle plus simple
             self.model = SentenceTransformer('all-MiniLM-L6-v2', device=self.device)
 
+    def _load_onnx_backend(self):
+        """Active le backend onnxruntime si configuré (sinon PyTorch)"""
+        if settings.inference_backend != "onnx" or self.model is None:
+            return
+
+        from app.backend.ai.onnx_backend import ONNXSentenceEncoder, is_onnx_available
+
+        if not is_onnx_available():
+            print("⚠️ onnxruntime absent: backend PyTorch conservé pour les embeddings")
+            return
+
+        try:
+            self.onnx_encoder = ONNXSentenceEncoder(self.model_name, self.model)
+            print(f"✅ Backend ONNX actif pour les embeddings: {self.onnx_encoder.model_path}")
+        except Exception as e:
+            print(f"❌ Erreur backend ONNX embeddings: {e}")
+            self.onnx_encoder = None
+
+    def _encode_model(self, texts: list[str]) -> np.ndarray:
+        """Passe forward du modèle (ONNX si actif, sinon SentenceTransformer)"""
+        if self.onnx_encoder is not None:
+            return self.onnx_encoder.encode(texts)
+        return self.model.encode(texts, convert_to_numpy=True)
+
+    def _init_cache(self):
+        """Initialise le cache disque des embeddings"""
+        # Vecteurs ONNX/int8 légèrement différents: cache distinct
+        cache_name = self.model_name
+        if self.onnx_encoder is not None:
+            cache_name = f"{self.model_name}-{self.onnx_encoder.model_path.stem}"
+
+        try:
+            self.cache = EmbeddingCache(cache_name, self.get_embedding_dimension())
+        except Exception as e:
+            print(f"⚠️ Cache d'embeddings désactivé: {e}")
+            self.cache = None
+
     @lru_cache(maxsize=1000)
     def encode_text(self, text: str) -> np.ndarray:
         """Encode un texte en vecteur"""
@@ -44,9 +89,8 @@ class EmbeddingEngine:
             if not cleaned_text:
                 return np.zeros(384)
 
-            # Encoder
-            embedding = self.model.encode(cleaned_text, convert_to_numpy=True)
-            return embedding
+            # Encoder (via le cache disque)
+            return self._encode_cleaned([cleaned_text])[0]
         except Exception as e:
             print(f"❌ Erreur encodage: {e}")
             return np.zeros(384)
@@ -64,12 +108,31 @@ class EmbeddingEngine:
             return np.array([])
 
         try:
-            embeddings = self.model.encode(cleaned_texts, convert_to_numpy=True)
-            return embeddings
+            return self._encode_cleaned(cleaned_texts)
         except Exception as e:
             print(f"❌ Erreur encodage batch: {e}")
             return np.array([])
 
+    def _encode_cleaned(self, cleaned_texts: list[str]) -> np.ndarray:
+        """Encode des textes nettoyés en ne calculant que les absents du cache"""
+        if self.cache is None:
+            return self._encode_model(cleaned_texts)
+
+        cached = self.cache.get_many(cleaned_texts)
+        missing = [i for i in range(len(cleaned_texts)) if i not in cached]
+
+        embeddings = np.zeros((len(cleaned_texts), self.cache.dimension), dtype=np.float32)
+        for i, vector in cached.items():
+            embeddings[i] = vector
+
+        if missing:
+            missing_texts = [cleaned_texts[i] for i in missing]
+            computed = self._encode_model(missing_texts)
+            embeddings[missing] = computed
+            self.cache.put_many(missing_texts, computed)
+
+        return embeddings
+
     def _clean_text(self, text: str) -> str:
         """Nettoie un texte pour l'encodage"""
         if not text:
@@ -108,25 +171,50 @@ class EmbeddingEngine:
         if not candidates:
             return []
 
-        self.encode_text(query)
-        candidate_embs = self.encode_batch(candidates)
+        return self.find_most_similar_batch([query], candidates, top_k)[0]
 
-        if len(candidate_embs) == 0:
+    def find_most_similar_batch(self, queries: list[str], candidates: list[str], top_k: int = 5) -> list[list[dict[str, Any]]]:
+        """Trouve les textes les plus similaires pour plusieurs requêtes (un seul produit matriciel)"""
+        if not queries:
             return []
+        if not candidates:
+            return [[] for _ in queries]
+
+        query_embs = normalize_rows(self.encode_aligned(queries))
+        candidate_embs = normalize_rows(self.encode_aligned(candidates))
+
+        # Similarités cosinus: (n_requêtes x n_candidats)
+        similarity_matrix = query_embs @ candidate_embs.T
 
-        # Calculer les similarités
-        similarities = []
-        for i, _cand_emb in enumerate(candidate_embs):
-            sim = self.compute_similarity(query, candidates[i])
-            similarities.append({
-                'text': candidates[i],
-                'similarity': sim,
-                'index': i
-            })
+        results = []
+        for scores in similarity_matrix:
+            results.append([
+                {
+                    'text': candidates[i],
+                    'similarity': float(scores[i]),
+                    'index': int(i)
+                }
+                for i in top_k_indices(scores, top_k)
+            ])
 
-        # Trier par similarité
-        similarities.sort(key=lambda x: x['similarity'], reverse=True)
-        return similarities[:top_k]
+        return results
+
+    def encode_aligned(self, texts: list[str]) -> np.ndarray:
+        """Encode des textes en conservant l'alignement (vecteur nul pour un texte vide)"""
+        dimension = self.get_embedding_dimension()
+        embeddings = np.zeros((len(texts), dimension), dtype=np.float32)
+
+        cleaned_texts = [self._clean_text(text) for text in texts]
+        positions = [i for i, text in enumerate(cleaned_texts) if text]
+        if not positions:
+            return embeddings
+
+        try:
+            embeddings[positions] = self._encode_cleaned([cleaned_texts[i] for i in positions])
+        except Exception as e:
+            print(f"❌ Erreur encodage batch: {e}")
+
+        return embeddings
 
     def get_embedding_dimension(self) -> int:
         """Retourne la dimension des embeddings"""
@@ -135,5 +223,23 @@ class EmbeddingEngine:
         return 384  # Dimension par défaut
 
 
-# Instance globale
-embedding_engine = EmbeddingEngine()
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Normalise les lignes d'une matrice (norme L2, lignes nulles conservées)"""
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Indices des top_k meilleurs scores, triés par score décroissant"""
+    if top_k <= 0 or len(scores) == 0:
+        return np.array([], dtype=int)
+
+    top_k = min(top_k, len(scores))
+    candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+    return candidates[np.argsort(-scores[candidates])]
+
+
+# Instance globale (chargée au premier usage ou par le warm-up)
+embedding_engine = model_registry.register("embedding_engine", EmbeddingEngine)
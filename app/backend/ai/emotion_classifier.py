@@ -3,13 +3,12 @@ Classificateur d'émotions - Semantic Pulse X
 Classification émotionnelle optimisée
 """
 
-from functools import lru_cache
 from typing import Any
 
 import numpy as np
-import torch
-from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
 
+from app.backend.ai.model_registry import model_registry
+from app.backend.ai.prediction_cache import prediction_cache
 from app.backend.core.config import settings
 
 
@@ -17,15 +16,27 @@ class EmotionClassifier:
     """Classificateur d'émotions optimisé"""
 
     def __init__(self, model_name: str = None):
+        import torch
+
         self.model_name = model_name or settings.emotion_model
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         self.model = None
         self.tokenizer = None
         self.pipeline = None
+        self.onnx_model = None
+        self.cascade_stats = {}
         self._load_model()
+        self._load_onnx_backend()
+        self.cache_namespace = self._get_cache_namespace()
 
     def _load_model(self):
         """Charge le modèle de classification émotionnelle"""
+        from transformers import (
+            AutoModelForSequenceClassification,
+            AutoTokenizer,
+            pipeline,
+        )
+
         try:
             # Charger le modèle et tokenizer
             self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
@@ -47,6 +58,8 @@ class EmotionClassifier:
 
     def _load_fallback_model(self):
         """Charge un modèle de fallback"""
+        from transformers import pipeline
+
         try:
             self.pipeline = pipeline(
                 "sentiment-analysis",
@@ -58,9 +71,42 @@ class EmotionClassifier:
             print(f"❌ Erreur chargement fallback: {e}")
             self.pipeline = None
 
-    @lru_cache(maxsize=500)
+    def _load_onnx_backend(self):
+        """Active le backend onnxruntime si configuré (sinon PyTorch)"""
+        if settings.inference_backend != "onnx" or self.model is None or self.tokenizer is None:
+            return
+
+        from app.backend.ai.onnx_backend import (
+            ONNXSequenceClassifier,
+            is_onnx_available,
+        )
+
+        if not is_onnx_available():
+            print("⚠️ onnxruntime absent: backend PyTorch conservé pour les émotions")
+            return
+
+        try:
+            self.onnx_model = ONNXSequenceClassifier(self.model_name, self.tokenizer, torch_model=self.model)
+            print(f"✅ Backend ONNX actif pour les émotions: {self.onnx_model.model_path}")
+        except Exception as e:
+            print(f"❌ Erreur backend ONNX émotions: {e}")
+            self.onnx_model = None
+
+    def _get_cache_namespace(self) -> str:
+        """Modèle + version (révision HF) + backend: clé du cache de prédictions"""
+        if self.model is None:
+            return "emotion:fallback:cardiffnlp/twitter-roberta-base-sentiment-latest"
+
+        from app.backend.ai.onnx_backend import model_revision
+
+        revision = model_revision(self.model.config)
+        backend = "torch"
+        if self.onnx_model is not None:
+            backend = "onnx-int8" if self.onnx_model.quantize else "onnx"
+        return f"emotion:{self.model_name}@{revision}:{backend}"
+
     def classify_emotion(self, text: str) -> dict[str, Any]:
-        """Classifie l'émotion d'un texte"""
+        """Classifie l'émotion d'un texte (via le cache de prédictions persistant)"""
         if not text or not text.strip():
             return self._get_neutral_emotion()
 
@@ -70,34 +116,198 @@ class EmotionClassifier:
             if not cleaned_text:
                 return self._get_neutral_emotion()
 
-            # Classification
-            if self.pipeline:
-                result = self.pipeline(cleaned_text)
-
-                if isinstance(result, list) and len(result) > 0:
-                    emotion_data = result[0]
-                    return self._format_emotion_result(emotion_data)
-                else:
-                    return self._get_neutral_emotion()
-            else:
-                return self._get_neutral_emotion()
+            return self._classify_cleaned([(0, cleaned_text)], batch_size=1).get(0, self._get_neutral_emotion())
 
         except Exception as e:
             print(f"❌ Erreur classification émotion: {e}")
             return self._get_neutral_emotion()
 
-    def classify_batch(self, texts: list[str]) -> list[dict[str, Any]]:
-        """Classifie un batch de textes"""
+    def classify_batch(self, texts: list[str], batch_size: int = None, cascade: bool = None) -> list[dict[str, Any]]:
+        """Classifie un batch de textes (mini-batches triés par longueur, cascade lexicale optionnelle)"""
         if not texts:
             return []
 
-        results = []
-        for text in texts:
-            result = self.classify_emotion(text)
-            results.append(result)
+        cascade = settings.emotion_cascade if cascade is None else cascade
+        if cascade:
+            return self.classify_cascade(texts, batch_size=batch_size)
+
+        results = [self._get_neutral_emotion() for _ in texts]
+        for index, result in self._classify_cleaned(self._clean_batch(texts), batch_size).items():
+            results[index] = result
+        return results
+
+    def classify_cascade(self, texts: list[str], batch_size: int = None, min_confidence: float = None,
+                         audit_rate: float = None) -> list[dict[str, Any]]:
+        """
+        Cascade: le scoreur lexical vectorisé résout les textes non ambigus,
+        seuls les textes sous min_confidence ou avec moins de cascade_min_hits termes
+        du lexique passent par le transformer.
+        Un échantillon (audit_rate) des textes résolus est re-vérifié pour mesurer l'accord.
+        """
+        from app.backend.ai.lexicon_classifier import lexicon_scorer
+
+        min_confidence = settings.cascade_min_confidence if min_confidence is None else min_confidence
+        audit_rate = settings.cascade_audit_rate if audit_rate is None else audit_rate
+
+        results = [self._get_neutral_emotion() for _ in texts]
+        cleaned = self._clean_batch(texts)
+        if not cleaned:
+            return results
+
+        lexicon = lexicon_scorer.score([text for _, text in cleaned])
+        escalate = (lexicon["confidence"] < min_confidence) | (lexicon["hits"] < settings.cascade_min_hits)
+        audit = ~escalate & (np.random.default_rng().random(len(cleaned)) < audit_rate)
+
+        for position in np.flatnonzero(~escalate):
+            results[cleaned[position][0]] = self._build_result(
+                str(lexicon["labels"][position]), float(lexicon["confidence"][position])
+            )
+
+        to_model = [cleaned[position] for position in np.flatnonzero(escalate | audit)]
+        model_results = self._classify_cleaned(to_model, batch_size) if to_model else {}
+
+        for position in np.flatnonzero(escalate):
+            index = cleaned[position][0]
+            if index in model_results:
+                results[index] = model_results[index]
+
+        audited = [cleaned[position][0] for position in np.flatnonzero(audit) if cleaned[position][0] in model_results]
+        agreements = sum(
+            results[index]['emotion_principale'] == model_results[index]['emotion_principale'] for index in audited
+        )
+
+        self.cascade_stats = {
+            "texts": len(cleaned),
+            "lexicon_resolved": int((~escalate).sum()),
+            "escalated": int(escalate.sum()),
+            "escalation_rate": float(escalate.mean()),
+            "audited": len(audited),
+            "agreement": agreements / len(audited) if audited else None
+        }
+        return results
+
+    def _clean_batch(self, texts: list[str]) -> list[tuple[int, str]]:
+        """Nettoie les textes et écarte les vides (résultat neutre par défaut)"""
+        cleaned = [(i, self._clean_text(text)) for i, text in enumerate(texts) if text and text.strip()]
+        return [(i, text) for i, text in cleaned if text]
+
+    def _classify_cleaned(self, cleaned: list[tuple[int, str]], batch_size: int = None) -> dict[int, dict[str, Any]]:
+        """Passe transformer sur des textes nettoyés: index d'origine -> résultat (cache persistant d'abord)"""
+        results = {}
+
+        if not cleaned or not self.pipeline:
+            return results
+
+        if settings.prediction_cache_enabled:
+            # Recherche groupée avant batching: seuls les absents passent par le modèle
+            cached = prediction_cache.get_many(self.cache_namespace, [text for _, text in cleaned])
+            for position, result in cached.items():
+                results[cleaned[position][0]] = result
+            cleaned = [item for position, item in enumerate(cleaned) if position not in cached]
+
+            computed = self._classify_uncached(cleaned, batch_size)
+            prediction_cache.put_many(
+                self.cache_namespace,
+                [text for index, text in cleaned if index in computed],
+                [computed[index] for index, _ in cleaned if index in computed]
+            )
+            results.update(computed)
+            return results
+
+        return self._classify_uncached(cleaned, batch_size)
+
+    def _classify_uncached(self, cleaned: list[tuple[int, str]], batch_size: int = None) -> dict[int, dict[str, Any]]:
+        """Mini-batches triés par longueur sur le modèle"""
+        batch_size = batch_size or settings.emotion_inference_batch_size
+        results = {}
+        if not cleaned:
+            return results
+
+        for bucket in self._iter_buckets(cleaned, batch_size):
+            bucket_texts = [text for _, text in bucket]
+
+            try:
+                emotion_data = self._forward_batch(bucket_texts, batch_size)
+            except Exception as e:
+                print(f"❌ Erreur classification batch: {e}")
+                continue
+
+            # Replacer les résultats dans l'ordre d'origine
+            for (index, _), data in zip(bucket, emotion_data, strict=False):
+                results[index] = self._format_emotion_result(data)
 
         return results
 
+    def _iter_buckets(self, cleaned: list[tuple[int, str]], batch_size: int):
+        """
+        Mini-batches triés par longueur (padding limité), bornés en nombre de textes
+        et en tokens paddés (emotion_inference_max_tokens): les textes longs passent par petits lots
+        """
+        if self.tokenizer is not None:
+            max_length = min(self.tokenizer.model_max_length, settings.max_text_length)
+            lengths = [len(ids) for ids in self.tokenizer(
+                [text for _, text in cleaned], truncation=True, max_length=max_length
+            )["input_ids"]]
+        else:
+            # Pipeline de fallback: estimation grossière (~4 caractères par token)
+            lengths = [len(text) // 4 + 2 for _, text in cleaned]
+
+        order = sorted(range(len(cleaned)), key=lengths.__getitem__)
+        bucket = []
+        for position in order:
+            # Trié par longueur croissante: le texte courant fixe la longueur paddée du lot
+            if bucket and (len(bucket) >= batch_size
+                           or (len(bucket) + 1) * lengths[position] > settings.emotion_inference_max_tokens):
+                yield bucket
+                bucket = []
+            bucket.append(cleaned[position])
+        if bucket:
+            yield bucket
+
+    def _forward_batch(self, texts: list[str], batch_size: int) -> list[dict[str, Any]]:
+        """Passe forward unique sur un mini-batch (padding dynamique)"""
+        if self.onnx_model is not None:
+            return self._forward_batch_onnx(texts)
+
+        import torch
+
+        with torch.inference_mode():
+            if self.model is None or self.tokenizer is None:
+                # Modèle de fallback: seul le pipeline est disponible
+                return self.pipeline(texts, batch_size=batch_size, truncation=True)
+
+            max_length = min(self.tokenizer.model_max_length, settings.max_text_length)
+            encoded = self.tokenizer(
+                texts,
+                padding="longest",
+                truncation=True,
+                max_length=max_length,
+                return_tensors="pt"
+            ).to(self.model.device)
+
+            logits = self.model(**encoded).logits
+            scores, label_ids = torch.softmax(logits, dim=-1).max(dim=-1)
+
+        id2label = self.model.config.id2label
+        return [
+            {'label': id2label[int(label_id)], 'score': float(score)}
+            for score, label_id in zip(scores.tolist(), label_ids.tolist(), strict=False)
+        ]
+
+    def _forward_batch_onnx(self, texts: list[str]) -> list[dict[str, Any]]:
+        """Passe forward onnxruntime (softmax numpy, même format que PyTorch)"""
+        max_length = min(self.tokenizer.model_max_length, settings.max_text_length)
+        logits = self.onnx_model.predict_logits(texts, max_length)
+
+        probs = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probs /= probs.sum(axis=1, keepdims=True)
+
+        id2label = self.model.config.id2label
+        return [
+            {'label': id2label[int(label_id)], 'score': float(score)}
+            for score, label_id in zip(probs.max(axis=1), probs.argmax(axis=1), strict=False)
+        ]
+
     def _clean_text(self, text: str) -> str:
         """Nettoie un texte pour la classification"""
         if not text:
@@ -139,22 +349,10 @@ class EmotionClassifier:
             'NEUTRAL': 'neutre'
         }
 
-        emotion = emotion_mapping.get(label, 'neutre')
-
-        # Calculer la polarité
-        if emotion in ['joie', 'amour', 'positif']:
-            polarite = score
-        elif emotion in ['tristesse', 'colere', 'peur', 'negatif']:
-            polarite = -score
-        else:
-            polarite = 0.0
+        return self._build_result(emotion_mapping.get(label, 'neutre'), score)
 
-        return {
-            'emotion_principale': emotion,
-            'score_emotion': float(score),
-            'polarite': float(polarite),
-            'confiance': float(score)
-        }
+    def _build_result(self, emotion: str, score: float) -> dict[str, Any]:
+        return build_emotion_result(emotion, score)
 
     def _get_neutral_emotion(self) -> dict[str, Any]:
         """Retourne une émotion neutre par défaut"""
@@ -223,5 +421,39 @@ class EmotionClassifier:
         }
 
 
-# Instance globale
-emotion_classifier = EmotionClassifier()
+def build_emotion_result(emotion: str, score: float) -> dict[str, Any]:
+    """Construit le résultat (polarité dérivée de l'émotion)"""
+    # Calculer la polarité
+    if emotion in ['joie', 'amour', 'positif']:
+        polarite = score
+    elif emotion in ['tristesse', 'colere', 'peur', 'negatif']:
+        polarite = -score
+    else:
+        polarite = 0.0
+
+    return {
+        'emotion_principale': emotion,
+        'score_emotion': float(score),
+        'polarite': float(polarite),
+        'confiance': float(score)
+    }
+
+
+def classify_emotions(texts: list[str], fast: bool = None, **kwargs) -> list[dict[str, Any]]:
+    """
+    Point d'entrée de la classification par lot (ETL, API, flows): modèle rapide distillé
+    si fast (défaut: settings.emotion_fast_mode, le transformer n'est alors pas chargé),
+    sinon EmotionClassifier.classify_batch (kwargs: batch_size, cascade)
+    """
+    fast = settings.emotion_fast_mode if fast is None else fast
+    if fast:
+        if not texts:
+            return []
+        from app.backend.ai.fast_emotion import get_fast_emotion_model
+        return get_fast_emotion_model().classify_batch(texts)
+
+    return emotion_classifier.classify_batch(texts, **kwargs)
+
+
+# Instance globale (chargée au premier usage ou par le warm-up)
+emotion_classifier = model_registry.register("emotion_classifier", EmotionClassifier)
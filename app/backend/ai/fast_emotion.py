@@ -0,0 +1,215 @@
+"""
+Modèle d'émotions rapide - Semantic Pulse X
+Classifieur linéaire à n-grammes hachés (style fastText) distillé depuis EmotionClassifier,
+pour les rétro-analyses massives sur CPU (inférence NumPy pure)
+"""
+
+import string
+import threading
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from app.backend.core.config import settings
+
+PUNCTUATION = string.punctuation + "«»…’"
+BIGRAM_MULTIPLIER = np.uint64(0x9E3779B1)
+
+
+class FastEmotionModel:
+    """Régression logistique sur n-grammes de mots hachés (unigrammes + bigrammes)"""
+
+    def __init__(self, n_features: int = None, labels: list[str] = None,
+                 weights: np.ndarray = None, bias: np.ndarray = None):
+        self.n_features = n_features or settings.fast_emotion_n_features
+        self.labels = list(labels or [])
+        self.weights = weights  # (n_features, n_labels) float32
+        self.bias = bias  # (n_labels,) float32
+        self._token_hashes: dict[str, int] = {}
+
+    @property
+    def is_trained(self) -> bool:
+        return self.weights is not None
+
+    def _hash_tokens(self, tokens: list[str]) -> np.ndarray:
+        """Hash stable (crc32) des tokens, ponctuation de bord retirée (calculé une fois par token distinct)"""
+        new_tokens = set(tokens).difference(self._token_hashes)
+        if new_tokens:
+            if len(self._token_hashes) + len(new_tokens) > 1_000_000:
+                self._token_hashes.clear()
+                new_tokens = set(tokens)
+            for token in new_tokens:
+                # "génial." == "génial", mais "!" reste un token
+                self._token_hashes[token] = zlib.crc32((token.strip(PUNCTUATION) or token).encode("utf-8"))
+        return np.fromiter(map(self._token_hashes.__getitem__, tokens), dtype=np.uint64, count=len(tokens))
+
+    def featurize(self, texts: list[str]) -> tuple[list[tuple[np.ndarray, np.ndarray]], np.ndarray]:
+        """
+        N-grammes hachés par document: [(docs, features) unigrammes, (docs, features) bigrammes],
+        chaque partie triée par document, et facteur de normalisation L2 approchée (1/sqrt(n)) par document
+        """
+        # Découpage sur les espaces (comme fastText): une seule passe Python par texte
+        lengths = np.zeros(len(texts), dtype=np.int64)
+        tokens = []
+        for i, text in enumerate(texts):
+            if text:
+                doc_tokens = text.lower().split()
+                lengths[i] = len(doc_tokens)
+                tokens.extend(doc_tokens)
+
+        hashes = self._hash_tokens(tokens)
+        token_docs = np.repeat(np.arange(len(texts)), lengths)
+
+        # Bigrammes: paires de tokens consécutifs d'un même document
+        same_doc = token_docs[1:] == token_docs[:-1]
+        bigrams = (hashes[:-1][same_doc] * BIGRAM_MULTIPLIER + hashes[1:][same_doc]) >> np.uint64(7)
+
+        n_features = np.uint64(self.n_features)
+        parts = [
+            (token_docs, (hashes % n_features).astype(np.int64)),
+            (token_docs[1:][same_doc], (bigrams % n_features).astype(np.int64))
+        ]
+
+        counts = lengths + np.maximum(lengths - 1, 0)
+        scale = (1.0 / np.sqrt(np.maximum(counts, 1))).astype(np.float32)
+        return parts, scale
+
+    def to_sparse(self, texts: list[str]):
+        """Matrice CSR (entraînement scikit-learn)"""
+        from scipy.sparse import csr_matrix
+
+        parts, scale = self.featurize(texts)
+        docs = np.concatenate([part_docs for part_docs, _ in parts])
+        features = np.concatenate([part_features for _, part_features in parts])
+        return csr_matrix((scale[docs], (docs, features)), shape=(len(texts), self.n_features), dtype=np.float32)
+
+    def fit(self, texts: list[str], labels: list[str], epochs: int = 5, alpha: float = 1e-6) -> "FastEmotionModel":
+        """Distillation: apprend les labels du modèle enseignant"""
+        from sklearn.linear_model import SGDClassifier
+
+        classifier = SGDClassifier(loss="log_loss", alpha=alpha, max_iter=epochs, tol=None, random_state=42)
+        classifier.fit(self.to_sparse(texts), labels)
+
+        self.labels = [str(label) for label in classifier.classes_]
+        coef = classifier.coef_
+        intercept = classifier.intercept_
+        if len(self.labels) == 2:
+            # Cas binaire: scikit-learn ne stocke qu'une ligne de coefficients
+            coef = np.vstack([-coef[0], coef[0]]) / 2
+            intercept = np.array([-intercept[0], intercept[0]]) / 2
+
+        self.weights = np.ascontiguousarray(coef.T, dtype=np.float32)
+        self.bias = intercept.astype(np.float32)
+        return self
+
+    def predict_proba(self, texts: list[str]) -> np.ndarray:
+        """Probabilités (n_texts, n_labels), NumPy uniquement"""
+        if not self.is_trained:
+            raise RuntimeError("Modèle rapide non entraîné")
+
+        parts, scale = self.featurize(texts)
+        sums = np.zeros((len(texts), len(self.labels)), dtype=np.float32)
+
+        for docs, features in parts:
+            if not len(docs):
+                continue
+            # Documents contigus: somme par segment des lignes de poids
+            starts = np.flatnonzero(np.diff(docs, prepend=-1))
+            sums[docs[starts]] += np.add.reduceat(self.weights[features], starts, axis=0)
+
+        logits = sums * scale[:, None] + self.bias
+        logits -= logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        probs /= probs.sum(axis=1, keepdims=True)
+        return probs
+
+    def predict(self, texts: list[str]) -> tuple[list[str], np.ndarray]:
+        """Labels et scores"""
+        probs = self.predict_proba(texts)
+        label_ids = probs.argmax(axis=1)
+        return [self.labels[i] for i in label_ids], probs[np.arange(len(texts)), label_ids]
+
+    def classify_batch(self, texts: list[str]) -> list[dict[str, Any]]:
+        """Même format que EmotionClassifier.classify_batch (textes vides -> neutre)"""
+        from app.backend.ai.emotion_classifier import build_emotion_result
+
+        if not texts:
+            return []
+
+        results = [build_emotion_result('neutre', 0.5) for _ in texts]
+        indices = [i for i, text in enumerate(texts) if text and text.strip()]
+        if not indices:
+            return results
+
+        labels, scores = self.predict([texts[i] for i in indices])
+        for index, label, score in zip(indices, labels, scores, strict=False):
+            results[index] = build_emotion_result(label, float(score))
+        return results
+
+    def save(self, path: str = None) -> Path:
+        path = Path(path or settings.fast_emotion_model_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path,
+            weights=self.weights,
+            bias=self.bias,
+            labels=np.asarray(self.labels),
+            n_features=np.asarray(self.n_features)
+        )
+        return path
+
+    @classmethod
+    def load(cls, path: str = None) -> "FastEmotionModel":
+        with np.load(Path(path or settings.fast_emotion_model_path)) as data:
+            return cls(
+                n_features=int(data["n_features"]),
+                labels=[str(label) for label in data["labels"]],
+                weights=data["weights"],
+                bias=data["bias"]
+            )
+
+
+def evaluate_against_teacher(model: FastEmotionModel, texts: list[str], teacher_labels: list[str],
+                             min_texts: int = 100_000) -> dict[str, Any]:
+    """Accord avec l'enseignant et débit (textes/s, un coeur) sur au moins min_texts textes"""
+    predicted, _ = model.predict(texts)
+    teacher = np.asarray(teacher_labels)
+    agreement = np.asarray(predicted) == teacher
+
+    per_label = {
+        label: float(agreement[teacher == label].mean())
+        for label in sorted(Counter(teacher_labels))
+    }
+
+    repeats = max(1, -(-min_texts // max(len(texts), 1)))
+    benchmark = texts * repeats
+    start = time.perf_counter()
+    model.predict_proba(benchmark)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "samples": len(texts),
+        "agreement": float(agreement.mean()) if len(texts) else None,
+        "agreement_by_label": per_label,
+        "benchmark_texts": len(benchmark),
+        "texts_per_second": len(benchmark) / elapsed if elapsed > 0 else None
+    }
+
+
+_fast_model: FastEmotionModel | None = None
+_fast_model_lock = threading.Lock()
+
+
+def get_fast_emotion_model() -> FastEmotionModel:
+    """Modèle rapide chargé une seule fois (sans charger le transformer)"""
+    global _fast_model
+    if _fast_model is None:
+        with _fast_model_lock:
+            if _fast_model is None:
+                _fast_model = FastEmotionModel.load()
+                print(f"✅ Modèle d'émotions rapide chargé: {settings.fast_emotion_model_path}")
+    return _fast_model
@@ -6,8 +6,7 @@ Moteur IA central GRATUIT pour analyse et génération
 import json
 from typing import Any
 
-from langchain.memory import ConversationBufferMemory
-
+from app.backend.ai.model_registry import model_registry
 from app.backend.ai.ollama_client import ollama_client
 
 
@@ -15,6 +14,8 @@ class SemanticPulseAgent:
     """Agent LangChain GRATUIT pour Semantic Pulse X"""
 
     def __init__(self):
+        from langchain.memory import ConversationBufferMemory
+
         self.llm = None
         self.memory = ConversationBufferMemory()
         self._initialize_llm()
@@ -137,5 +138,5 @@ class SemanticPulseAgent:
             return f"Erreur résumé conversation: {e}"
 
 
-# Instance globale
-semantic_agent = SemanticPulseAgent()
+# Instance globale (chargée au premier usage ou par le warm-up)
+semantic_agent = model_registry.register("semantic_agent", SemanticPulseAgent)
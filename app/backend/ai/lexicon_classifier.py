@@ -0,0 +1,164 @@
+"""
+Classificateur lexical - Semantic Pulse X
+Score émotionnel vectorisé par lexique (premier étage de la cascade lexique -> transformer)
+"""
+
+import re
+import unicodedata
+
+import numpy as np
+
+# Lexique unifié (FR + EN) dans le vocabulaire du classificateur d'émotions,
+# consolidé depuis predict_emotions.py, gdelt_gkg_pipeline.py, streamlit_app.py et YouTubeAPISource
+EMOTION_LEXICON: dict[str, list[str]] = {
+    'joie': [
+        "content", "heureux", "heureuse", "satisfait", "satisfaction", "réjoui", "ravi", "joie", "plaisir",
+        "génial", "fantastique", "super", "formidable", "excellent", "parfait", "magnifique", "brillant",
+        "remarquable", "succès", "réussi", "victoire", "j'adore", "bonne nouvelle", "c'est génial",
+        "happy", "glad", "joy", "great", "awesome", "wonderful", "amazing"
+    ],
+    'amour': [
+        "amour", "amoureux", "amoureuse", "tendresse", "affection", "passion", "love", "loved", "lovely"
+    ],
+    'tristesse': [
+        "triste", "tristesse", "déçu", "déçue", "déception", "décevant", "désillusion", "regret", "amertume",
+        "déprimé", "malheureux", "chagrin", "dommage", "je suis déçu", "c'est décevant",
+        "sad", "disappointed", "disappointing", "unhappy"
+    ],
+    'colere': [
+        "colère", "furieux", "énervé", "scandale", "scandaleux", "révoltant", "inadmissible", "honteux",
+        "indigné", "rage", "frustré", "frustration", "angry", "furious", "outrageous"
+    ],
+    'peur': [
+        "peur", "crainte", "inquiet", "inquiète", "inquiétude", "inquiétant", "anxieux", "anxiété",
+        "alarmant", "alarme", "menace", "danger", "dangereux", "effrayant", "terrifiant", "panique",
+        "préoccupant", "préoccupé", "escalade", "je suis inquiet", "c'est inquiétant",
+        "fear", "afraid", "scared", "worried"
+    ],
+    'surprise': [
+        "surprise", "surpris", "surprenant", "étonnant", "étonné", "incroyable", "inattendu", "stupéfiant",
+        "wow", "unexpected", "surprised"
+    ],
+    'negatif': [
+        "mauvais", "mauvaise", "nul", "échec", "échoué", "problème", "crise", "catastrophique", "désastreux",
+        "terrible", "horrible", "raté", "difficile", "négatif", "n'aime pas", "c'est nul", "mauvaise nouvelle",
+        "pas réussi", "bad", "awful", "worst", "hate"
+    ],
+    'positif': [
+        "bon", "bien", "progrès", "amélioration", "espoir", "confiance", "positif", "optimiste", "c'est bien",
+        "good", "nice", "best", "like"
+    ],
+    'neutre': [
+        "annonce", "déclare", "selon", "rapport", "information", "données", "résultat"
+    ]
+}
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Négation (ne/n'/pas/jamais...) dans les NEGATION_WINDOW mots qui précèdent un terme
+NEGATIONS = {"ne", "n", "pas", "jamais", "aucun", "aucune", "sans", "not", "no", "never"}
+NEGATION_WINDOW = 2
+
+# Polarité inversée d'un terme nié ("pas bien" -> negatif), les autres émotions niées sont ignorées
+NEGATED_EMOTION = {
+    'joie': 'negatif', 'amour': 'negatif', 'positif': 'negatif',
+    'tristesse': 'positif', 'colere': 'positif', 'negatif': 'positif'
+}
+
+
+def normalize_text(text: str) -> str:
+    """Minuscules sans accents (déçu == decu)"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(normalize_text(text))
+
+
+class LexiconEmotionScorer:
+    """Scoreur lexical: matrice termes x émotions, n-grammes (expressions pondérées par leur longueur)"""
+
+    def __init__(self, lexicon: dict[str, list[str]] = None):
+        lexicon = lexicon or EMOTION_LEXICON
+        self.emotions = list(lexicon)
+        self.terms: dict[str, int] = {}
+        rows = []
+
+        for column, entries in enumerate(lexicon.values()):
+            for entry in entries:
+                tokens = tokenize(entry)
+                if not tokens:
+                    continue
+                term = " ".join(tokens)
+                if term not in self.terms:
+                    self.terms[term] = len(rows)
+                    rows.append(np.zeros(len(self.emotions), dtype=np.float32))
+                # Une expression de n mots pèse n (plus spécifique qu'un mot isolé)
+                rows[self.terms[term]][column] = len(tokens)
+
+        self.weights = np.vstack(rows) if rows else np.zeros((0, len(self.emotions)), dtype=np.float32)
+        self.max_ngram = max((term.count(" ") + 1 for term in self.terms), default=1)
+
+        # Poids des termes niés: lignes décalées à la suite des poids directs (id + len(terms))
+        negated = np.zeros_like(self.weights)
+        for column, emotion in enumerate(self.emotions):
+            target = NEGATED_EMOTION.get(emotion)
+            if target in self.emotions:
+                negated[:, self.emotions.index(target)] += self.weights[:, column]
+        self.weights = np.vstack([self.weights, negated])
+
+    def _term_ids(self, text: str) -> list[int]:
+        """Identifiants des termes du lexique présents dans le texte (n-grammes, + len(terms) si niés)"""
+        tokens = tokenize(text)
+        ids = []
+        for n in range(1, self.max_ngram + 1):
+            for start in range(len(tokens) - n + 1):
+                window = tokens[start:start + n]
+                term_id = self.terms.get(" ".join(window))
+                if term_id is None:
+                    continue
+                # Les expressions qui contiennent déjà la négation ("n'aime pas") ne sont pas inversées
+                if NEGATIONS.isdisjoint(window) and not NEGATIONS.isdisjoint(tokens[max(0, start - NEGATION_WINDOW):start]):
+                    term_id += len(self.terms)
+                ids.append(term_id)
+        return ids
+
+    def score(self, texts: list[str]) -> dict[str, np.ndarray]:
+        """
+        Scores vectorisés: labels, probabilités lexicales, confiance
+        (marge top1 - top2 pondérée par la quantité d'indices, 0 sans aucun indice)
+        et nombre de termes trouvés (hits)
+        """
+        counts = np.zeros((len(texts), len(self.emotions)), dtype=np.float32)
+        hits = np.zeros(len(texts), dtype=np.int64)
+
+        doc_ids = []
+        term_ids = []
+        for doc_id, text in enumerate(texts):
+            ids = self._term_ids(text or "")
+            hits[doc_id] = len(ids)
+            doc_ids.extend([doc_id] * len(ids))
+            term_ids.extend(ids)
+
+        if term_ids:
+            np.add.at(counts, np.asarray(doc_ids), self.weights[np.asarray(term_ids)])
+
+        totals = counts.sum(axis=1)
+        probs = counts / np.maximum(totals, 1e-9)[:, None]
+
+        top_two = np.sort(probs, axis=1)[:, -2:]
+        margin = top_two[:, 1] - top_two[:, 0]
+        evidence = 1.0 - np.exp(-totals)
+
+        return {
+            "labels": np.asarray(self.emotions)[probs.argmax(axis=1)],
+            "probabilities": probs,
+            "confidence": margin * evidence,
+            "evidence": totals,
+            "hits": hits
+        }
+
+
+# Instance globale (légère: pas de modèle à charger)
+lexicon_scorer = LexiconEmotionScorer()
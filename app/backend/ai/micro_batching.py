@@ -0,0 +1,136 @@
+"""
+Micro-batching dynamique - Semantic Pulse X
+Regroupe les requêtes concurrentes en un seul passage forward du modèle
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+from typing import Any
+
+from app.backend.ai.emotion_classifier import classify_emotions
+from app.backend.core.concurrency import run_in_model_executor
+from app.backend.core.config import settings
+
+
+class MicroBatcher:
+    """File d'attente asynchrone: max_batch_size éléments ou max_wait_ms, puis un appel batch"""
+
+    def __init__(self, batch_fn: Callable[[list[Any]], list[Any]], max_batch_size: int = None,
+                 max_wait_ms: float = None, name: str = "emotions"):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size or settings.micro_batch_max_size
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else settings.micro_batch_max_wait_ms) / 1000
+        self.name = name
+        self.queue: asyncio.Queue | None = None
+        self.worker: asyncio.Task | None = None
+
+    async def submit(self, item: Any) -> Any:
+        """Ajoute un élément à la file et attend son résultat"""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((item, future))
+        self._track_queue_depth()
+        return await future
+
+    def _ensure_worker(self):
+        """Démarre la tâche de fond dans la boucle courante (les éléments de l'ancienne file échouent)"""
+        if self.worker is None or self.worker.done():
+            self._drain_queue(RuntimeError(f"Micro-batcher {self.name} redémarré"))
+            self.queue = asyncio.Queue()
+            self.worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        """Boucle de collecte: attend un premier élément puis complète le batch"""
+        batch = []
+        try:
+            while True:
+                batch = [await self.queue.get()]
+                deadline = time.monotonic() + self.max_wait
+
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                    except TimeoutError:
+                        break
+
+                self._track_queue_depth()
+                await self._process(batch)
+        except BaseException as e:
+            # Arrêt ou crash de la tâche: le batch en cours ne doit pas rester en attente
+            error = RuntimeError(f"Micro-batcher {self.name} arrêté") if isinstance(e, asyncio.CancelledError) else e
+            self._fail_futures([future for _, future in batch], error)
+            raise
+
+    def _drain_queue(self, error: Exception):
+        """Vide la file courante et fait échouer les futures en attente"""
+        futures = []
+        while self.queue is not None and not self.queue.empty():
+            futures.append(self.queue.get_nowait()[1])
+        self._fail_futures(futures, error)
+
+    @staticmethod
+    def _fail_futures(futures: list[asyncio.Future], error: Exception):
+        for future in futures:
+            if future.done():
+                continue
+            loop = future.get_loop()
+            if loop.is_closed():
+                continue
+            # Les futures d'une autre boucle (ancienne file) sont résolues dans leur boucle
+            loop.call_soon_threadsafe(lambda f=future: f.done() or f.set_exception(error))
+
+    async def _process(self, batch: list[tuple[Any, asyncio.Future]]):
+        """Exécute le batch dans l'exécuteur des modèles et résout les futures"""
+        items = [item for item, _ in batch]
+        start = time.perf_counter()
+
+        try:
+            results = list(await run_in_model_executor(self.batch_fn, items))
+            if len(results) != len(batch):
+                # Résultats non alignés sur les entrées: aucun ne peut être attribué sûrement
+                raise ValueError(f"{self.name}: {len(results)} résultats pour {len(batch)} éléments")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
+
+        self._track_batch(len(batch), time.perf_counter() - start)
+
+    def _track_queue_depth(self):
+        try:
+            from app.backend.core.metrics import track_micro_batch_queue
+            track_micro_batch_queue(self.name, self.queue.qsize())
+        except Exception:
+            pass
+
+    def _track_batch(self, size: int, duration: float):
+        try:
+            from app.backend.core.metrics import track_micro_batch
+            track_micro_batch(self.name, size, duration)
+        except Exception:
+            pass
+
+    async def stop(self):
+        """Arrête la tâche de fond (les éléments en attente échouent)"""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+        self._drain_queue(RuntimeError(f"Micro-batcher {self.name} arrêté"))
+
+
+def _classify_emotions(texts: list[str]) -> list[dict[str, Any]]:
+    """Appel batch du classificateur (résolu à l'exécution: chargement paresseux)"""
+    return classify_emotions(texts, batch_size=settings.micro_batch_max_size)
+
+
+# Instance globale: classification émotionnelle de POST /api/v1/emotions/analyze
+emotion_batcher = MicroBatcher(_classify_emotions)
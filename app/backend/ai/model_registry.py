@@ -0,0 +1,279 @@
+"""
+Registre des modèles - Semantic Pulse X
+Chargement paresseux (premier usage) ou en tâche de fond des moteurs IA,
+budget mémoire avec déchargement LRU et déchargement des modèles inactifs
+"""
+
+import gc
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from app.backend.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def resident_memory_bytes() -> int | None:
+    """RSS courant du processus (psutil, sinon /proc), None si indisponible"""
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return None
+
+
+def estimate_model_bytes(instance: Any) -> int:
+    """Taille des paramètres des modules torch portés par un moteur"""
+    total = 0
+    seen = set()
+    candidates = list(vars(instance).values()) if hasattr(instance, "__dict__") else []
+    for value in candidates:
+        for module in (value, getattr(value, "model", None)):
+            if module is None or id(module) in seen or not hasattr(module, "parameters"):
+                continue
+            seen.add(id(module))
+            try:
+                total += sum(p.numel() * p.element_size() for p in module.parameters())
+            except Exception:
+                continue
+    return total
+
+
+class ModelRegistry:
+    """Registre des moteurs IA: chargement à la demande, warm-up, budget mémoire LRU"""
+
+    def __init__(self, memory_budget_mb: int = None, idle_timeout_s: int = None):
+        self.factories: dict[str, Callable[[], Any]] = {}
+        self.instances: dict[str, Any] = {}
+        self.states: dict[str, dict[str, Any]] = {}
+        self.last_used: dict[str, float] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._evict_lock = threading.Lock()
+        self._warmup_thread: threading.Thread | None = None
+        self._reaper_thread: threading.Thread | None = None
+        self._stop_reaper = threading.Event()
+
+        budget_mb = memory_budget_mb if memory_budget_mb is not None else settings.model_memory_budget_mb
+        self.memory_budget = budget_mb * 1024 * 1024 if budget_mb else None
+        self.idle_timeout = idle_timeout_s if idle_timeout_s is not None else settings.model_idle_timeout_s
+
+    def register(self, name: str, factory: Callable[[], Any]) -> "LazyModel":
+        """Enregistre une fabrique et retourne un proxy chargé au premier usage"""
+        self.factories[name] = factory
+        self._locks[name] = threading.Lock()
+        self.states[name] = {
+            "state": "not_loaded",
+            "load_seconds": None,
+            "memory_bytes": 0,
+            "loads": 0,
+            "unloads": 0,
+            "error": None
+        }
+        return LazyModel(self, name)
+
+    def get(self, name: str) -> Any:
+        """Retourne l'instance, en la chargeant si nécessaire (thread-safe)"""
+        self.last_used[name] = time.monotonic()
+        instance = self.instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._locks[name]:
+            instance = self.instances.get(name)
+            if instance is not None:
+                return instance
+
+            self.states[name].update(state="loading", error=None)
+            rss_before = resident_memory_bytes()
+            start = time.perf_counter()
+            try:
+                instance = self.factories[name]()
+            except Exception as e:
+                self.states[name].update(state="error", error=str(e))
+                logger.error(f"❌ Erreur chargement modèle {name}: {e}")
+                raise
+
+            load_seconds = time.perf_counter() - start
+            rss_after = resident_memory_bytes()
+            rss_delta = rss_after - rss_before if rss_before is not None and rss_after is not None else 0
+            memory_bytes = max(rss_delta, estimate_model_bytes(instance))
+
+            self.instances[name] = instance
+            self.states[name].update(state="ready", load_seconds=load_seconds, memory_bytes=memory_bytes)
+            self.states[name]["loads"] += 1
+            self._track(name, load_seconds=load_seconds)
+            logger.info(f"✅ Modèle {name} prêt ({load_seconds:.1f}s, {memory_bytes / 1e6:.0f} Mo)")
+
+        self.enforce_memory_budget(keep=name)
+        return instance
+
+    def is_ready(self, name: str) -> bool:
+        return name in self.instances
+
+    def unload(self, name: str, reason: str = "manual"):
+        """Libère une instance (elle sera rechargée au prochain usage)"""
+        with self._locks[name]:
+            instance = self.instances.pop(name, None)
+            if instance is None:
+                return
+            self.states[name].update(state="not_loaded")
+            self.states[name]["unloads"] += 1
+
+        self._release(instance)
+        self._track(name, unload_reason=reason)
+        logger.info(f"♻️ Modèle {name} déchargé ({reason})")
+
+    def _release(self, instance: Any):
+        """Supprime les références restantes (caches de méthodes) et libère la mémoire"""
+        # Cache disque du moteur: flush, fermeture et retrait du hook atexit (sinon l'ancienne
+        # instance resterait vivante jusqu'à l'arrêt du processus)
+        cache = getattr(instance, "cache", None)
+        close = getattr(cache, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                logger.warning(f"⚠️ Fermeture du cache impossible: {e}")
+
+        for attribute in vars(type(instance)).values():
+            cache_clear = getattr(attribute, "cache_clear", None)
+            if callable(cache_clear):
+                cache_clear()
+        del instance
+        gc.collect()
+
+        try:
+            import sys
+            torch = sys.modules.get("torch")
+            if torch is not None and torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except Exception:
+            pass
+
+    def loaded_memory_bytes(self) -> int:
+        """Mémoire estimée des modèles chargés"""
+        return sum(self.states[name]["memory_bytes"] for name in list(self.instances))
+
+    def enforce_memory_budget(self, keep: str | None = None):
+        """Décharge les modèles les moins récemment utilisés tant que le budget est dépassé"""
+        if not self.memory_budget:
+            return
+
+        with self._evict_lock:
+            rss = resident_memory_bytes()
+            usage = rss if rss is not None else self.loaded_memory_bytes()
+
+            candidates = sorted(
+                (name for name in self.instances if name != keep),
+                key=lambda name: self.last_used.get(name, 0.0)
+            )
+            for name in candidates:
+                if usage <= self.memory_budget:
+                    break
+                # La RSS ne redescend pas toujours immédiatement: on décompte la taille mesurée
+                usage -= self.states[name]["memory_bytes"]
+                self.unload(name, reason="memory_budget")
+
+    def unload_idle(self, max_idle_seconds: float = None) -> list[str]:
+        """Décharge les modèles inutilisés depuis plus de max_idle_seconds"""
+        max_idle_seconds = max_idle_seconds or self.idle_timeout
+        if not max_idle_seconds:
+            return []
+
+        now = time.monotonic()
+        idle = [
+            name for name in list(self.instances)
+            if now - self.last_used.get(name, now) > max_idle_seconds
+        ]
+        for name in idle:
+            self.unload(name, reason="idle")
+        return idle
+
+    def start_idle_reaper(self, interval_seconds: float = 60.0):
+        """Vérifie périodiquement les modèles inactifs (si model_idle_timeout_s > 0)"""
+        if not self.idle_timeout or (self._reaper_thread and self._reaper_thread.is_alive()):
+            return
+
+        def reap():
+            while not self._stop_reaper.wait(interval_seconds):
+                self.unload_idle()
+
+        self._stop_reaper.clear()
+        self._reaper_thread = threading.Thread(target=reap, name="model-reaper", daemon=True)
+        self._reaper_thread.start()
+
+    def stop_idle_reaper(self):
+        self._stop_reaper.set()
+
+    def warm_up(self, names: list[str] | None = None):
+        """Charge les modèles séquentiellement (les erreurs sont consignées dans l'état)"""
+        for name in names or list(self.factories):
+            try:
+                self.get(name)
+            except Exception:
+                continue
+
+    def warm_up_in_background(self, names: list[str] | None = None) -> threading.Thread:
+        """Lance le warm-up dans un thread de fond (non bloquant pour le démarrage)"""
+        if self._warmup_thread is None or not self._warmup_thread.is_alive():
+            self._warmup_thread = threading.Thread(
+                target=self.warm_up, args=(names,), name="model-warmup", daemon=True
+            )
+            self._warmup_thread.start()
+        return self._warmup_thread
+
+    def _track(self, name: str, load_seconds: float = None, unload_reason: str = None):
+        try:
+            from app.backend.core.metrics import track_model_memory
+            memory_bytes = self.states[name]["memory_bytes"] if name in self.instances else 0
+            track_model_memory(name, memory_bytes, load_seconds=load_seconds, unload_reason=unload_reason)
+        except Exception:
+            pass
+
+    def status(self) -> dict[str, Any]:
+        """État de chaque modèle, mémoire et disponibilité globale"""
+        now = time.monotonic()
+        models = {}
+        for name, state in self.states.items():
+            models[name] = dict(state)
+            if name in self.last_used:
+                models[name]["idle_seconds"] = now - self.last_used[name]
+
+        return {
+            # Un modèle déchargé après un premier chargement reste disponible (rechargement à la demande)
+            "ready": all(state["state"] == "ready" or state["loads"] > 0 for state in self.states.values()),
+            "loaded_memory_bytes": self.loaded_memory_bytes(),
+            "memory_budget_bytes": self.memory_budget,
+            "resident_memory_bytes": resident_memory_bytes(),
+            "models": models
+        }
+
+
+class LazyModel:
+    """Proxy transparent: tout accès d'attribut charge le modèle via le registre"""
+
+    def __init__(self, registry: ModelRegistry, name: str):
+        object.__setattr__(self, "_registry", registry)
+        object.__setattr__(self, "_name", name)
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._registry.get(self._name), attribute)
+
+    def __setattr__(self, attribute: str, value: Any):
+        setattr(self._registry.get(self._name), attribute, value)
+
+    def __repr__(self) -> str:
+        return f"<LazyModel {self._name} ({self._registry.states[self._name]['state']})>"
+
+
+# Registre global
+model_registry = ModelRegistry()
@@ -10,6 +10,7 @@ from typing import Any
 
 import requests
 
+from app.backend.ai.model_registry import model_registry
 from app.backend.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -350,5 +351,5 @@ Fournis une analyse concise des tendances observées en français (max 150 mots)
         return len(self.available_models) > 0
 
 
-# Instance globale
-ollama_client = OllamaClient()
+# Instance globale (connexion et warm-up au premier usage, hors import)
+ollama_client = model_registry.register("ollama_client", OllamaClient)
@@ -0,0 +1,254 @@
+"""
+Backend ONNX Runtime - Semantic Pulse X
+Export ONNX + quantification dynamique int8 des modèles (CPU), artefacts en cache disque
+"""
+
+import hashlib
+import re
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from app.backend.core.config import settings
+
+
+def is_onnx_available() -> bool:
+    """onnxruntime est-il installé ?"""
+    try:
+        import onnxruntime  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def model_revision(config) -> str:
+    """Révision d'un modèle HF: commit du hub, sinon empreinte de sa configuration (modèle local)"""
+    commit = getattr(config, "_commit_hash", None)
+    if commit:
+        return commit
+    return "config-" + hashlib.sha1(config.to_json_string(use_diff=False).encode()).hexdigest()[:12]
+
+
+def _artifact_dir(model_name: str, revision: str, cache_dir: str = None) -> Path:
+    """Dossier des artefacts par modèle et révision: un export périmé n'est jamais réutilisé"""
+    slug = re.sub(r'[^\w.-]', '_', model_name)
+    return Path(cache_dir or settings.onnx_cache_dir) / slug / re.sub(r'[^\w.-]', '_', revision)
+
+
+def _exportable(torch_module, input_names: list[str], output_name: str):
+    """Enveloppe un modèle HF: entrées positionnelles nommées, une seule sortie tensorielle"""
+    import torch
+
+    class Exportable(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *tensors):
+            return getattr(self.model(**dict(zip(input_names, tensors, strict=True))), output_name)
+
+    return Exportable(torch_module).eval()
+
+
+def _export_and_quantize(torch_module, sample_inputs: dict[str, Any], output_name: str,
+                         artifact_dir: Path, quantize: bool) -> Path:
+    """Exporte un modèle torch en ONNX (axes dynamiques) puis le quantifie en int8 (une seule fois)"""
+    import torch
+
+    artifact_dir.mkdir(parents=True, exist_ok=True)
+    fp32_path = artifact_dir / "model.onnx"
+    int8_path = artifact_dir / "model.int8.onnx"
+    target_path = int8_path if quantize else fp32_path
+
+    if target_path.exists():
+        return target_path
+
+    if not fp32_path.exists():
+        input_names = list(sample_inputs)
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes[output_name] = {0: "batch"}
+
+        with torch.inference_mode():
+            torch.onnx.export(
+                _exportable(torch_module, input_names, output_name),
+                tuple(sample_inputs[name] for name in input_names),
+                str(fp32_path),
+                input_names=input_names,
+                output_names=[output_name],
+                dynamic_axes=dynamic_axes,
+                opset_version=17
+            )
+        print(f"✅ Modèle exporté en ONNX: {fp32_path}")
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+        print(f"✅ Modèle quantifié int8: {int8_path}")
+
+    return target_path
+
+
+def _create_session(model_path: Path):
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if settings.onnx_intra_op_threads:
+        options.intra_op_num_threads = settings.onnx_intra_op_threads
+    return ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+
+
+class ONNXSequenceClassifier:
+    """Classification de séquences via onnxruntime (logits numpy)"""
+
+    def __init__(self, model_name: str, tokenizer, torch_model=None, quantize: bool = None, cache_dir: str = None):
+        self.model_name = model_name
+        self.tokenizer = tokenizer
+        self.quantize = settings.onnx_quantize if quantize is None else quantize
+        self.model_path = self._prepare(torch_model, cache_dir)
+        self.session = _create_session(self.model_path)
+        self.input_names = {node.name for node in self.session.get_inputs()}
+
+    def _prepare(self, torch_model, cache_dir: str = None) -> Path:
+        if torch_model is not None:
+            config = torch_model.config
+        else:
+            from transformers import AutoConfig
+            config = AutoConfig.from_pretrained(self.model_name)
+
+        artifact_dir = _artifact_dir(self.model_name, model_revision(config), cache_dir)
+        target = artifact_dir / ("model.int8.onnx" if self.quantize else "model.onnx")
+        if target.exists():
+            return target
+
+        if torch_model is None:
+            from transformers import AutoModelForSequenceClassification
+            torch_model = AutoModelForSequenceClassification.from_pretrained(self.model_name, config=config)
+
+        sample = dict(self.tokenizer(["export onnx"], return_tensors="pt"))
+        return _export_and_quantize(torch_model, sample, "logits", artifact_dir, self.quantize)
+
+    def predict_logits(self, texts: list[str], max_length: int) -> np.ndarray:
+        encoded = self.tokenizer(
+            texts,
+            padding="longest",
+            truncation=True,
+            max_length=max_length,
+            return_tensors="np"
+        )
+        feeds = {name: value.astype(np.int64) for name, value in encoded.items() if name in self.input_names}
+        return self.session.run(["logits"], feeds)[0]
+
+
+class ONNXSentenceEncoder:
+    """Encodeur de phrases via onnxruntime (mean pooling + normalisation comme SentenceTransformer)"""
+
+    def __init__(self, model_name: str, sentence_transformer, quantize: bool = None, cache_dir: str = None):
+        self.model_name = model_name
+        transformer = sentence_transformer[0]
+        self.tokenizer = transformer.tokenizer
+        self.max_length = transformer.max_seq_length
+        self.normalize = any(type(module).__name__ == "Normalize" for module in sentence_transformer)
+        self.quantize = settings.onnx_quantize if quantize is None else quantize
+        self._check_pooling(sentence_transformer)
+
+        artifact_dir = _artifact_dir(model_name, model_revision(transformer.auto_model.config), cache_dir)
+        sample = dict(self.tokenizer(["export onnx"], return_tensors="pt"))
+        self.model_path = _export_and_quantize(
+            transformer.auto_model, sample, "last_hidden_state", artifact_dir, self.quantize
+        )
+        self.session = _create_session(self.model_path)
+        self.input_names = {node.name for node in self.session.get_inputs()}
+
+    @staticmethod
+    def _check_pooling(sentence_transformer):
+        """Seul le mean pooling est reproduit: refuser les autres configurations (CLS, max...)"""
+        pooling = next((module for module in sentence_transformer if type(module).__name__ == "Pooling"), None)
+        if pooling is None:
+            raise ValueError("Module Pooling absent du SentenceTransformer")
+
+        if hasattr(pooling, "get_pooling_mode_str"):
+            mode = pooling.get_pooling_mode_str()
+        else:
+            config = pooling.get_config_dict()
+            mode = "+".join(key[len("pooling_mode_"):] for key, value in config.items()
+                            if key.startswith("pooling_mode_") and value)
+        if mode not in ("mean", "mean_tokens"):
+            raise ValueError(f"Pooling '{mode}' non supporté par l'encodeur ONNX (mean pooling uniquement)")
+
+    def encode(self, texts: list[str], batch_size: int = 64) -> np.ndarray:
+        embeddings = []
+        # Tri par longueur: padding minimal dans chaque mini-batch
+        order = np.argsort([len(text) for text in texts], kind="stable")
+
+        for start in range(0, len(texts), batch_size):
+            batch = [texts[i] for i in order[start:start + batch_size]]
+            encoded = self.tokenizer(
+                batch, padding="longest", truncation=True, max_length=self.max_length, return_tensors="np"
+            )
+            feeds = {name: value.astype(np.int64) for name, value in encoded.items() if name in self.input_names}
+            hidden = self.session.run(["last_hidden_state"], feeds)[0]
+
+            # Mean pooling masqué
+            mask = encoded["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            embeddings.append(pooled)
+
+        if not embeddings:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        result = np.empty((len(texts), embeddings[0].shape[1]), dtype=np.float32)
+        result[order] = np.vstack(embeddings)
+
+        if self.normalize:
+            norms = np.linalg.norm(result, axis=1, keepdims=True)
+            result = result / np.clip(norms, 1e-12, None)
+        return result
+
+
+def compare_emotion_backends(classifier, texts: list[str]) -> dict[str, float]:
+    """Écart de précision ONNX vs PyTorch: accord des labels et écart max des probabilités"""
+    import torch
+
+    if classifier.onnx_model is None or classifier.model is None:
+        return {"error": "Backend ONNX ou modèle PyTorch indisponible"}
+
+    max_length = min(classifier.tokenizer.model_max_length, settings.max_text_length)
+    cleaned = [text for text in (classifier._clean_text(t) for t in texts) if text]
+
+    encoded = classifier.tokenizer(cleaned, padding="longest", truncation=True, max_length=max_length, return_tensors="pt")
+    with torch.inference_mode():
+        torch_probs = torch.softmax(classifier.model(**encoded).logits, dim=-1).numpy()
+
+    onnx_logits = classifier.onnx_model.predict_logits(cleaned, max_length)
+    onnx_probs = np.exp(onnx_logits - onnx_logits.max(axis=1, keepdims=True))
+    onnx_probs /= onnx_probs.sum(axis=1, keepdims=True)
+
+    return {
+        "samples": len(cleaned),
+        "label_agreement": float((torch_probs.argmax(axis=1) == onnx_probs.argmax(axis=1)).mean()),
+        "max_prob_delta": float(np.abs(torch_probs - onnx_probs).max()),
+        "mean_prob_delta": float(np.abs(torch_probs - onnx_probs).mean())
+    }
+
+
+def compare_embedding_backends(engine, texts: list[str]) -> dict[str, float]:
+    """Écart de précision ONNX vs PyTorch: cosinus entre embeddings des deux backends"""
+    if engine.onnx_encoder is None:
+        return {"error": "Backend ONNX indisponible"}
+
+    cleaned = [text for text in (engine._clean_text(t) for t in texts) if text]
+    torch_embs = engine.model.encode(cleaned, convert_to_numpy=True)
+    onnx_embs = engine.onnx_encoder.encode(cleaned)
+
+    def normalize(matrix):
+        return matrix / np.clip(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12, None)
+
+    cosines = (normalize(torch_embs) * normalize(onnx_embs)).sum(axis=1)
+    return {
+        "samples": len(cleaned),
+        "mean_cosine": float(cosines.mean()),
+        "min_cosine": float(cosines.min())
+    }
@@ -0,0 +1,184 @@
+"""
+Cache de prédictions persistant - Semantic Pulse X
+Résultats de modèles en SQLite (partagé entre ETL, API et Streamlit),
+clé = hash(modèle + version, texte normalisé), TTL et taille bornée
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from app.backend.core.config import settings
+
+# Limite de variables SQLite par requête
+LOOKUP_CHUNK = 500
+
+
+class PredictionCache:
+    """Cache clé -> résultat JSON, éviction LRU (accessed_at) et expiration (created_at)"""
+
+    def __init__(self, path: str = None, ttl_seconds: int = None, max_entries: int = None):
+        self.path = Path(path or settings.prediction_cache_path)
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.prediction_cache_ttl_s
+        self.max_entries = max_entries or settings.prediction_cache_max_entries
+        self.connection: sqlite3.Connection | None = None
+        self.writes_since_purge = 0
+        self.entries: int | None = None  # Dernier décompte connu (purge ou get_stats)
+        self.stats: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Ouvre la base à la demande (WAL: lecteurs et écrivain concurrents entre processus)"""
+        if self.connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                self.path, timeout=settings.sqlite_busy_timeout / 1000, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                "key TEXT PRIMARY KEY, namespace TEXT NOT NULL, result TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS ix_predictions_accessed ON predictions (accessed_at)")
+            connection.commit()
+            self.connection = connection
+        return self.connection
+
+    @staticmethod
+    def make_key(namespace: str, text: str) -> str:
+        """Clé: hash(namespace = modèle@version, texte normalisé)"""
+        normalized = " ".join(text.split())
+        return hashlib.sha1(f"{namespace}\x00{normalized}".encode()).hexdigest()
+
+    def get_many(self, namespace: str, texts: list[str]) -> dict[int, dict[str, Any]]:
+        """Recherche groupée: {position: résultat} pour les textes en cache et non expirés"""
+        if not texts:
+            return {}
+
+        keys = [self.make_key(namespace, text) for text in texts]
+        now = time.time()
+        min_created = now - self.ttl_seconds if self.ttl_seconds else 0.0
+        rows = {}
+
+        try:
+            with self._lock:
+                connection = self._connect()
+                unique_keys = list(dict.fromkeys(keys))
+                for start in range(0, len(unique_keys), LOOKUP_CHUNK):
+                    chunk = unique_keys[start:start + LOOKUP_CHUNK]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows.update(connection.execute(
+                        f"SELECT key, result FROM predictions WHERE key IN ({placeholders}) AND created_at >= ?",
+                        (*chunk, min_created)
+                    ).fetchall())
+
+                if rows:
+                    connection.executemany(
+                        "UPDATE predictions SET accessed_at = ? WHERE key = ?", [(now, key) for key in rows]
+                    )
+                    connection.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Cache de prédictions indisponible: {e}")
+            return {}
+
+        found = {i: json.loads(rows[key]) for i, key in enumerate(keys) if key in rows}
+        self._record(namespace, hits=len(found), misses=len(texts) - len(found))
+        return found
+
+    def put_many(self, namespace: str, texts: list[str], results: list[dict[str, Any]]):
+        """Écriture groupée (une transaction), purge TTL/taille périodique"""
+        if not texts:
+            return
+
+        now = time.time()
+        rows = [
+            (self.make_key(namespace, text), namespace, json.dumps(result), now, now)
+            for text, result in zip(texts, results, strict=False)
+        ]
+
+        try:
+            with self._lock:
+                connection = self._connect()
+                connection.executemany("INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?)", rows)
+                connection.commit()
+                self.writes_since_purge += len(rows)
+
+                if self.writes_since_purge >= max(1, self.max_entries // 10):
+                    self._purge(connection)
+        except sqlite3.Error as e:
+            print(f"⚠️ Écriture cache de prédictions impossible: {e}")
+
+    def purge(self) -> int:
+        """Supprime les entrées expirées puis les moins récemment utilisées au-delà de max_entries"""
+        with self._lock:
+            return self._purge(self._connect())
+
+    def _purge(self, connection: sqlite3.Connection) -> int:
+        removed = 0
+        if self.ttl_seconds:
+            removed += connection.execute(
+                "DELETE FROM predictions WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+
+        entries = connection.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+        overflow = entries - self.max_entries
+        if overflow > 0:
+            removed += connection.execute(
+                "DELETE FROM predictions WHERE key IN "
+                "(SELECT key FROM predictions ORDER BY accessed_at LIMIT ?)", (overflow,)
+            ).rowcount
+        self.entries = entries - max(overflow, 0)
+
+        connection.commit()
+        self.writes_since_purge = 0
+        return removed
+
+    def _record(self, namespace: str, hits: int, misses: int):
+        stats = self.stats.setdefault(namespace, {'hits': 0, 'misses': 0})
+        stats['hits'] += hits
+        stats['misses'] += misses
+
+        try:
+            from app.backend.core.metrics import track_prediction_cache
+            track_prediction_cache(namespace, hits, misses)
+        except Exception:
+            pass
+
+    def get_stats(self, count_entries: bool = True) -> dict[str, Any]:
+        """
+        Taux de succès par modèle (processus courant) et taille du cache.
+        count_entries=False: aucune I/O, dernier décompte connu (sondes de santé)
+        """
+        hits = sum(stats['hits'] for stats in self.stats.values())
+        lookups = hits + sum(stats['misses'] for stats in self.stats.values())
+
+        if count_entries:
+            try:
+                with self._lock:
+                    self.entries = self._connect().execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+            except sqlite3.Error:
+                pass
+
+        return {
+            'path': str(self.path),
+            'entries': self.entries,
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'hits': hits,
+            'misses': lookups - hits,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'by_model': {
+                namespace: {**stats, 'hit_rate': stats['hits'] / max(stats['hits'] + stats['misses'], 1)}
+                for namespace, stats in self.stats.items()
+            }
+        }
+
+
+# Instance globale (fichier partagé par tous les processus)
+prediction_cache = PredictionCache()
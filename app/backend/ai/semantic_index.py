@@ -0,0 +1,278 @@
+"""
+Index sémantique ANN - Semantic Pulse X
+Recherche approximative des plus proches voisins (IVF-flat NumPy) sur les contenus
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from app.backend.ai.embeddings import embedding_engine, normalize_rows, top_k_indices
+from app.backend.core.config import settings
+
+# Taille maximale (en éléments float32) d'un bloc de scores vecteurs × centroïdes (~128 Mo)
+ASSIGN_BLOCK_ELEMENTS = 32 * 1024 * 1024
+
+
+class SemanticIndex:
+    """Index IVF-flat: k-means sphérique + listes inversées, persistant sur disque"""
+
+    def __init__(self, index_path: str = None, n_probe: int = None):
+        self.index_path = Path(index_path or settings.semantic_index_path)
+        self.n_probe = n_probe or settings.semantic_index_nprobe
+        self.dimension = None
+        self.centroids = None  # (n_lists, d) ou None tant que non entraîné
+        self.inverted_lists: list[np.ndarray] = []
+        # Tampons à capacité doublée: vecteurs (n, d) float32 normalisés, identifiants, liste inversée
+        self._vectors = None
+        self._ids = None
+        self._assignments = None
+        self._size = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def vectors(self) -> np.ndarray | None:
+        return None if self._vectors is None else self._vectors[:self._size]
+
+    @property
+    def ids(self) -> np.ndarray | None:
+        return None if self._ids is None else self._ids[:self._size]
+
+    @property
+    def assignments(self) -> np.ndarray | None:
+        return None if self._assignments is None or self.centroids is None else self._assignments[:self._size]
+
+    def _reserve(self, count: int, dimension: int):
+        """Agrandit les tampons (capacité doublée) pour count vecteurs supplémentaires"""
+        needed = self._size + count
+        capacity = 0 if self._vectors is None else len(self._vectors)
+        if needed <= capacity:
+            return
+
+        capacity = max(needed, 2 * capacity, 1024)
+        vectors = np.empty((capacity, dimension), dtype=np.float32)
+        ids = np.empty(capacity, dtype=np.int64)
+        assignments = np.empty(capacity, dtype=np.int64)
+        if self._size:
+            vectors[:self._size] = self._vectors[:self._size]
+            ids[:self._size] = self._ids[:self._size]
+            if self._assignments is not None:
+                assignments[:self._size] = self._assignments[:self._size]
+        self._vectors, self._ids, self._assignments = vectors, ids, assignments
+
+    @property
+    def max_id(self) -> int:
+        """Plus grand identifiant indexé (pour l'ajout incrémental)"""
+        return int(self.ids.max()) if len(self) else 0
+
+    def train(self, vectors: np.ndarray, n_lists: int = None, iterations: int = 10, sample_size: int = 50_000):
+        """Entraîne les centroïdes (k-means sphérique sur un échantillon)"""
+        vectors = normalize_rows(vectors)
+        n_lists = n_lists or max(1, int(4 * np.sqrt(len(vectors))))
+        n_lists = min(n_lists, len(vectors))
+
+        rng = np.random.default_rng(42)
+        if len(vectors) > sample_size:
+            vectors = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+
+        centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            labels = self._assign(vectors, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, vectors)
+            counts = np.bincount(labels, minlength=n_lists)
+            # Les centroïdes vides gardent leur position précédente
+            non_empty = counts > 0
+            centroids[non_empty] = normalize_rows(sums[non_empty])
+
+        with self._lock:
+            self.centroids = centroids
+            self.dimension = centroids.shape[1]
+            if len(self):
+                self._assignments[:self._size] = self._assign(self.vectors)
+                self._rebuild_inverted_lists()
+
+    def add(self, ids: list[int], vectors: np.ndarray):
+        """Ajoute des vecteurs à l'index (incrémental)"""
+        if len(ids) == 0:
+            return
+
+        vectors = normalize_rows(vectors)
+        ids = np.asarray(ids, dtype=np.int64)
+
+        with self._lock:
+            if self.dimension is None:
+                self.dimension = vectors.shape[1]
+            self._reserve(len(ids), self.dimension)
+
+            start = self._size
+            self._vectors[start:start + len(ids)] = vectors
+            self._ids[start:start + len(ids)] = ids
+            self._size += len(ids)
+
+            if self.centroids is not None:
+                new_assignments = self._assign(vectors)
+                self._assignments[start:self._size] = new_assignments
+                for list_id in np.unique(new_assignments):
+                    rows = start + np.flatnonzero(new_assignments == list_id)
+                    self.inverted_lists[list_id] = np.concatenate([self.inverted_lists[list_id], rows])
+
+    def search(self, query_vectors: np.ndarray, top_k: int = 10, n_probe: int = None) -> list[list[tuple[int, float]]]:
+        """Retourne, pour chaque requête, les top_k (id, score cosinus)"""
+        if not len(self):
+            return [[] for _ in range(len(np.atleast_2d(query_vectors)))]
+
+        queries = normalize_rows(query_vectors)
+        n_probe = n_probe or self.n_probe
+        results = []
+
+        with self._lock:
+            if self.centroids is None:
+                # Index non entraîné: recherche exacte
+                scores_matrix = queries @ self.vectors.T
+                for scores in scores_matrix:
+                    results.append([(int(self.ids[i]), float(scores[i])) for i in top_k_indices(scores, top_k)])
+                return results
+
+            probes_matrix = np.argsort(-(queries @ self.centroids.T), axis=1)[:, :n_probe]
+            for query, probes in zip(queries, probes_matrix, strict=False):
+                rows = np.concatenate([self.inverted_lists[p] for p in probes])
+                if len(rows) == 0:
+                    results.append([])
+                    continue
+                scores = self.vectors[rows] @ query
+                results.append([
+                    (int(self.ids[rows[i]]), float(scores[i]))
+                    for i in top_k_indices(scores, top_k)
+                ])
+
+        return results
+
+    def _assign(self, vectors: np.ndarray, centroids: np.ndarray = None) -> np.ndarray:
+        """Affecte chaque vecteur à son centroïde le plus proche (par blocs de lignes, mémoire bornée)"""
+        centroids = self.centroids if centroids is None else centroids
+        chunk_size = max(1, ASSIGN_BLOCK_ELEMENTS // len(centroids))
+        labels = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), chunk_size):
+            labels[start:start + chunk_size] = np.argmax(vectors[start:start + chunk_size] @ centroids.T, axis=1)
+        return labels
+
+    def _rebuild_inverted_lists(self):
+        """Reconstruit les listes inversées à partir des affectations"""
+        order = np.argsort(self.assignments, kind='stable')
+        bounds = np.searchsorted(self.assignments[order], np.arange(len(self.centroids) + 1))
+        self.inverted_lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(self.centroids))]
+
+    def save(self, path: str = None):
+        """Sauvegarde l'index sur disque (npz)"""
+        path = Path(path or self.index_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._lock:
+            arrays = {
+                'vectors': self.vectors if self.vectors is not None else np.zeros((0, 0), dtype=np.float32),
+                'ids': self.ids if self.ids is not None else np.zeros(0, dtype=np.int64),
+            }
+            if self.centroids is not None:
+                arrays['centroids'] = self.centroids
+                arrays['assignments'] = self.assignments
+
+            tmp_path = path.with_suffix('.tmp.npz')
+            np.savez(tmp_path, **arrays)
+            tmp_path.replace(path)
+
+        print(f"✅ Index sémantique sauvegardé: {path} ({len(self)} vecteurs)")
+
+    def load(self, path: str = None) -> bool:
+        """Charge l'index depuis le disque"""
+        path = Path(path or self.index_path)
+        if not path.exists():
+            return False
+
+        try:
+            with np.load(path) as data:
+                vectors = data['vectors']
+                ids = data['ids']
+                centroids = data['centroids'] if 'centroids' in data else None
+                assignments = data['assignments'] if 'assignments' in data else None
+
+            with self._lock:
+                self._vectors = np.ascontiguousarray(vectors, dtype=np.float32) if len(ids) else None
+                self._ids = ids if len(ids) else None
+                self._size = len(ids)
+                self.dimension = vectors.shape[1] if len(ids) else None
+                self.centroids = centroids
+                self._assignments = assignments if assignments is not None and len(ids) else (
+                    np.empty(len(ids), dtype=np.int64) if len(ids) else None
+                )
+                if centroids is not None:
+                    self._rebuild_inverted_lists()
+
+            print(f"✅ Index sémantique chargé: {path} ({len(self)} vecteurs)")
+            return True
+        except Exception as e:
+            print(f"❌ Erreur chargement index sémantique: {e}")
+            return False
+
+    def search_texts(self, query: str, top_k: int = 10) -> dict[str, Any]:
+        """Recherche sémantique à partir d'un texte"""
+        start = time.perf_counter()
+        query_vector = embedding_engine.encode_aligned([query])
+        encode_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        hits = self.search(query_vector, top_k=top_k)[0]
+        search_ms = (time.perf_counter() - start) * 1000
+
+        return {
+            'hits': [{'id': hit_id, 'similarity': score} for hit_id, score in hits],
+            'encode_ms': encode_ms,
+            'search_ms': search_ms
+        }
+
+
+def build_index_from_database(session, index: SemanticIndex = None, batch_size: int = None, retrain: bool = False) -> SemanticIndex:
+    """Indexe les contenus absents de l'index (par id croissant) puis sauvegarde"""
+    from app.backend.models.schema import Contenu
+
+    index = index or SemanticIndex()
+    if not len(index):
+        index.load()
+
+    batch_size = batch_size or settings.batch_size
+    last_id = index.max_id
+    added = 0
+
+    while True:
+        rows = (
+            session.query(Contenu.id, Contenu.titre, Contenu.texte)
+            .filter(Contenu.id > last_id)
+            .order_by(Contenu.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+
+        texts = [f"{titre or ''}. {texte or ''}" for _, titre, texte in rows]
+        index.add([row_id for row_id, _, _ in rows], embedding_engine.encode_aligned(texts))
+        last_id = rows[-1][0]
+        added += len(rows)
+
+    # (Ré)entraîner les centroïdes quand l'index n'en a pas ou sur demande
+    if len(index) and (retrain or index.centroids is None):
+        index.train(index.vectors)
+
+    index.save()
+    print(f"✅ {added} contenus ajoutés à l'index sémantique")
+    return index
+
+
+# Instance globale (chargée à la première recherche)
+semantic_index = SemanticIndex()
@@ -4,21 +4,44 @@ Graphe Social des Émotions - Semantic Pulse X
 Système de clustering thématique et mapping des relations émotionnelles
 """
 
+import hashlib
 import json
 import logging
 import os
+import time
 from collections import defaultdict
 from datetime import datetime
+from pathlib import Path
 
 import matplotlib.pyplot as plt
 import networkx as nx
 import numpy as np
+import pandas as pd
+from scipy import sparse
 from sklearn.cluster import KMeans
 
 # Configuration du logger
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Au-delà, la matrice d'influence est exportée en triplets creux plutôt qu'en liste dense
+DENSE_MATRIX_MAX_NODES = 2000
+
+# En dessous, l'ingestion ligne à ligne est plus rapide que les groupby pandas
+BULK_INGEST_MIN_ROWS = 500
+
+# Au-delà, get_graph_statistics et detect_emotion_communities passent en mode grand graphe
+LARGE_GRAPH_MIN_NODES = 2000
+
+# Version du format de snapshot (tables Parquet nodes/edges + metadata.json)
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Au-delà, visualize_graph affiche une vue agrégée (communautés) ou échantillonnée
+LAYOUT_MAX_NODES = 500
+
+# Au-delà, les labels ne sont plus dessinés (illisibles et coûteux à rendre)
+LABEL_MAX_NODES = 150
+
 class SocialEmotionGraph:
     """
     Système de graphe social des émotions avec clustering thématique.
@@ -30,7 +53,10 @@ class SocialEmotionGraph:
     - Détection des influences émotionnelles
     """
 
-    def __init__(self):
+    def __init__(self, reservoir_size: int = 5, histogram_freq: str = 'h',
+                 max_histogram_buckets: int = 24 * 30, seed: int = 42,
+                 large_graph_threshold: int = LARGE_GRAPH_MIN_NODES, betweenness_samples: int = 256,
+                 layout_max_nodes: int = LAYOUT_MAX_NODES, relayout_iterations: int = 15):
         self.graph = nx.Graph()
         self.emotion_clusters = {}
         self.theme_mapping = {}
@@ -38,6 +64,25 @@ class SocialEmotionGraph:
         self.influence_matrix = None
         self.community_structure = {}
 
+        # Représentation compacte des arêtes (mémoire bornée quel que soit le volume ingéré)
+        self.reservoir_size = reservoir_size
+        self.histogram_freq = histogram_freq
+        self.max_histogram_buckets = max_histogram_buckets
+        self.seed = seed
+        self._rng = np.random.default_rng(seed)
+
+        # Mode grand graphe : centralités échantillonnées, communautés incrémentales
+        self.large_graph_threshold = large_graph_threshold
+        self.betweenness_samples = betweenness_samples
+        self.node_communities = {}
+        self.community_detection_info = {}
+        self._touched_nodes = set()
+
+        # Cache de layout (clé = empreinte de la vue dessinée), relayout incrémental
+        self.layout_max_nodes = layout_max_nodes
+        self.relayout_iterations = relayout_iterations
+        self._layout_cache = {}
+
         logger.info("🔗 Graphe Social des Émotions initialisé")
 
     def add_emotion_data(self, emotion_data: list[dict]) -> None:
@@ -47,14 +92,20 @@ class SocialEmotionGraph:
         Args:
             emotion_data: Liste de dictionnaires contenant les données émotionnelles
         """
+        if len(emotion_data) >= BULK_INGEST_MIN_ROWS:
+            self.add_emotion_dataframe(pd.DataFrame(emotion_data))
+            return
+
         logger.info(f"📊 Ajout de {len(emotion_data)} éléments émotionnels")
 
+        now = datetime.now().isoformat()
         for item in emotion_data:
-            emotion = item.get('emotion', 'unknown')
-            content = item.get('content', '')
-            theme = item.get('theme', 'general')
-            timestamp = item.get('timestamp', datetime.now().isoformat())
-            source = item.get('source', 'unknown')
+            # Valeurs absentes, None ou NaN: mêmes défauts que l'ingestion groupée (_prepare_frame)
+            emotion = self._field(item, 'emotion', 'unknown')
+            content = self._field(item, 'content', '')
+            theme = self._field(item, 'theme', 'general')
+            timestamp = self._field(item, 'timestamp', now)
+            source = self._field(item, 'source', 'unknown')
 
             # Ajouter le nœud émotion
             if not self.graph.has_node(emotion):
@@ -80,23 +131,277 @@ class SocialEmotionGraph:
             theme_data = self.graph.nodes[theme]
             theme_data['emotions'].add(emotion)
             theme_data['frequency'] += 1
+            self._touched_nodes.update((emotion, theme))
 
             # Créer une arête entre émotion et thème
             if not self.graph.has_edge(emotion, theme):
-                self.graph.add_edge(emotion, theme,
-                                  weight=0,
-                                  interactions=[])
+                self.graph.add_edge(emotion, theme, weight=0, sources={}, histogram={}, samples=[])
 
             edge_data = self.graph.edges[emotion, theme]
             edge_data['weight'] += 1
-            edge_data['interactions'].append({
-                'timestamp': timestamp,
-                'content': content[:100],  # Limiter la taille
-                'source': source
-            })
+            edge_data['sources'][source] = edge_data['sources'].get(source, 0) + 1
+
+            bucket = self._time_bucket(timestamp)
+            edge_data['histogram'][bucket] = edge_data['histogram'].get(bucket, 0) + 1
+            if len(edge_data['histogram']) > self.max_histogram_buckets:
+                del edge_data['histogram'][min(edge_data['histogram'])]
+
+            # Échantillon réservoir (algorithme R)
+            interaction = {'timestamp': str(timestamp), 'content': str(content)[:100], 'source': source}
+            if len(edge_data['samples']) < self.reservoir_size:
+                edge_data['samples'].append(interaction)
+            else:
+                slot = int(self._rng.integers(edge_data['weight']))
+                if slot < self.reservoir_size:
+                    edge_data['samples'][slot] = interaction
+
+        logger.info(f"✅ Graphe mis à jour: {self.graph.number_of_nodes()} nœuds, {self.graph.number_of_edges()} arêtes")
+
+    @staticmethod
+    def _field(item: dict, key: str, default):
+        """
+        Valeur d'un champ d'entrée, remplacée par le défaut si absente ou manquante.
+
+        Args:
+            item: Élément émotionnel
+            key: Nom du champ
+            default: Valeur par défaut
+
+        Returns:
+            Valeur du champ ou défaut
+        """
+        value = item.get(key)
+        return default if value is None or (isinstance(value, float) and np.isnan(value)) else value
+
+    def _time_bucket(self, timestamp) -> str:
+        """
+        Tranche de temps d'un horodatage (même format que l'ingestion groupée).
+
+        Args:
+            timestamp: Horodatage ISO ou datetime
+
+        Returns:
+            Début de la tranche au format ISO à la minute
+        """
+        parsed = pd.to_datetime(timestamp, errors='coerce', utc=True)
+        if pd.isna(parsed):
+            parsed = pd.Timestamp.now(tz='UTC')
+        return parsed.floor(self.histogram_freq).strftime('%Y-%m-%dT%H:%M')
+
+    def add_emotion_dataframe(self, df: pd.DataFrame) -> None:
+        """
+        Ingestion groupée : poids, fréquences et histogrammes mis à jour par groupby.
+
+        Chaque arête garde un compteur (weight), des compteurs par source, un histogramme
+        par tranche de temps (borné à max_histogram_buckets) et un échantillon réservoir
+        d'au plus reservoir_size interactions.
+
+        Args:
+            df: DataFrame avec les colonnes emotion, theme, content, source, timestamp (optionnelles)
+        """
+        logger.info(f"📊 Ajout de {len(df)} éléments émotionnels")
+        if df.empty:
+            return
+
+        frame = self._prepare_frame(df)
+
+        # Nœuds émotion
+        for emotion, count in frame.groupby('emotion', sort=False).size().items():
+            if not self.graph.has_node(emotion):
+                self.graph.add_node(emotion, emotion_type=emotion, frequency=0, themes=set(), sources=set())
+            self.graph.nodes[emotion]['frequency'] += int(count)
+
+        for emotion, sources in frame.groupby('emotion', sort=False)['source'].unique().items():
+            self.graph.nodes[emotion]['sources'].update(sources)
+
+        # Nœuds thème
+        for theme, count in frame.groupby('theme', sort=False).size().items():
+            if not self.graph.has_node(theme):
+                self.graph.add_node(theme, node_type='theme', emotions=set(), frequency=0)
+            self.graph.nodes[theme]['frequency'] += int(count)
+
+        # Arêtes émotion-thème
+        pair_counts = frame.groupby(['emotion', 'theme'], sort=False).size()
+        samples = self._draw_samples(frame)
+        edges = {}
+
+        for (emotion, theme), count in zip(pair_counts.index.tolist(), pair_counts.tolist(), strict=False):
+            self.graph.nodes[emotion]['themes'].add(theme)
+            self.graph.nodes[theme]['emotions'].add(emotion)
+
+            if not self.graph.has_edge(emotion, theme):
+                self.graph.add_edge(emotion, theme, weight=0, sources={}, histogram={}, samples=[])
+
+            edge_data = edges[emotion, theme] = self.graph.edges[emotion, theme]
+            edge_data['samples'] = self._merge_reservoir(
+                edge_data['samples'], edge_data['weight'], samples.get((emotion, theme), []), count
+            )
+            edge_data['weight'] += count
+
+        source_counts = frame.groupby(['emotion', 'theme', 'source'], sort=False).size().reset_index(name='count')
+        for emotion, theme, source, count in zip(*(source_counts[c].tolist() for c in source_counts), strict=False):
+            edge_sources = edges[emotion, theme]['sources']
+            edge_sources[source] = edge_sources.get(source, 0) + count
+
+        bucket_counts = frame.groupby(['emotion', 'theme', 'bucket'], sort=False).size().reset_index(name='count')
+        for emotion, theme, bucket, count in zip(*(bucket_counts[c].tolist() for c in bucket_counts), strict=False):
+            histogram = edges[emotion, theme]['histogram']
+            histogram[bucket] = histogram.get(bucket, 0) + count
+
+        self._touched_nodes.update(node for pair in edges for node in pair)
+
+        # Garder les tranches les plus récentes (les clés ISO se trient chronologiquement)
+        for edge_data in edges.values():
+            if len(edge_data['histogram']) > self.max_histogram_buckets:
+                recent = sorted(edge_data['histogram'])[-self.max_histogram_buckets:]
+                edge_data['histogram'] = {bucket: edge_data['histogram'][bucket] for bucket in recent}
 
         logger.info(f"✅ Graphe mis à jour: {self.graph.number_of_nodes()} nœuds, {self.graph.number_of_edges()} arêtes")
 
+    def _prepare_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Normalise les colonnes d'entrée et calcule la tranche de temps de chaque ligne.
+
+        Args:
+            df: DataFrame brut
+
+        Returns:
+            DataFrame avec emotion, theme, content, source, timestamp et bucket
+        """
+        now = datetime.now().isoformat()
+        defaults = {'emotion': 'unknown', 'theme': 'general', 'content': '', 'source': 'unknown', 'timestamp': now}
+
+        frame = pd.DataFrame({
+            column: df[column].fillna(default) if column in df.columns else default
+            for column, default in defaults.items()
+        }, index=df.index)
+        frame['content'] = frame['content'].astype(str).str.slice(0, 100)  # Limiter la taille
+        frame['timestamp'] = frame['timestamp'].astype(str)
+
+        parsed = pd.to_datetime(frame['timestamp'], errors='coerce', utc=True, format='ISO8601')
+        parsed = parsed.fillna(pd.Timestamp.now(tz='UTC')).dt.floor(self.histogram_freq)
+        frame['bucket'] = np.datetime_as_string(parsed.dt.tz_localize(None).to_numpy(), unit='m')
+        return frame
+
+    def _draw_samples(self, frame: pd.DataFrame) -> dict:
+        """
+        Tire au plus reservoir_size interactions aléatoires par arête (mélange puis head par groupe).
+
+        Args:
+            frame: DataFrame normalisé
+
+        Returns:
+            Dictionnaire (émotion, thème) -> liste d'interactions
+        """
+        shuffled = frame.iloc[self._rng.permutation(len(frame))]
+        candidates = shuffled.groupby(['emotion', 'theme'], sort=False).head(self.reservoir_size)
+
+        samples = defaultdict(list)
+        columns = ['emotion', 'theme', 'timestamp', 'content', 'source']
+        for emotion, theme, timestamp, content, source in zip(*(candidates[c].tolist() for c in columns), strict=False):
+            samples[(emotion, theme)].append({'timestamp': timestamp, 'content': content, 'source': source})
+        return samples
+
+    def _merge_reservoir(self, current: list, seen: int, candidates: list, added: int) -> list:
+        """
+        Fusionne deux échantillons uniformes en un échantillon uniforme de l'ensemble.
+
+        Le nombre d'éléments repris du nouveau lot suit une loi hypergéométrique.
+
+        Args:
+            current: Échantillon existant (uniforme parmi seen interactions)
+            seen: Nombre d'interactions déjà vues sur l'arête
+            candidates: Échantillon aléatoire du nouveau lot
+            added: Taille du nouveau lot
+
+        Returns:
+            Nouvel échantillon d'au plus reservoir_size interactions
+        """
+        size = min(self.reservoir_size, seen + added)
+        from_new = int(self._rng.hypergeometric(added, seen, size)) if size else 0
+        kept = [current[i] for i in self._rng.permutation(len(current))[:size - from_new]]
+        return kept + candidates[:from_new]
+
+    def _build_incidence_matrix(self) -> tuple[list, list, sparse.csr_matrix]:
+        """
+        Construit la matrice d'incidence creuse émotions × thèmes.
+
+        Returns:
+            Nœuds émotion (lignes), thèmes (colonnes) et matrice CSR binaire
+        """
+        emotion_nodes = [node for node, data in self.graph.nodes(data=True) if data.get('emotion_type')]
+        theme_index = {}
+        indices = []
+        indptr = [0]
+
+        for emotion in emotion_nodes:
+            columns = {theme_index.setdefault(theme, len(theme_index))
+                       for theme in self.graph.nodes[emotion].get('themes', set())}
+            indices.extend(sorted(columns))
+            indptr.append(len(indices))
+
+        incidence = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(emotion_nodes), len(theme_index))
+        )
+        return emotion_nodes, list(theme_index), incidence
+
+    def _compute_theme_overlap(self) -> dict:
+        """
+        Calcule en une passe les matrices creuses de similarité de Jaccard et d'influence.
+
+        Co-occurrence = A·Aᵀ (thèmes partagés), |thèmes| = sommes des lignes de A :
+        jaccard[i, j] = inter / (|i| + |j| - inter), influence[i, j] = inter / |i|.
+
+        Returns:
+            Dictionnaire contenant les nœuds, les thèmes, l'incidence et les deux matrices
+        """
+        emotion_nodes, themes, incidence = self._build_incidence_matrix()
+
+        co_occurrence = (incidence @ incidence.T).tocoo()
+        off_diagonal = co_occurrence.row != co_occurrence.col
+        rows = co_occurrence.row[off_diagonal]
+        cols = co_occurrence.col[off_diagonal]
+        shared = co_occurrence.data[off_diagonal]
+
+        theme_counts = np.asarray(incidence.sum(axis=1)).ravel()
+        shape = (len(emotion_nodes), len(emotion_nodes))
+
+        jaccard = sparse.csr_matrix(
+            (shared / (theme_counts[rows] + theme_counts[cols] - shared), (rows, cols)), shape=shape
+        )
+        influence = sparse.csr_matrix((shared / theme_counts[rows], (rows, cols)), shape=shape)
+
+        return {
+            'emotion_nodes': emotion_nodes,
+            'themes': themes,
+            'incidence': incidence,
+            'jaccard': jaccard,
+            'influence': influence
+        }
+
+    @staticmethod
+    def _serialize_matrix(matrix: sparse.spmatrix) -> list | dict:
+        """
+        Sérialise une matrice creuse : liste dense pour les petits graphes, triplets sinon.
+
+        Args:
+            matrix: Matrice creuse carrée
+
+        Returns:
+            Liste de listes ou dictionnaire {shape, rows, cols, values}
+        """
+        if matrix.shape[0] <= DENSE_MATRIX_MAX_NODES:
+            return matrix.toarray().tolist()
+
+        coo = matrix.tocoo()
+        return {
+            'shape': list(coo.shape),
+            'rows': coo.row.tolist(),
+            'cols': coo.col.tolist(),
+            'values': coo.data.tolist()
+        }
+
     def perform_emotion_clustering(self, n_clusters: int = 5) -> dict:
         """
         Effectue le clustering des émotions par similarité sémantique.
@@ -109,34 +414,18 @@ class SocialEmotionGraph:
         """
         logger.info(f"🔍 Clustering des émotions en {n_clusters} groupes")
 
-        # Extraire les émotions et leurs embeddings
-        emotions = list(self.graph.nodes())
-        emotion_nodes = [node for node in emotions if self.graph.nodes[node].get('emotion_type')]
+        # Similarité de Jaccard sur les thèmes partagés (matrice creuse émotions × émotions)
+        overlap = self._compute_theme_overlap()
+        emotion_nodes = overlap['emotion_nodes']
 
         if len(emotion_nodes) < n_clusters:
             logger.warning(f"⚠️ Pas assez d'émotions pour {n_clusters} clusters")
             n_clusters = len(emotion_nodes)
 
-        # Créer une matrice de similarité basée sur les thèmes partagés
-        similarity_matrix = np.zeros((len(emotion_nodes), len(emotion_nodes)))
-
-        for i, emotion1 in enumerate(emotion_nodes):
-            for j, emotion2 in enumerate(emotion_nodes):
-                if i != j:
-                    # Calculer la similarité basée sur les thèmes partagés
-                    themes1 = self.graph.nodes[emotion1].get('themes', set())
-                    themes2 = self.graph.nodes[emotion2].get('themes', set())
-
-                    if themes1 and themes2:
-                        intersection = len(themes1.intersection(themes2))
-                        union = len(themes1.union(themes2))
-                        similarity = intersection / union if union > 0 else 0
-                        similarity_matrix[i][j] = similarity
-
-        # Clustering avec KMeans
+        # Clustering avec KMeans (accepte directement la matrice CSR)
         if n_clusters > 1:
             kmeans = KMeans(n_clusters=n_clusters, random_state=42)
-            cluster_labels = kmeans.fit_predict(similarity_matrix)
+            cluster_labels = kmeans.fit_predict(overlap['jaccard'])
         else:
             cluster_labels = [0] * len(emotion_nodes)
 
@@ -169,23 +458,77 @@ class SocialEmotionGraph:
 
         return cluster_metrics
 
-    def detect_emotion_communities(self) -> dict:
+    def is_large_graph(self) -> bool:
+        """
+        Indique si le graphe dépasse le seuil du mode grand graphe.
+
+        Returns:
+            True si le nombre de nœuds dépasse large_graph_threshold
+        """
+        return self.graph.number_of_nodes() > self.large_graph_threshold
+
+    def detect_emotion_communities(self, method: str | None = None) -> dict:
         """
         Détecte les communautés d'émotions dans le graphe.
 
+        Args:
+            method: 'greedy' (modularité gloutonne, exact), 'louvain' ou 'label_propagation'
+                (repart de la partition précédente). Par défaut : greedy pour les petits graphes ;
+                sinon propagation incrémentale si une partition existe, Louvain sinon.
+
         Returns:
             Dictionnaire des communautés détectées
         """
-        logger.info("🔍 Détection des communautés émotionnelles")
-
-        # Utiliser l'algorithme de détection de communautés de NetworkX
+        if method is None:
+            if not self.is_large_graph():
+                method = 'greedy'
+            else:
+                method = 'label_propagation' if self.node_communities else 'louvain'
+
+        logger.info(f"🔍 Détection des communautés émotionnelles ({method})")
+        start = time.perf_counter()
+        warm_start = method == 'label_propagation' and bool(self.node_communities)
+        updated_nodes = self.graph.number_of_nodes()
+
+        # Utiliser les algorithmes de détection de communautés de NetworkX
         try:
-            communities = nx.community.greedy_modularity_communities(self.graph)
-        except:
+            if method == 'louvain':
+                communities = nx.community.louvain_communities(self.graph, weight='weight', seed=self.seed)
+            elif method == 'label_propagation':
+                communities, updated_nodes = self._propagate_labels()
+            else:
+                communities = nx.community.greedy_modularity_communities(self.graph)
+        except Exception as e:
             # Fallback si l'algorithme échoue
+            logger.warning(f"⚠️ Détection des communautés ({method}) impossible: {e}")
             communities = [list(self.graph.nodes())]
 
+        community_structure = self._set_communities(sorted(communities, key=len, reverse=True))
+        self.community_detection_info = {
+            'method': method,
+            'warm_start': warm_start,
+            'updated_nodes': updated_nodes,
+            'seconds': time.perf_counter() - start
+        }
+
+        logger.info(f"✅ {len(communities)} communautés détectées en {self.community_detection_info['seconds']:.2f}s")
+        for name, structure in list(community_structure.items())[:10]:
+            logger.info(f"   {name}: {structure['size']} nœuds ({len(structure['emotions'])} émotions, {len(structure['themes'])} thèmes)")
+
+        return community_structure
+
+    def _set_communities(self, communities: list) -> dict:
+        """
+        Enregistre une partition (structure par communauté et communauté de chaque nœud).
+
+        Args:
+            communities: Liste des communautés, la position donnant l'identifiant
+
+        Returns:
+            Structure des communautés
+        """
         community_structure = {}
+        self.node_communities = {}
         for i, community in enumerate(communities):
             community_name = f"community_{i}"
             community_structure[community_name] = {
@@ -194,64 +537,124 @@ class SocialEmotionGraph:
                 'emotions': [node for node in community if self.graph.nodes[node].get('emotion_type')],
                 'themes': [node for node in community if self.graph.nodes[node].get('node_type') == 'theme']
             }
+            self.node_communities.update(dict.fromkeys(community, i))
 
         self.community_structure = community_structure
+        self._touched_nodes.clear()
+        return community_structure
 
-        logger.info(f"✅ {len(communities)} communautés détectées")
-        for name, structure in community_structure.items():
-            logger.info(f"   {name}: {structure['size']} nœuds ({len(structure['emotions'])} émotions, {len(structure['themes'])} thèmes)")
+    def _propagate_labels(self, max_rounds: int = 20) -> tuple[list[set], int]:
+        """
+        Propagation de labels asynchrone pondérée, initialisée avec la partition précédente.
 
-        return community_structure
+        Seuls les nœuds nouveaux ou modifiés depuis la dernière détection sont réévalués ;
+        un nœud qui change de label ajoute ses voisins au tour suivant.
+
+        Args:
+            max_rounds: Nombre maximum de tours de propagation
 
-    def analyze_emotion_influence(self) -> dict:
+        Returns:
+            Liste des communautés et nombre de nœuds réévalués
+        """
+        labels = {}
+        next_label = max(self.node_communities.values(), default=-1) + 1
+        for node in self.graph.nodes():
+            if node in self.node_communities:
+                labels[node] = self.node_communities[node]
+            else:
+                labels[node] = next_label
+                next_label += 1
+
+        if self.node_communities:
+            frontier = {node for node in self._touched_nodes if node in self.graph}
+            frontier.update(node for node in self.graph.nodes() if node not in self.node_communities)
+        else:
+            frontier = set(self.graph.nodes())
+
+        updated = set()
+        for _ in range(max_rounds):
+            if not frontier:
+                break
+            updated.update(frontier)
+            order = list(frontier)
+            self._rng.shuffle(order)
+            frontier = set()
+
+            for node in order:
+                scores = defaultdict(float)
+                for neighbor, edge_data in self.graph.adj[node].items():
+                    scores[labels[neighbor]] += edge_data.get('weight', 1)
+                if not scores:
+                    continue
+
+                best = max(scores.values())
+                if scores.get(labels[node]) == best:
+                    continue  # Garder le label courant en cas d'égalité (stabilité)
+
+                candidates = [label for label, score in scores.items() if score == best]
+                labels[node] = candidates[int(self._rng.integers(len(candidates)))]
+                frontier.update(self.graph.adj[node])
+
+        communities = defaultdict(set)
+        for node, label in labels.items():
+            communities[label].add(node)
+        return list(communities.values()), len(updated)
+
+    def analyze_emotion_influence(self, max_relations: int | None = None) -> dict:
         """
         Analyse l'influence entre les émotions.
 
+        Args:
+            max_relations: Nombre maximum de relations détaillées (les plus fortes), toutes si None
+
         Returns:
             Dictionnaire des influences émotionnelles
         """
         logger.info("📊 Analyse des influences émotionnelles")
 
-        # Calculer la matrice d'influence basée sur les poids des arêtes
-        emotion_nodes = [node for node in self.graph.nodes()
-                        if self.graph.nodes[node].get('emotion_type')]
+        # Influence i -> j = thèmes partagés / thèmes de i (même passe que la similarité de Jaccard)
+        overlap = self._compute_theme_overlap()
+        emotion_nodes = overlap['emotion_nodes']
+        influence_matrix = overlap['influence']
+        incidence = overlap['incidence']
+        themes = overlap['themes']
 
-        influence_matrix = np.zeros((len(emotion_nodes), len(emotion_nodes)))
-        influence_dict = {}
+        coo = influence_matrix.tocoo()
+        rows, cols, scores = coo.row, coo.col, coo.data
 
-        for i, emotion1 in enumerate(emotion_nodes):
-            for j, emotion2 in enumerate(emotion_nodes):
-                if i != j:
-                    # Calculer l'influence basée sur les thèmes partagés
-                    themes1 = self.graph.nodes[emotion1].get('themes', set())
-                    themes2 = self.graph.nodes[emotion2].get('themes', set())
-
-                    if themes1 and themes2:
-                        shared_themes = themes1.intersection(themes2)
-                        influence = len(shared_themes) / len(themes1) if themes1 else 0
-                        influence_matrix[i][j] = influence
-
-                        if influence > 0:
-                            influence_dict[f"{emotion1}_to_{emotion2}"] = {
-                                'influence_score': influence,
-                                'shared_themes': list(shared_themes),
-                                'source_frequency': self.graph.nodes[emotion1]['frequency'],
-                                'target_frequency': self.graph.nodes[emotion2]['frequency']
-                            }
+        if max_relations is not None and len(scores) > max_relations:
+            # Relations les plus fortes uniquement (graphes à grain fin)
+            keep = np.argpartition(-scores, max_relations - 1)[:max_relations]
+            keep = keep[np.argsort(-scores[keep], kind='stable')]
+            rows, cols, scores = rows[keep], cols[keep], scores[keep]
+
+        frequencies = [self.graph.nodes[emotion]['frequency'] for emotion in emotion_nodes]
+        influence_dict = {}
+        for i, j, influence in zip(rows.tolist(), cols.tolist(), scores.tolist(), strict=False):
+            shared = np.intersect1d(
+                incidence.indices[incidence.indptr[i]:incidence.indptr[i + 1]],
+                incidence.indices[incidence.indptr[j]:incidence.indptr[j + 1]],
+                assume_unique=True
+            )
+            influence_dict[f"{emotion_nodes[i]}_to_{emotion_nodes[j]}"] = {
+                'influence_score': influence,
+                'shared_themes': [themes[t] for t in shared],
+                'source_frequency': frequencies[i],
+                'target_frequency': frequencies[j]
+            }
 
         self.influence_matrix = influence_matrix
 
         # Identifier les émotions les plus influentes
-        influence_scores = np.sum(influence_matrix, axis=1)
+        influence_scores = np.asarray(influence_matrix.sum(axis=1)).ravel()
         most_influential = []
 
-        for i, score in enumerate(influence_scores):
-            if score > 0:
-                most_influential.append({
-                    'emotion': emotion_nodes[i],
-                    'influence_score': score,
-                    'frequency': self.graph.nodes[emotion_nodes[i]]['frequency']
-                })
+        for i in np.flatnonzero(influence_scores > 0):
+            most_influential.append({
+                'emotion': emotion_nodes[i],
+                'influence_score': float(influence_scores[i]),
+                'frequency': frequencies[i]
+            })
 
         most_influential.sort(key=lambda x: x['influence_score'], reverse=True)
 
@@ -261,7 +664,7 @@ class SocialEmotionGraph:
             logger.info(f"   {i+1}. {emotion_data['emotion']}: score {emotion_data['influence_score']:.3f}")
 
         return {
-            'influence_matrix': influence_matrix.tolist(),
+            'influence_matrix': self._serialize_matrix(influence_matrix),
             'influence_relations': influence_dict,
             'most_influential': most_influential[:10],
             'emotion_nodes': emotion_nodes
@@ -301,141 +704,445 @@ class SocialEmotionGraph:
 
         return theme_mapping
 
-    def visualize_graph(self, output_path: str = "data/processed/social_emotion_graph.png") -> None:
+    def visualize_graph(self, output_path: str = "data/processed/social_emotion_graph.png", dpi: int = 300) -> dict:
         """
         Visualise le graphe social des émotions.
 
+        Au-delà de layout_max_nodes nœuds, la vue dessinée est agrégée par communauté
+        (ou réduite aux nœuds les plus fréquents sans partition). Le layout est mis en cache
+        et recalculé à partir des positions précédentes quand la vue change.
+
         Args:
             output_path: Chemin de sauvegarde de la visualisation
+            dpi: Résolution de l'image
+
+        Returns:
+            Dictionnaire avec la vue dessinée et les durées de layout et de rendu
         """
         logger.info("📊 Génération de la visualisation du graphe")
 
+        view, view_type = self._build_view()
+        layout_start = time.perf_counter()
+        pos, cached = self.compute_layout(view)
+        layout_seconds = time.perf_counter() - layout_start
+
+        render_start = time.perf_counter()
         plt.figure(figsize=(15, 10))
 
-        # Positionner les nœuds
-        pos = nx.spring_layout(self.graph, k=3, iterations=50)
-
-        # Séparer les nœuds par type
-        emotion_nodes = [node for node in self.graph.nodes()
-                        if self.graph.nodes[node].get('emotion_type')]
-        theme_nodes = [node for node in self.graph.nodes()
-                      if self.graph.nodes[node].get('node_type') == 'theme']
-
-        # Dessiner le graphe
-        nx.draw_networkx_nodes(self.graph, pos,
-                              nodelist=emotion_nodes,
-                              node_color='lightblue',
-                              node_size=500,
-                              alpha=0.7,
-                              label='Émotions')
-
-        nx.draw_networkx_nodes(self.graph, pos,
-                              nodelist=theme_nodes,
-                              node_color='lightcoral',
-                              node_size=300,
-                              alpha=0.7,
-                              label='Thèmes')
+        if view_type == 'aggregated':
+            sizes = np.array([view.nodes[node]['size'] for node in view.nodes()], dtype=float)
+            nx.draw_networkx_nodes(view, pos,
+                                  node_color='lightblue',
+                                  node_size=100 + 900 * sizes / max(sizes.max(), 1),
+                                  alpha=0.7,
+                                  label='Communautés')
+        else:
+            # Séparer les nœuds par type
+            emotion_nodes = [node for node in view.nodes()
+                            if view.nodes[node].get('emotion_type')]
+            theme_nodes = [node for node in view.nodes()
+                          if view.nodes[node].get('node_type') == 'theme']
+
+            # Dessiner le graphe
+            nx.draw_networkx_nodes(view, pos,
+                                  nodelist=emotion_nodes,
+                                  node_color='lightblue',
+                                  node_size=500,
+                                  alpha=0.7,
+                                  label='Émotions')
+
+            nx.draw_networkx_nodes(view, pos,
+                                  nodelist=theme_nodes,
+                                  node_color='lightcoral',
+                                  node_size=300,
+                                  alpha=0.7,
+                                  label='Thèmes')
 
         # Dessiner les arêtes
-        nx.draw_networkx_edges(self.graph, pos,
+        nx.draw_networkx_edges(view, pos,
                               edge_color='gray',
                               alpha=0.5,
                               width=1)
 
         # Ajouter les labels
-        nx.draw_networkx_labels(self.graph, pos,
-                               font_size=8,
-                               font_weight='bold')
-
-        plt.title("Graphe Social des Émotions - Semantic Pulse X", fontsize=16, fontweight='bold')
+        if view.number_of_nodes() <= LABEL_MAX_NODES:
+            nx.draw_networkx_labels(view, pos,
+                                   font_size=8,
+                                   font_weight='bold')
+
+        title = "Graphe Social des Émotions - Semantic Pulse X"
+        if view_type != 'full':
+            title += f" ({view_type}: {view.number_of_nodes()}/{self.graph.number_of_nodes()} nœuds)"
+        plt.title(title, fontsize=16, fontweight='bold')
         plt.legend()
         plt.axis('off')
 
         # Sauvegarder
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        plt.savefig(output_path, dpi=dpi, bbox_inches='tight')
         plt.close()
+        render_seconds = time.perf_counter() - render_start
+
+        logger.info(f"✅ Visualisation sauvegardée: {output_path} "
+                    f"(layout {layout_seconds:.2f}s{' en cache' if cached else ''}, rendu {render_seconds:.2f}s)")
+        return {
+            'output_path': output_path,
+            'view': view_type,
+            'view_nodes': view.number_of_nodes(),
+            'view_edges': view.number_of_edges(),
+            'layout_cached': cached,
+            'layout_seconds': layout_seconds,
+            'render_seconds': render_seconds
+        }
+
+    def _build_view(self) -> tuple[nx.Graph, str]:
+        """
+        Construit le graphe à dessiner selon la taille du graphe.
+
+        Returns:
+            Graphe de la vue et type de vue ('full', 'aggregated' ou 'sampled')
+        """
+        if self.graph.number_of_nodes() <= self.layout_max_nodes:
+            return self.graph, 'full'
+
+        if self.node_communities and len(self.node_communities) < self.graph.number_of_nodes():
+            # Nœuds ajoutés depuis la dernière détection: rattachés par propagation incrémentale
+            self.detect_emotion_communities(method='label_propagation')
+
+        if self.node_communities:
+            # Un nœud par communauté, arêtes pondérées par la somme des poids entre communautés
+            view = nx.Graph()
+            kept = set(range(min(len(self.community_structure), self.layout_max_nodes)))
+            view.add_nodes_from(
+                (f"community_{i}", {'size': self.community_structure[f"community_{i}"]['size']}) for i in kept
+            )
+
+            weights = defaultdict(float)
+            for u, v, weight in self.graph.edges(data='weight', default=1):
+                cu, cv = self.node_communities[u], self.node_communities[v]
+                if cu != cv and cu in kept and cv in kept:
+                    weights[min(cu, cv), max(cu, cv)] += weight
+            view.add_edges_from(
+                (f"community_{cu}", f"community_{cv}", {'weight': weight}) for (cu, cv), weight in weights.items()
+            )
+            return view, 'aggregated'
+
+        # Sans partition: sous-graphe induit par les extrémités des arêtes les plus lourdes
+        kept = {}
+        for u, v, _ in sorted(self.graph.edges(data='weight', default=1), key=lambda x: x[2], reverse=True):
+            kept.update(dict.fromkeys((u, v)))
+            if len(kept) >= self.layout_max_nodes:
+                break
+        return self.graph.subgraph(list(kept)[:self.layout_max_nodes]), 'sampled'
+
+    @staticmethod
+    def _graph_version(graph: nx.Graph) -> str:
+        """
+        Empreinte de la structure et des poids d'un graphe (clé du cache de layout).
+
+        Args:
+            graph: Graphe à identifier
 
-        logger.info(f"✅ Visualisation sauvegardée: {output_path}")
+        Returns:
+            Hash hexadécimal
+        """
+        digest = hashlib.sha1()
+        for node in sorted(map(str, graph.nodes())):
+            digest.update(node.encode('utf-8') + b"\x00")
+        edges = sorted(tuple(sorted((str(u), str(v)))) + (weight,) for u, v, weight in graph.edges(data='weight', default=1))
+        for u, v, weight in edges:
+            digest.update(f"{u}\x00{v}\x00{weight}\x01".encode())
+        return digest.hexdigest()
+
+    def compute_layout(self, graph: nx.Graph | None = None) -> tuple[dict, bool]:
+        """
+        Layout spring mis en cache par version du graphe.
+
+        Si la version a changé, les positions précédentes servent de point de départ
+        (nouveaux nœuds placés au barycentre de leurs voisins) et seules relayout_iterations
+        itérations sont effectuées.
+
+        Args:
+            graph: Graphe à positionner (graphe complet si None)
+
+        Returns:
+            Positions des nœuds et indicateur de cache
+        """
+        graph = self.graph if graph is None else graph
+        version = self._graph_version(graph)
+        if self._layout_cache.get('version') == version:
+            return self._layout_cache['positions'], True
+
+        previous = self._layout_cache.get('positions', {})
+        initial = {node: previous[node] for node in graph.nodes() if node in previous}
+
+        if initial:
+            for node in graph.nodes():
+                if node not in initial:
+                    placed = [previous[neighbor] for neighbor in graph.adj[node] if neighbor in previous]
+                    center = np.mean(placed, axis=0) if placed else np.zeros(2)
+                    initial[node] = center + self._rng.normal(scale=0.05, size=2)
+            positions = nx.spring_layout(graph, k=3, pos=initial, iterations=self.relayout_iterations, seed=self.seed)
+        else:
+            positions = nx.spring_layout(graph, k=3, iterations=50, seed=self.seed)
+
+        self._layout_cache = {'version': version, 'positions': positions}
+        return positions, False
 
     def export_graph_data(self, output_path: str = "data/processed/social_graph_data.json") -> dict:
         """
-        Exporte les données du graphe social.
+        Exporte les données du graphe social en JSON, écrit en flux (un nœud / une arête à la fois).
 
         Args:
             output_path: Chemin de sauvegarde des données
 
         Returns:
-            Dictionnaire contenant toutes les données du graphe
+            Dictionnaire contenant les métadonnées de l'export et le chemin du fichier
         """
         logger.info("💾 Export des données du graphe social")
 
-        graph_data = {
-            'metadata': {
-                'timestamp': datetime.now().isoformat(),
-                'total_nodes': self.graph.number_of_nodes(),
-                'total_edges': self.graph.number_of_edges(),
-                'emotion_nodes': len([n for n in self.graph.nodes() if self.graph.nodes[n].get('emotion_type')]),
-                'theme_nodes': len([n for n in self.graph.nodes() if self.graph.nodes[n].get('node_type') == 'theme'])
-            },
-            'nodes': dict(self.graph.nodes(data=True)),
-            'edges': list(self.graph.edges(data=True)),
+        metadata = {
+            'timestamp': datetime.now().isoformat(),
+            'total_nodes': self.graph.number_of_nodes(),
+            'total_edges': self.graph.number_of_edges(),
+            'emotion_nodes': len([n for n in self.graph.nodes() if self.graph.nodes[n].get('emotion_type')]),
+            'theme_nodes': len([n for n in self.graph.nodes() if self.graph.nodes[n].get('node_type') == 'theme'])
+        }
+        sections = {
             'emotion_clusters': self.emotion_clusters,
             'community_structure': self.community_structure,
             'theme_mapping': self.theme_mapping,
             'influence_analysis': self.analyze_emotion_influence() if self.influence_matrix is None else {
-                'influence_matrix': self.influence_matrix.tolist(),
+                'influence_matrix': self._serialize_matrix(self.influence_matrix),
                 'most_influential': []
             }
         }
 
-        # Convertir les sets en listes pour la sérialisation JSON
-        for node_data in graph_data['nodes'].values():
-            if 'themes' in node_data:
-                node_data['themes'] = list(node_data['themes'])
-            if 'sources' in node_data:
-                node_data['sources'] = list(node_data['sources'])
-            if 'emotions' in node_data:
-                node_data['emotions'] = list(node_data['emotions'])
-
-        # Sauvegarder
+        # Sauvegarder (les sets sont convertis en listes à l'écriture, le graphe n'est pas modifié)
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(graph_data, f, ensure_ascii=False, indent=2)
+        with open(output_path, 'w', encoding='utf-8') as out:
+            out.write('{\n"metadata": ' + json.dumps(metadata, ensure_ascii=False) + ',\n"nodes": {\n')
+            for i, (node, node_data) in enumerate(self.graph.nodes(data=True)):
+                out.write(",\n" if i else "")
+                out.write(json.dumps(str(node), ensure_ascii=False) + ": "
+                          + json.dumps(node_data, ensure_ascii=False, default=list))
+
+            out.write('\n},\n"edges": [\n')
+            for i, edge in enumerate(self.graph.edges(data=True)):
+                out.write(",\n" if i else "")
+                out.write(json.dumps(edge, ensure_ascii=False, default=list))
+            out.write("\n]")
+
+            for key, value in sections.items():
+                out.write(f',\n"{key}": ' + json.dumps(value, ensure_ascii=False, default=list))
+            out.write("\n}\n")
 
         logger.info(f"✅ Données exportées: {output_path}")
-        return graph_data
+        return {'metadata': metadata, 'output_path': output_path}
+
+    def save_snapshot(self, snapshot_dir: str = "data/processed/social_graph_snapshot") -> Path:
+        """
+        Sauvegarde un snapshot binaire du graphe : tables Parquet des nœuds et des arêtes.
+
+        Args:
+            snapshot_dir: Répertoire du snapshot (nodes.parquet, edges.parquet, metadata.json)
+
+        Returns:
+            Chemin du répertoire du snapshot
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        logger.info("💾 Snapshot du graphe social")
+        snapshot_path = Path(snapshot_dir)
+        snapshot_path.mkdir(parents=True, exist_ok=True)
+
+        nodes = list(self.graph.nodes(data=True))
+        node_table = pa.table({
+            'node': [str(node) for node, _ in nodes],
+            'kind': ['theme' if data.get('node_type') == 'theme' else 'emotion' for _, data in nodes],
+            'frequency': [data.get('frequency', 0) for _, data in nodes],
+            'themes': [list(data['themes']) if 'themes' in data else None for _, data in nodes],
+            'sources': [list(data['sources']) if 'sources' in data else None for _, data in nodes],
+            'emotions': [list(data['emotions']) if 'emotions' in data else None for _, data in nodes],
+            'community': [self.node_communities.get(node) for node, _ in nodes]
+        }, schema=pa.schema([
+            ('node', pa.string()),
+            ('kind', pa.string()),
+            ('frequency', pa.int64()),
+            ('themes', pa.list_(pa.string())),
+            ('sources', pa.list_(pa.string())),
+            ('emotions', pa.list_(pa.string())),
+            ('community', pa.int64())
+        ]))
+
+        # Arêtes orientées émotion -> thème
+        edges = [
+            (u, v, data) if self.graph.nodes[u].get('emotion_type') else (v, u, data)
+            for u, v, data in self.graph.edges(data=True)
+        ]
+        edge_table = pa.table({
+            'emotion': [str(emotion) for emotion, _, _ in edges],
+            'theme': [str(theme) for _, theme, _ in edges],
+            'weight': [data.get('weight', 0) for _, _, data in edges],
+            'source_names': [list(data.get('sources', {})) for _, _, data in edges],
+            'source_counts': [list(data.get('sources', {}).values()) for _, _, data in edges],
+            'buckets': [list(data.get('histogram', {})) for _, _, data in edges],
+            'bucket_counts': [list(data.get('histogram', {}).values()) for _, _, data in edges],
+            'samples': [data.get('samples', []) for _, _, data in edges]
+        }, schema=pa.schema([
+            ('emotion', pa.string()),
+            ('theme', pa.string()),
+            ('weight', pa.int64()),
+            ('source_names', pa.list_(pa.string())),
+            ('source_counts', pa.list_(pa.int64())),
+            ('buckets', pa.list_(pa.string())),
+            ('bucket_counts', pa.list_(pa.int64())),
+            ('samples', pa.list_(pa.struct([
+                ('timestamp', pa.string()), ('content', pa.string()), ('source', pa.string())
+            ])))
+        ]))
+
+        pq.write_table(node_table, snapshot_path / "nodes.parquet")
+        pq.write_table(edge_table, snapshot_path / "edges.parquet")
+
+        metadata = {
+            'format_version': SNAPSHOT_FORMAT_VERSION,
+            'timestamp': datetime.now().isoformat(),
+            'total_nodes': len(nodes),
+            'total_edges': len(edges),
+            'parameters': {
+                'reservoir_size': self.reservoir_size,
+                'histogram_freq': self.histogram_freq,
+                'max_histogram_buckets': self.max_histogram_buckets,
+                'seed': self.seed,
+                'large_graph_threshold': self.large_graph_threshold,
+                'betweenness_samples': self.betweenness_samples,
+                'layout_max_nodes': self.layout_max_nodes,
+                'relayout_iterations': self.relayout_iterations
+            },
+            'community_detection_info': self.community_detection_info
+        }
+        (snapshot_path / "metadata.json").write_text(json.dumps(metadata, indent=2, ensure_ascii=False), encoding='utf-8')
 
-    def get_graph_statistics(self) -> dict:
+        logger.info(f"✅ Snapshot sauvegardé: {snapshot_path} ({len(nodes)} nœuds, {len(edges)} arêtes)")
+        return snapshot_path
+
+    @classmethod
+    def load_snapshot(cls, snapshot_dir: str = "data/processed/social_graph_snapshot") -> "SocialEmotionGraph":
+        """
+        Recharge un snapshot : lecture colonnaire puis construction du graphe en une passe.
+
+        Args:
+            snapshot_dir: Répertoire créé par save_snapshot
+
+        Returns:
+            Graphe social restauré (attributs, arêtes compactes et partition en communautés)
+        """
+        import pyarrow.parquet as pq
+
+        snapshot_path = Path(snapshot_dir)
+        metadata = json.loads((snapshot_path / "metadata.json").read_text(encoding='utf-8'))
+        if metadata.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Format de snapshot non supporté: {metadata.get('format_version')}")
+
+        social_graph = cls(**metadata['parameters'])
+        nodes = pq.read_table(snapshot_path / "nodes.parquet").to_pydict()
+        edges = pq.read_table(snapshot_path / "edges.parquet").to_pydict()
+
+        social_graph.graph.add_nodes_from(
+            (node, {'emotion_type': node, 'frequency': frequency, 'themes': set(themes), 'sources': set(sources)})
+            if kind == 'emotion' else
+            (node, {'node_type': 'theme', 'emotions': set(emotions), 'frequency': frequency})
+            for node, kind, frequency, themes, sources, emotions in zip(
+                nodes['node'], nodes['kind'], nodes['frequency'],
+                nodes['themes'], nodes['sources'], nodes['emotions'], strict=False
+            )
+        )
+        social_graph.graph.add_edges_from(
+            (emotion, theme, {
+                'weight': weight,
+                'sources': dict(zip(source_names, source_counts, strict=False)),
+                'histogram': dict(zip(buckets, bucket_counts, strict=False)),
+                'samples': samples
+            })
+            for emotion, theme, weight, source_names, source_counts, buckets, bucket_counts, samples in zip(
+                edges['emotion'], edges['theme'], edges['weight'], edges['source_names'], edges['source_counts'],
+                edges['buckets'], edges['bucket_counts'], edges['samples'], strict=False
+            )
+        )
+
+        # Partition précédente: permet la détection incrémentale après redémarrage
+        communities = defaultdict(list)
+        for node, community in zip(nodes['node'], nodes['community'], strict=False):
+            if community is not None:
+                communities[community].append(node)
+        if communities:
+            social_graph._set_communities([communities[i] for i in sorted(communities)])
+            social_graph.community_detection_info = metadata.get('community_detection_info', {})
+
+        logger.info(f"✅ Snapshot chargé: {snapshot_path} ({social_graph.graph.number_of_nodes()} nœuds, "
+                    f"{social_graph.graph.number_of_edges()} arêtes)")
+        return social_graph
+
+    def get_graph_statistics(self, large_graph: bool | None = None) -> dict:
         """
         Calcule les statistiques du graphe social.
 
+        Args:
+            large_graph: Force le mode grand graphe (betweenness sur k sources échantillonnées,
+                clustering moyen approché) ; automatique selon large_graph_threshold si None
+
         Returns:
-            Dictionnaire des statistiques
+            Dictionnaire des statistiques (avec la durée de chaque métrique dans 'timings')
         """
         logger.info("📊 Calcul des statistiques du graphe")
 
+        if large_graph is None:
+            large_graph = self.is_large_graph()
+
+        timings = {}
+
+        def timed(name, func, *args, **kwargs):
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            timings[name] = time.perf_counter() - start
+            return result
+
         emotion_nodes = [n for n in self.graph.nodes() if self.graph.nodes[n].get('emotion_type')]
         theme_nodes = [n for n in self.graph.nodes() if self.graph.nodes[n].get('node_type') == 'theme']
 
+        if large_graph:
+            average_clustering = timed(
+                'average_clustering', nx.approximation.average_clustering, self.graph, trials=1000, seed=self.seed
+            ) if self.graph.number_of_nodes() else 0.0
+        else:
+            average_clustering = timed('average_clustering', nx.average_clustering, self.graph)
+
         stats = {
+            'mode': 'approximate' if large_graph else 'exact',
             'basic_metrics': {
                 'total_nodes': self.graph.number_of_nodes(),
                 'total_edges': self.graph.number_of_edges(),
                 'emotion_nodes': len(emotion_nodes),
                 'theme_nodes': len(theme_nodes),
-                'density': nx.density(self.graph),
-                'average_clustering': nx.average_clustering(self.graph)
+                'density': timed('density', nx.density, self.graph),
+                'average_clustering': average_clustering
             },
             'centrality_measures': {},
             'community_metrics': {},
-            'clustering_metrics': {}
+            'clustering_metrics': {},
+            'timings': timings
         }
 
         if len(emotion_nodes) > 0:
             # Mesures de centralité
-            degree_centrality = nx.degree_centrality(self.graph)
-            betweenness_centrality = nx.betweenness_centrality(self.graph)
+            degree_centrality = timed('degree_centrality', nx.degree_centrality, self.graph)
+            if large_graph:
+                betweenness_centrality = timed('betweenness_centrality', self._sampled_betweenness,
+                                               self.betweenness_samples)
+            else:
+                betweenness_centrality = timed('betweenness_centrality', nx.betweenness_centrality, self.graph)
 
             stats['centrality_measures'] = {
                 'top_degree_centrality': sorted(degree_centrality.items(), key=lambda x: x[1], reverse=True)[:5],
@@ -447,7 +1154,8 @@ class SocialEmotionGraph:
             stats['community_metrics'] = {
                 'total_communities': len(self.community_structure),
                 'community_sizes': [structure['size'] for structure in self.community_structure.values()],
-                'average_community_size': np.mean([structure['size'] for structure in self.community_structure.values()])
+                'average_community_size': np.mean([structure['size'] for structure in self.community_structure.values()]),
+                'detection': self.community_detection_info
             }
 
         # Métriques de clustering
@@ -458,12 +1166,74 @@ class SocialEmotionGraph:
                 'average_cluster_size': np.mean([len(emotions) for emotions in self.emotion_clusters.values()])
             }
 
-        logger.info("✅ Statistiques calculées")
+        logger.info(f"✅ Statistiques calculées ({stats['mode']}, {sum(timings.values()):.2f}s)")
         logger.info(f"   📊 Densité: {stats['basic_metrics']['density']:.3f}")
         logger.info(f"   🔗 Clustering moyen: {stats['basic_metrics']['average_clustering']:.3f}")
+        for name, seconds in timings.items():
+            logger.info(f"   ⏱️ {name}: {seconds:.3f}s")
 
         return stats
 
+    def _sampled_betweenness(self, k: int, batch_size: int = 64) -> dict:
+        """
+        Betweenness approchée sur k sources tirées avec la graine (algorithme de Brandes matriciel).
+
+        Les parcours en largeur d'un lot de sources avancent ensemble par produits matrice creuse ×
+        matrice dense (nombre de plus courts chemins), puis les dépendances sont accumulées niveau
+        par niveau en sens inverse. Même normalisation que nx.betweenness_centrality(k=...).
+
+        Args:
+            k: Nombre de sources échantillonnées
+            batch_size: Nombre de sources traitées simultanément
+
+        Returns:
+            Dictionnaire nœud -> betweenness normalisée
+        """
+        nodes = list(self.graph.nodes())
+        n = len(nodes)
+        if n <= 2:
+            return dict.fromkeys(nodes, 0.0)
+
+        k = min(k, n)
+        adjacency = nx.to_scipy_sparse_array(self.graph, nodelist=nodes, weight=None, format='csr')
+        adjacency.data[:] = 1.0
+        sources = np.random.default_rng(self.seed).choice(n, size=k, replace=False)
+        betweenness = np.zeros(n)
+
+        for start in range(0, k, batch_size):
+            batch = sources[start:start + batch_size]
+            columns = np.arange(len(batch))
+
+            # Parcours en largeur simultanés : sigma = nombre de plus courts chemins depuis chaque source
+            sigma = np.zeros((n, len(batch)))
+            sigma[batch, columns] = 1.0
+            depth = np.full((n, len(batch)), -1, dtype=np.int32)
+            depth[batch, columns] = 0
+            frontier = sigma.copy()
+            level = 0
+            while True:
+                reached = adjacency @ frontier
+                reached[depth >= 0] = 0.0
+                if not reached.any():
+                    break
+                level += 1
+                depth[reached > 0] = level
+                sigma += reached
+                frontier = reached
+
+            # Accumulation des dépendances, du niveau le plus profond vers les sources
+            delta = np.zeros_like(sigma)
+            safe_sigma = np.where(sigma > 0, sigma, 1.0)
+            for current in range(level, 0, -1):
+                weights = np.where(depth == current, (1.0 + delta) / safe_sigma, 0.0)
+                delta += np.where(depth == current - 1, (adjacency @ weights) * sigma, 0.0)
+
+            delta[batch, columns] = 0.0
+            betweenness += delta.sum(axis=1)
+
+        betweenness *= n / (k * (n - 1) * (n - 2))
+        return dict(zip(nodes, betweenness.tolist(), strict=False))
+
 def create_sample_emotion_data() -> list[dict]:
     """
     Crée des données émotionnelles d'exemple pour les tests.
@@ -3,14 +3,17 @@ Clustering thématique - Semantic Pulse X
 Regroupement sémantique des sujets avec BERTopic
 """
 
+import json
+import time
 from collections import Counter
+from pathlib import Path
 from typing import Any
 
-from bertopic import BERTopic
-from sklearn.cluster import HDBSCAN
-from sklearn.metrics.pairwise import cosine_similarity
+import numpy as np
 
-from app.backend.ai.embeddings import embedding_engine
+from app.backend.ai.embeddings import embedding_engine, normalize_rows, top_k_indices
+from app.backend.ai.model_registry import model_registry
+from app.backend.core.config import settings
 
 
 class TopicClusteringEngine:
@@ -20,102 +23,317 @@ class TopicClusteringEngine:
         self.bertopic_model = None
         self.topics = {}
         self.topic_embeddings = {}
+        # Matrice des représentations de topics normalisées (calculée au fit), hors outliers (-1)
+        self.topic_centroids: np.ndarray | None = None
+        self.topic_centroid_ids = np.array([], dtype=int)
+        # État du mode incrémental: date du dernier (re)fit, documents vus, taux d'outliers de référence
+        self.model_state = {}
+        self.model_path = Path(settings.topic_model_path)
         self._initialize_model()
+        self._load_persisted_model()
 
     def _initialize_model(self):
         """Initialise le modèle BERTopic"""
         try:
-            # Configuration HDBSCAN pour clustering
-            hdbscan_model = HDBSCAN(
-                min_cluster_size=5,
-                min_samples=3,
-                metric='euclidean',
-                cluster_selection_method='eom'
-            )
-
-            # Modèle BERTopic
-            self.bertopic_model = BERTopic(
-                hdbscan_model=hdbscan_model,
-                embedding_model=embedding_engine.model,
-                verbose=True
-            )
-
+            self.bertopic_model = self._create_model()
             print("✅ Modèle BERTopic initialisé")
         except Exception as e:
             print(f"❌ Erreur initialisation BERTopic: {e}")
             self.bertopic_model = None
 
-    def fit_topics(self, texts: list[str]) -> dict[str, Any]:
-        """Entraîne le modèle sur les textes"""
+    def _create_model(self):
+        """Nouveau modèle BERTopic (HDBSCAN)"""
+        from bertopic import BERTopic
+        from sklearn.cluster import HDBSCAN
+
+        # Configuration HDBSCAN pour clustering
+        hdbscan_model = HDBSCAN(
+            min_cluster_size=5,
+            min_samples=3,
+            metric='euclidean',
+            cluster_selection_method='eom'
+        )
+
+        # Modèle BERTopic
+        return BERTopic(
+            hdbscan_model=hdbscan_model,
+            embedding_model=embedding_engine.model,
+            verbose=True
+        )
+
+    def _load_persisted_model(self):
+        """Recharge le modèle persisté (mode incrémental)"""
+        state_path = self.model_path / "topic_state.json"
+        if not settings.topic_incremental or self.bertopic_model is None or not state_path.exists():
+            return
+
+        try:
+            from bertopic import BERTopic
+
+            self.bertopic_model = BERTopic.load(str(self.model_path), embedding_model=embedding_engine.model)
+            with open(state_path, encoding='utf-8') as f:
+                state = json.load(f)
+
+            self.model_state = state.get('model_state', {})
+            self.topics = {int(topic_id): info for topic_id, info in state.get('topics', {}).items()}
+            self._build_topic_centroids()
+            print(f"✅ Modèle de topics rechargé: {len(self.topics)} topics ({self.model_path})")
+        except Exception as e:
+            print(f"❌ Erreur rechargement modèle de topics: {e}")
+            self.bertopic_model = self._create_model()
+            self.model_state = {}
+            self.topics = {}
+
+    def save_model(self):
+        """Persiste le modèle (safetensors) et l'état des topics"""
+        self.model_path.mkdir(parents=True, exist_ok=True)
+        self.bertopic_model.save(
+            str(self.model_path),
+            serialization="safetensors",
+            save_ctfidf=True,
+            save_embedding_model=embedding_engine.model_name
+        )
+        with open(self.model_path / "topic_state.json", 'w', encoding='utf-8') as f:
+            json.dump({'model_state': self.model_state, 'topics': self.topics}, f, ensure_ascii=False)
+
+    def _prepare_documents(self, texts: list[str], embeddings: np.ndarray = None) -> tuple[list[str], np.ndarray, list[int]]:
+        """
+        Textes nettoyés et embeddings alignés (cache d'embeddings partagé si non fournis),
+        avec les positions d'origine des documents conservés
+        """
+        if embeddings is None:
+            embeddings = embedding_engine.encode_aligned(texts)
+
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if len(embeddings) != len(texts):
+            raise ValueError(f"Embeddings non alignés: {len(embeddings)} vecteurs pour {len(texts)} textes")
+
+        # Filtrer textes vides et vecteurs nuls en gardant l'alignement
+        cleaned_texts = [self._clean_text(text) for text in texts]
+        positions = [
+            i for i, text in enumerate(cleaned_texts)
+            if text and np.any(embeddings[i])
+        ]
+        return [cleaned_texts[i] for i in positions], embeddings[positions], positions
+
+    def fit_topics(self, texts: list[str], embeddings: np.ndarray = None, incremental: bool = None) -> dict[str, Any]:
+        """
+        Entraîne le modèle sur les textes (mode incrémental: affectation + fusion si nécessaire).
+        embeddings: matrice alignée sur texts (sinon lue dans le cache d'embeddings)
+        """
         if not texts or not self.bertopic_model:
             return {"error": "Modèle non disponible"}
 
+        incremental = settings.topic_incremental if incremental is None else incremental
+        if incremental and self.model_state.get('fitted_at'):
+            return self.update_topics(texts, embeddings)
+
         try:
             # Nettoyer les textes
-            cleaned_texts = [self._clean_text(text) for text in texts]
-            cleaned_texts = [text for text in cleaned_texts if text]
+            cleaned_texts, doc_embeddings, _ = self._prepare_documents(texts, embeddings)
 
             if not cleaned_texts:
                 return {"error": "Aucun texte valide"}
 
-            # Entraîner le modèle
-            topics, probs = self.bertopic_model.fit_transform(cleaned_texts)
-
-            # Analyser les résultats
-            topic_info = self.bertopic_model.get_topic_info()
+            # Entraîner le modèle (embeddings précalculés: pas de ré-encodage par BERTopic).
+            # Toujours un modèle neuf: un modèle rechargé (safetensors) ou fusionné n'a plus
+            # le clusterer HDBSCAN ni la configuration d'origine
+            self.bertopic_model = self._create_model()
+            topics, probs = self.bertopic_model.fit_transform(cleaned_texts, embeddings=doc_embeddings)
 
             # Créer le mapping des topics
-            self.topics = {
-                int(row['Topic']): {
-                    'name': row['Name'],
-                    'count': int(row['Count']),
-                    'words': self._get_topic_words(int(row['Topic']))
+            self._refresh_topics()
+
+            if incremental:
+                self.model_state = {
+                    'fitted_at': time.time(),
+                    'documents_seen': len(cleaned_texts),
+                    'reference_outlier_ratio': float(self._outlier_mask(topics, doc_embeddings).mean()),
+                    'merges': 0
                 }
-                for _, row in topic_info.iterrows()
+                self.save_model()
+
+            return {
+                "success": True,
+                "mode": "fit",
+                "num_topics": len(self.topics),
+                "topics": self.topics,
+                "topic_assignments": list(map(int, topics))
             }
 
+        except Exception as e:
+            print(f"❌ Erreur fit topics: {e}")
+            return {"error": str(e)}
+
+    def update_topics(self, texts: list[str], embeddings: np.ndarray = None) -> dict[str, Any]:
+        """
+        Mode incrémental: affecte les nouveaux documents avec transform (identifiants stables);
+        fusionne un modèle entraîné sur les outliers quand leur taux dépasse le seuil ou que le
+        délai de refit est écoulé (les topics existants conservent leur identifiant)
+        """
+        try:
+            cleaned_texts, doc_embeddings, _ = self._prepare_documents(texts, embeddings)
+
+            if not cleaned_texts:
+                return {"error": "Aucun texte valide"}
+
+            topics, _ = self.bertopic_model.transform(cleaned_texts, embeddings=doc_embeddings)
+            topics = np.asarray(topics)
+            is_outlier = self._outlier_mask(topics, doc_embeddings)
+            outlier_ratio = float(is_outlier.mean())
+
+            refit_age = time.time() - self.model_state.get('last_merge_at', self.model_state['fitted_at'])
+            refit_due = settings.topic_refit_interval_h and refit_age > settings.topic_refit_interval_h * 3600
+            drifted = outlier_ratio > settings.topic_refit_outlier_ratio
+
+            mode = "transform"
+            if drifted or refit_due:
+                outliers = np.flatnonzero(is_outlier)
+                merged = self._merge_new_topics([cleaned_texts[i] for i in outliers], doc_embeddings[outliers])
+                if merged:
+                    mode = "merge"
+                    topics = np.asarray(self.bertopic_model.transform(cleaned_texts, embeddings=doc_embeddings)[0])
+                self.model_state['last_merge_at'] = time.time()
+
+            self._refresh_topics(Counter(topics.tolist()))
+            self.model_state['documents_seen'] = self.model_state.get('documents_seen', 0) + len(cleaned_texts)
+            self.save_model()
+
             return {
                 "success": True,
-                "num_topics": len(topic_info),
+                "mode": mode,
+                "outlier_ratio": outlier_ratio,
+                "num_topics": len(self.topics),
                 "topics": self.topics,
                 "topic_assignments": topics.tolist()
             }
 
         except Exception as e:
-            print(f"❌ Erreur fit topics: {e}")
+            print(f"❌ Erreur mise à jour topics: {e}")
             return {"error": str(e)}
 
-    def predict_topics(self, texts: list[str]) -> list[dict[str, Any]]:
-        """Prédit les topics pour de nouveaux textes"""
+    def _outlier_mask(self, topics: np.ndarray, doc_embeddings: np.ndarray) -> np.ndarray:
+        """
+        Documents hors topics: -1 de BERTopic, ou similarité au centroïde le plus proche sous
+        topic_centroid_min_similarity (un modèle rechargé ou fusionné n'a plus de HDBSCAN et
+        transform ne renvoie alors jamais -1)
+        """
+        is_outlier = np.asarray(topics) == -1
+        if self.topic_centroids is not None and len(doc_embeddings):
+            centroid_topics, _ = self._nearest_centroids(doc_embeddings)
+            is_outlier |= centroid_topics == -1
+        return is_outlier
+
+    def _merge_new_topics(self, outlier_texts: list[str], outlier_embeddings: np.ndarray) -> bool:
+        """Entraîne un modèle sur les documents non affectés et le fusionne (merge_models)"""
+        if len(outlier_texts) < settings.topic_merge_min_documents:
+            return False
+
+        from bertopic import BERTopic
+
+        new_model = self._create_model()
+        new_model.fit(outlier_texts, embeddings=outlier_embeddings)
+
+        # Les topics du premier modèle gardent leur identifiant, les nouveaux sont ajoutés à la suite
+        self.bertopic_model = BERTopic.merge_models(
+            [self.bertopic_model, new_model],
+            min_similarity=settings.topic_merge_min_similarity,
+            embedding_model=embedding_engine.model
+        )
+        self.model_state['merges'] = self.model_state.get('merges', 0) + 1
+        print(f"✅ Topics fusionnés: {len(self.bertopic_model.get_topics())} topics")
+        return True
+
+    def _refresh_topics(self, new_counts: Counter = None):
+        """Reconstruit le mapping des topics (effectifs cumulés en mode incrémental)"""
+        topic_info = self.bertopic_model.get_topic_info()
+        previous = self.topics
+
+        self.topics = {}
+        for _, row in topic_info.iterrows():
+            topic_id = int(row['Topic'])
+            count = int(row['Count'])
+            if new_counts is not None:
+                count = previous.get(topic_id, {}).get('count', 0) + new_counts.get(topic_id, 0)
+
+            self.topics[topic_id] = {
+                'name': row['Name'],
+                'count': count,
+                'words': self._get_topic_words(topic_id)
+            }
+
+        self._build_topic_centroids()
+
+    def _build_topic_centroids(self):
+        """
+        Représentations des topics en une matrice normalisée: embeddings de topics de BERTopic
+        si disponibles, sinon encodage groupé des 5 mots principaux de chaque topic
+        """
+        topic_ids = sorted(topic_id for topic_id in self.topics if topic_id != -1)
+        if not topic_ids:
+            self.topic_centroids = None
+            self.topic_centroid_ids = np.array([], dtype=int)
+            return
+
+        topic_embeddings = getattr(self.bertopic_model, 'topic_embeddings_', None)
+        offset = getattr(self.bertopic_model, '_outliers', 0)
+
+        if topic_embeddings is not None and len(topic_embeddings) >= max(topic_ids) + offset + 1:
+            vectors = np.asarray(topic_embeddings, dtype=np.float32)[[topic_id + offset for topic_id in topic_ids]]
+        else:
+            topic_texts = [' '.join(word for word, _ in self.topics[topic_id]['words'][:5]) for topic_id in topic_ids]
+            vectors = embedding_engine.encode_aligned(topic_texts)
+
+        # Topics sans représentation (vecteur nul) écartés
+        valid = np.any(vectors, axis=1)
+        self.topic_centroids = normalize_rows(vectors[valid])
+        self.topic_centroid_ids = np.asarray(topic_ids)[valid]
+
+    def predict_topics(self, texts: list[str], embeddings: np.ndarray = None, method: str = None) -> list[dict[str, Any]]:
+        """
+        Prédit les topics pour de nouveaux textes (embeddings alignés optionnels).
+        method: "model" (transform BERTopic) ou "centroid" (centroïde le plus proche, affectation en flux)
+        """
+        return [result for _, result in self._predict_with_positions(texts, embeddings, method)]
+
+    def _predict_with_positions(self, texts: list[str], embeddings: np.ndarray = None,
+                                method: str = None) -> list[tuple[int, dict[str, Any]]]:
+        """Prédictions associées à la position d'origine du texte (textes vides écartés)"""
         if not texts or not self.bertopic_model:
             return []
 
+        method = method or settings.topic_predict_method
+
         try:
             # Nettoyer les textes
-            cleaned_texts = [self._clean_text(text) for text in texts]
-            cleaned_texts = [text for text in cleaned_texts if text]
+            cleaned_texts, doc_embeddings, positions = self._prepare_documents(texts, embeddings)
 
             if not cleaned_texts:
                 return []
 
             # Prédire les topics
-            topics, probs = self.bertopic_model.transform(cleaned_texts)
+            if method == "centroid" and self.topic_centroids is not None:
+                topics, probs = self._nearest_centroids(doc_embeddings)
+            else:
+                topics, probs = self.bertopic_model.transform(cleaned_texts, embeddings=doc_embeddings)
+            if probs is None:
+                probs = [None] * len(topics)
 
             results = []
-            for i, (topic, prob) in enumerate(zip(topics, probs, strict=False)):
+            for i, topic, prob in zip(positions, topics, probs, strict=False):
                 topic_info = self.topics.get(topic, {
                     'name': f'Topic_{topic}',
                     'count': 0,
                     'words': []
                 })
 
-                results.append({
+                results.append((i, {
                     'text': texts[i],
                     'topic_id': int(topic),
                     'topic_name': topic_info['name'],
-                    'confidence': float(prob[0]) if len(prob) > 0 else 0.0,
+                    'confidence': float(np.max(prob)) if prob is not None and np.size(prob) else 0.0,
                     'topic_words': topic_info['words']
-                })
+                }))
 
             return results
 
@@ -133,14 +351,14 @@ class TopicClusteringEngine:
             texts = [item[0] for item in texts_with_timestamps]
             timestamps = [item[1] for item in texts_with_timestamps]
 
-            # Prédire les topics
-            topic_predictions = self.predict_topics(texts)
+            # Prédire les topics (positions d'origine: alignement avec les timestamps)
+            topic_predictions = self._predict_with_positions(texts)
 
             # Grouper par timestamp
             from collections import defaultdict
             time_topics = defaultdict(list)
 
-            for i, prediction in enumerate(topic_predictions):
+            for i, prediction in topic_predictions:
                 timestamp = timestamps[i]
                 time_topics[timestamp].append(prediction)
 
@@ -160,50 +378,47 @@ class TopicClusteringEngine:
             print(f"❌ Erreur évolution topics: {e}")
             return {}
 
+    def _nearest_centroids(self, doc_embeddings: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Affectation au centroïde le plus proche (un produit matriciel), -1 sous le seuil de similarité"""
+        similarities = normalize_rows(doc_embeddings) @ self.topic_centroids.T
+        best = similarities.argmax(axis=1)
+        scores = similarities[np.arange(len(best)), best]
+
+        topics = self.topic_centroid_ids[best]
+        topics[scores < settings.topic_centroid_min_similarity] = -1
+        return topics, scores
+
     def find_similar_topics(self, query: str, top_k: int = 5) -> list[dict[str, Any]]:
         """Trouve les topics similaires à une requête"""
-        if not self.topics or not self.bertopic_model:
-            return []
+        results = self.find_similar_topics_batch([query], top_k)
+        return results[0] if results else []
+
+    def find_similar_topics_batch(self, queries: list[str], top_k: int = 5) -> list[list[dict[str, Any]]]:
+        """Topics similaires pour un lot de requêtes: un produit matrice-matrice et une sélection top-k"""
+        if not queries or not self.topics or not self.bertopic_model or self.topic_centroids is None:
+            return [[] for _ in queries]
 
         try:
-            # Encoder la requête
-            query_embedding = embedding_engine.encode_text(query)
-
-            # Calculer les similarités avec tous les topics
-            similarities = []
-            for topic_id, topic_info in self.topics.items():
-                if topic_id == -1:  # Skip noise topic
-                    continue
-
-                # Obtenir les mots du topic
-                topic_words = topic_info.get('words', [])
-                if not topic_words:
-                    continue
-
-                # Créer une représentation du topic
-                topic_text = ' '.join([word for word, _ in topic_words[:5]])
-                topic_embedding = embedding_engine.encode_text(topic_text)
-
-                # Calculer la similarité
-                similarity = cosine_similarity(
-                    query_embedding.reshape(1, -1),
-                    topic_embedding.reshape(1, -1)
-                )[0][0]
-
-                similarities.append({
-                    'topic_id': topic_id,
-                    'topic_name': topic_info['name'],
-                    'similarity': float(similarity),
-                    'words': topic_words
-                })
+            # Encoder les requêtes (vecteur nul pour une requête vide)
+            query_embeddings = normalize_rows(embedding_engine.encode_aligned(queries))
+            similarities = query_embeddings @ self.topic_centroids.T
 
-            # Trier par similarité
-            similarities.sort(key=lambda x: x['similarity'], reverse=True)
-            return similarities[:top_k]
+            results = []
+            for scores in similarities:
+                results.append([
+                    {
+                        'topic_id': int(self.topic_centroid_ids[index]),
+                        'topic_name': self.topics[int(self.topic_centroid_ids[index])]['name'],
+                        'similarity': float(scores[index]),
+                        'words': self.topics[int(self.topic_centroid_ids[index])]['words']
+                    }
+                    for index in top_k_indices(scores, top_k)
+                ])
+            return results
 
         except Exception as e:
             print(f"❌ Erreur similarité topics: {e}")
-            return []
+            return [[] for _ in queries]
 
     def _clean_text(self, text: str) -> str:
         """Nettoie un texte pour le clustering"""
@@ -286,5 +501,5 @@ class TopicClusteringEngine:
         return trending_topics
 
 
-# Instance globale
-topic_clustering = TopicClusteringEngine()
+# Instance globale (chargée au premier usage ou par le warm-up)
+topic_clustering = model_registry.register("topic_clustering", TopicClusteringEngine)
@@ -6,13 +6,19 @@ Endpoints pour l'API REST
 from datetime import datetime, timedelta
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.backend.ai.emotion_classifier import emotion_classifier
+from app.backend.ai.emotion_classifier import classify_emotions, emotion_classifier
 from app.backend.ai.langchain_agent import semantic_agent
-from app.backend.core.database import get_db
+from app.backend.ai.micro_batching import emotion_batcher
+from app.backend.ai.semantic_index import semantic_index
+from app.backend.core.concurrency import run_in_model_executor
+from app.backend.core.database import get_async_db, get_db
 from app.backend.core.metrics import track_model_accuracy, track_model_drift
 from app.backend.etl.pipeline import etl_pipeline
+from app.backend.models.schema import Contenu
 from app.backend.models.schemas import (
     APIResponse,
 )
@@ -22,6 +28,7 @@ from scripts.model_drift_monitor import ModelDriftMonitor
 emotions = APIRouter()
 predictions = APIRouter()
 data_sources = APIRouter()
+search = APIRouter()
 
 
 @emotions.get("/", response_model=APIResponse)
@@ -78,8 +85,8 @@ async def analyze_emotion(
         if not text.strip():
             raise HTTPException(status_code=400, detail="Texte vide")
 
-        # Classification émotionnelle
-        result = emotion_classifier.classify_emotion(text)
+        # Classification émotionnelle (micro-batch partagé avec les requêtes concurrentes)
+        result = dict(await emotion_batcher.submit(text))
 
         # Ajouter le texte original
         result["text"] = text
@@ -180,16 +187,17 @@ async def analyze_trends(
         if not texts:
             raise HTTPException(status_code=400, detail="Aucun texte fourni")
 
-        # Classification des émotions
-        emotion_results = emotion_classifier.classify_batch(texts)
+        # Classification des émotions (hors boucle d'événements)
+        emotion_results = await run_in_model_executor(classify_emotions, texts)
 
         # Analyse des tendances
-        trend_analysis = emotion_classifier.detect_emotion_trend(
+        trend_analysis = await run_in_model_executor(
+            emotion_classifier.detect_emotion_trend,
             [(text, datetime.now().isoformat()) for text in texts]
         )
 
         # Génération d'insights
-        insights = semantic_agent.analyze_emotion_trends(emotion_results)
+        insights = await run_in_model_executor(semantic_agent.analyze_emotion_trends, emotion_results)
 
         return APIResponse(
             success=True,
@@ -302,7 +310,7 @@ async def get_drift_monitoring():
     """Surveillance de la dérive des modèles"""
     try:
         monitor = ModelDriftMonitor()
-        results = monitor.run_monitoring()
+        results = await run_in_model_executor(monitor.run_monitoring)
 
         # Track metrics in Prometheus
         track_model_drift(
@@ -358,8 +366,61 @@ async def get_data_sources_stats():
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
-async def run_etl_pipeline(source: str | None = None):
-    """Exécute le pipeline ETL en arrière-plan"""
+@search.get("/semantic", response_model=APIResponse)
+async def semantic_search(
+    query: str,
+    top_k: int = 10,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Recherche sémantique (ANN) dans les contenus"""
+    try:
+        if not query.strip():
+            raise HTTPException(status_code=400, detail="Requête vide")
+
+        if not len(semantic_index) and not await run_in_model_executor(semantic_index.load):
+            raise HTTPException(status_code=503, detail="Index sémantique non construit")
+
+        search_results = await run_in_model_executor(semantic_index.search_texts, query, top_k=top_k)
+        hits = search_results["hits"]
+
+        # Enrichir avec les métadonnées des contenus
+        rows = await db.execute(select(Contenu).where(Contenu.id.in_([hit["id"] for hit in hits])))
+        contenus = {contenu.id: contenu for contenu in rows.scalars()}
+
+        results = []
+        for hit in hits:
+            contenu = contenus.get(hit["id"])
+            if contenu is None:
+                continue
+            results.append({
+                "id": contenu.id,
+                "titre": contenu.titre,
+                "url": contenu.url,
+                "source_type": contenu.source_type,
+                "publication_date": contenu.publication_date.isoformat() if contenu.publication_date else None,
+                "similarity": hit["similarity"]
+            })
+
+        return APIResponse(
+            success=True,
+            message="Recherche sémantique terminée",
+            data={
+                "query": query,
+                "results": results,
+                "search_ms": search_results["search_ms"],
+                "encode_ms": search_results["encode_ms"],
+                "index_size": len(semantic_index)
+            }
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+def run_etl_pipeline(source: str | None = None):
+    """Exécute le pipeline ETL en arrière-plan (fonction synchrone: threadpool Starlette)"""
     try:
         if source:
             # Exécuter pour une source spécifique
@@ -391,3 +452,9 @@ async def predictions_health():
 async def data_sources_health():
     """Vérification de santé du service sources"""
     return {"status": "healthy", "service": "data-sources"}
+
+
+@search.get("/health")
+async def search_health():
+    """Vérification de santé du service recherche"""
+    return {"status": "healthy", "service": "search", "indexed": len(semantic_index)}
@@ -0,0 +1,30 @@
+"""
+Concurrence - Semantic Pulse X
+Exécution des appels CPU (modèles IA) hors de la boucle d'événements
+"""
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any
+
+from app.backend.core.config import settings
+
+# Exécuteur borné: au plus model_executor_workers inférences simultanées,
+# la boucle reste libre pour /health et les lectures légères
+model_executor = ThreadPoolExecutor(
+    max_workers=settings.model_executor_workers,
+    thread_name_prefix="model"
+)
+
+
+async def run_in_model_executor(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Exécute un appel bloquant (modèle IA) dans l'exécuteur dédié"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(model_executor, partial(func, *args, **kwargs))
+
+
+def shutdown_model_executor():
+    """Arrête l'exécuteur (arrêt de l'application)"""
+    model_executor.shutdown(wait=False, cancel_futures=True)
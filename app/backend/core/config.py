@@ -10,6 +10,25 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite:///./semantic_pulse.db"
+    db_pool: str = "auto"  # "auto", "queue", "thread", "static", "null"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_mmap_size: int = 268_435_456  # 256 Mo
+    sqlite_cache_size: int = -64_000  # en Kio (valeur négative)
+    sqlite_busy_timeout: int = 5000  # en ms
+    async_database_url: str | None = None  # Dérivée de database_url si absente
+
+    # Concurrence API
+    model_warmup: bool = True  # Charger les modèles en tâche de fond au démarrage
+    model_memory_budget_mb: int = 0  # Budget RSS des modèles (0 = illimité)
+    model_idle_timeout_s: int = 0  # Déchargement après inactivité (0 = désactivé)
+    model_executor_workers: int = 2
+    micro_batch_max_size: int = 32
+    micro_batch_max_wait_ms: float = 5.0
 
     # MinIO/S3
     minio_endpoint: str = "localhost:9000"
@@ -37,10 +56,41 @@ class Settings(BaseSettings):
     # AI Models
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
     emotion_model: str = "j-hartmann/emotion-english-distilroberta-base"
+    embedding_cache_dir: str = "data/models/embedding_cache"
+    embedding_cache_max_entries: int = 200_000
+    semantic_index_path: str = "data/models/semantic_index.npz"
+    semantic_index_nprobe: int = 8
+    inference_backend: str = "torch"  # "torch" ou "onnx" (onnxruntime CPU)
+    onnx_cache_dir: str = "data/models/onnx"
+    onnx_quantize: bool = True  # Quantification dynamique int8
+    onnx_intra_op_threads: int = 0  # 0 = choix d'onnxruntime
+    emotion_inference_batch_size: int = 32  # Textes par passe forward (distinct de batch_size ETL)
+    emotion_inference_max_tokens: int = 8192  # Budget de tokens (padding compris) par passe forward
+    emotion_cascade: bool = False  # Lexique d'abord, transformer seulement si incertain
+    cascade_min_confidence: float = 0.5  # En dessous: escalade vers le transformer
+    cascade_min_hits: int = 2  # Termes du lexique requis pour résoudre sans le transformer
+    cascade_audit_rate: float = 0.05  # Part des textes résolus par le lexique re-vérifiés par le modèle
+    emotion_fast_mode: bool = False  # Modèle linéaire distillé pour les rétro-analyses massives
+    fast_emotion_model_path: str = "data/models/fast_emotion.npz"
+    fast_emotion_n_features: int = 2 ** 19
+    prediction_cache_enabled: bool = True
+    prediction_cache_path: str = "data/models/prediction_cache.sqlite"
+    prediction_cache_ttl_s: int = 30 * 24 * 3600  # 0 = pas d'expiration
+    prediction_cache_max_entries: int = 1_000_000
+    topic_incremental: bool = True  # Modèle persisté: transform + fusion au lieu d'un refit complet
+    topic_model_path: str = "data/models/topic_model"
+    topic_refit_interval_h: int = 168  # Fusion planifiée (0 = uniquement sur dérive)
+    topic_refit_outlier_ratio: float = 0.3  # Fusion si la part d'outliers dépasse ce seuil
+    topic_merge_min_documents: int = 20
+    topic_merge_min_similarity: float = 0.7
+    topic_predict_method: str = "model"  # "model" (BERTopic) ou "centroid" (centroïde le plus proche)
+    topic_centroid_min_similarity: float = 0.3  # En dessous: outlier (-1)
 
     # Data Processing
     batch_size: int = 1000
     max_text_length: int = 512
+    dedup_jaccard_threshold: float = 0.7
+    dedup_time_window: str = "1h"
 
     class Config:
         env_file = ".env"
@@ -2,19 +2,144 @@
 Configuration base de données - Semantic Pulse X
 """
 
-from sqlalchemy import MetaData, create_engine
+from sqlalchemy import MetaData, create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, QueuePool, SingletonThreadPool, StaticPool
 
 from app.backend.core.config import settings
 
+POOL_CLASSES = {
+    "queue": QueuePool,
+    "thread": SingletonThreadPool,
+    "static": StaticPool,
+    "null": NullPool,
+}
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    return _is_sqlite(url) and (url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url)
+
+
+def _select_pool(url: str):
+    """Choisit la classe de pool selon settings.db_pool et le backend"""
+    if settings.db_pool != "auto":
+        return POOL_CLASSES[settings.db_pool]
+    if _is_sqlite_memory(url):
+        # Une base en mémoire n'existe que dans sa connexion
+        return StaticPool
+    # Postgres et SQLite fichier: une connexion par requête/thread concurrent
+    return QueuePool
+
+
+def create_db_engine(url: str = None):
+    """Crée l'engine avec le pool et les réglages adaptés au backend"""
+    url = url or settings.database_url
+    poolclass = _select_pool(url)
+
+    kwargs = {"poolclass": poolclass, "pool_pre_ping": not _is_sqlite(url)}
+    if poolclass is QueuePool:
+        kwargs.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+        )
+    elif poolclass is SingletonThreadPool:
+        kwargs["pool_size"] = settings.db_pool_size
+    if _is_sqlite(url):
+        kwargs["connect_args"] = {"check_same_thread": False}
+
+    db_engine = create_engine(url, **kwargs)
+
+    if _is_sqlite(url):
+        event.listen(db_engine, "connect", _configure_sqlite)
+
+    event.listen(db_engine, "checkout", lambda *args: _track_pool(db_engine, checkout=True))
+    event.listen(db_engine, "checkin", lambda *args: _track_pool(db_engine))
+
+    return db_engine
+
+
+def _configure_sqlite(dbapi_connection, connection_record):
+    """PRAGMAs SQLite: WAL (lectures concurrentes aux écritures), cache et mmap"""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+        cursor.execute(f"PRAGMA cache_size={int(settings.sqlite_cache_size)}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+
+def _track_pool(db_engine, checkout: bool = False):
+    """Publie l'état du pool dans Prometheus (ignoré si les métriques sont indisponibles)"""
+    try:
+        from app.backend.core.metrics import track_db_pool
+        track_db_pool(pool_status(db_engine), checkout=checkout)
+    except Exception:
+        pass
+
+
+def pool_status(db_engine=None) -> dict[str, int]:
+    """État du pool de connexions"""
+    pool = (db_engine or engine).pool
+    if isinstance(pool, QueuePool):
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        }
+    return {"size": 1, "checked_out": 0, "checked_in": 0, "overflow": 0}
+
+
+def to_async_url(url: str) -> str:
+    """Convertit une URL synchrone vers son driver asynchrone (aiosqlite/asyncpg)"""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith(("postgresql:", "postgresql+psycopg2:")):
+        return "postgresql+asyncpg:" + url.split(":", 1)[1]
+    return url
+
+
+def create_async_db_engine(url: str = None):
+    """Crée l'engine asynchrone (mêmes réglages de pool que l'engine synchrone)"""
+    url = url or settings.async_database_url or to_async_url(settings.database_url)
+
+    kwargs = {"pool_pre_ping": not _is_sqlite(url)}
+    if not _is_sqlite_memory(url):
+        kwargs.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+        )
+    else:
+        kwargs["poolclass"] = StaticPool
+
+    db_engine = create_async_engine(url, **kwargs)
+
+    if _is_sqlite(url):
+        event.listen(db_engine.sync_engine, "connect", _configure_sqlite)
+
+    return db_engine
+
+
 # Engine
-engine = create_engine(
-    settings.database_url,
-    poolclass=StaticPool,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
-)
+engine = create_db_engine()
+
+# Engine asynchrone (créé au premier usage: nécessite aiosqlite/asyncpg)
+_async_engine = None
+_async_session_factory = None
 
 # Session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -39,3 +164,26 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_async_engine():
+    """Retourne l'engine asynchrone (créé à la demande)"""
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        _async_engine = create_async_db_engine()
+        _async_session_factory = async_sessionmaker(_async_engine, class_=AsyncSession, expire_on_commit=False)
+    return _async_engine
+
+
+async def get_async_db():
+    """Dépendance pour obtenir une session DB asynchrone"""
+    get_async_engine()
+    async with _async_session_factory() as db:
+        yield db
+
+
+async def close_db():
+    """Libère les connexions (arrêt de l'application)"""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    engine.dispose()
@@ -50,6 +50,18 @@ memory_usage = Gauge(
     'Process memory usage in bytes'
 )
 
+# Métriques du pool de connexions
+db_pool_connections = Gauge(
+    'db_pool_connections',
+    'Database pool connections',
+    ['state']
+)
+
+db_pool_checkouts_total = Counter(
+    'db_pool_checkouts_total',
+    'Total database connection checkouts'
+)
+
 # Métriques IA
 ai_model_accuracy = Gauge(
     'ai_model_accuracy',
@@ -63,6 +75,49 @@ ai_processing_time = Summary(
     ['model_type']
 )
 
+micro_batch_queue_depth = Gauge(
+    'micro_batch_queue_depth',
+    'Number of requests waiting in the micro-batching queue',
+    ['queue']
+)
+
+micro_batch_size = Histogram(
+    'micro_batch_size',
+    'Number of requests per micro-batch',
+    ['queue'],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128)
+)
+
+micro_batch_duration = Histogram(
+    'micro_batch_duration_seconds',
+    'Forward pass duration per micro-batch',
+    ['queue']
+)
+
+model_memory_bytes = Gauge(
+    'model_memory_bytes',
+    'Estimated resident memory per loaded AI model',
+    ['model']
+)
+
+model_load_duration = Histogram(
+    'model_load_duration_seconds',
+    'AI model load time',
+    ['model']
+)
+
+model_unloads_total = Counter(
+    'model_unloads_total',
+    'Total AI model unloads',
+    ['model', 'reason']
+)
+
+prediction_cache_lookups_total = Counter(
+    'prediction_cache_lookups_total',
+    'Persistent prediction cache lookups',
+    ['namespace', 'result']
+)
+
 # Métriques de qualité des données
 data_quality_score = Gauge(
     'data_quality_score',
@@ -118,6 +173,14 @@ def track_api_request(method: str, endpoint: str, status: str, duration: float):
     api_request_duration.labels(method=method, endpoint=endpoint).observe(duration)
 
 
+def track_db_pool(status: dict[str, int], checkout: bool = False):
+    """Track database pool status"""
+    for state, value in status.items():
+        db_pool_connections.labels(state=state).set(value)
+    if checkout:
+        db_pool_checkouts_total.inc()
+
+
 def track_ai_processing(model_type: str, duration: float, accuracy: float = None):
     """Track AI processing"""
     ai_processing_time.labels(model_type=model_type).observe(duration)
@@ -125,6 +188,32 @@ def track_ai_processing(model_type: str, duration: float, accuracy: float = None
         ai_model_accuracy.labels(model_type=model_type).set(accuracy)
 
 
+def track_micro_batch_queue(queue: str, depth: int):
+    """Track micro-batching queue depth"""
+    micro_batch_queue_depth.labels(queue=queue).set(depth)
+
+
+def track_micro_batch(queue: str, size: int, duration: float):
+    """Track micro-batch size and duration"""
+    micro_batch_size.labels(queue=queue).observe(size)
+    micro_batch_duration.labels(queue=queue).observe(duration)
+
+
+def track_model_memory(model: str, memory_bytes: int, load_seconds: float = None, unload_reason: str = None):
+    """Track AI model memory, load time and unloads"""
+    model_memory_bytes.labels(model=model).set(memory_bytes)
+    if load_seconds is not None:
+        model_load_duration.labels(model=model).observe(load_seconds)
+    if unload_reason is not None:
+        model_unloads_total.labels(model=model, reason=unload_reason).inc()
+
+
+def track_prediction_cache(namespace: str, hits: int, misses: int):
+    """Track persistent prediction cache hits and misses"""
+    prediction_cache_lookups_total.labels(namespace=namespace, result='hit').inc(hits)
+    prediction_cache_lookups_total.labels(namespace=namespace, result='miss').inc(misses)
+
+
 def track_data_quality(source: str, score: float):
     """Track data quality"""
     data_quality_score.labels(source=source).set(score)
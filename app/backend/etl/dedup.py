@@ -0,0 +1,206 @@
+"""
+Déduplication approximative - Semantic Pulse X
+Détection de quasi-doublons à coût linéaire (LSH) pour les pipelines ETL
+"""
+
+import tempfile
+import zlib
+from collections import defaultdict
+from collections.abc import Callable
+
+import numpy as np
+
+from app.backend.ai.embeddings import normalize_rows
+
+# Nombre premier de Mersenne pour le hachage universel des permutations MinHash
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Rappel LSH minimal visé au seuil Jaccard (les candidats sont ensuite vérifiés exactement)
+LSH_MIN_RECALL = 0.95
+
+
+def _bucket_keys(bits: np.ndarray, n_tables: int, n_bits: int) -> np.ndarray:
+    """Convertit des bits (n, n_tables * n_bits) en clés entières (n, n_tables)"""
+    weights = (1 << np.arange(n_bits, dtype=np.int64))
+    return bits.reshape(len(bits), n_tables, n_bits).astype(np.int64) @ weights
+
+
+def _simhash_bits(n_tables: int, threshold: float, min_recall: float = LSH_MIN_RECALL, max_bits: int = 32) -> int:
+    """
+    Choisit le nombre de bits par table pour un rappel élevé au seuil cosinus.
+
+    Un hyperplan aléatoire sépare deux vecteurs d'angle θ avec la probabilité θ/π:
+    une paire au seuil partage une table avec p = (1 - θ/π)^bits, rappel = 1 - (1 - p)^tables.
+    On garde le plus grand nombre de bits (moins de faux candidats) qui atteint min_recall.
+    """
+    agreement = 1 - np.arccos(np.clip(threshold, -1.0, 1.0)) / np.pi
+    best = 1
+    for bits in range(1, max_bits + 1):
+        if 1 - (1 - agreement ** bits) ** n_tables >= min_recall:
+            best = bits
+    return best
+
+
+def simhash_near_duplicates(
+    texts: list[str],
+    encode_fn: Callable[[list[str]], np.ndarray],
+    threshold: float = 0.9,
+    chunk_size: int = 1000,
+    n_tables: int = 16,
+    n_bits: int = None,
+    seed: int = 42
+) -> np.ndarray:
+    """
+    Retourne un masque booléen des textes à conserver.
+
+    Un texte est écarté si un texte conservé avant lui a une similarité cosinus
+    supérieure au seuil. Les candidats sont trouvés par SimHash (hyperplans
+    aléatoires, n_tables tables de n_bits bits, n_bits choisi par défaut pour un
+    rappel élevé au seuil) puis vérifiés exactement. Les vecteurs nuls (textes
+    vides) sont conservés sans entrer dans les tables.
+    Les embeddings sont écrits dans un fichier mmap temporaire: la mémoire
+    reste bornée par la taille des chunks et des tables de hachage.
+    """
+    n = len(texts)
+    keep = np.ones(n, dtype=bool)
+    if n < 2:
+        return keep
+
+    rng = np.random.default_rng(seed)
+    n_bits = n_bits or _simhash_bits(n_tables, threshold)
+    planes = None
+    store = None
+    buckets = [defaultdict(list) for _ in range(n_tables)]
+
+    with tempfile.TemporaryFile() as store_file:
+        for start in range(0, n, chunk_size):
+            vectors = normalize_rows(encode_fn(texts[start:start + chunk_size]))
+
+            if planes is None:
+                dimension = vectors.shape[1]
+                planes = rng.standard_normal((dimension, n_tables * n_bits)).astype(np.float32)
+                store = np.memmap(store_file, dtype=np.float32, mode='w+', shape=(n, dimension))
+
+            store[start:start + len(vectors)] = vectors
+            keys = _bucket_keys(vectors @ planes > 0, n_tables, n_bits)
+            # Vecteurs nuls: même clé partout, comparaisons quadratiques et similarité nulle
+            non_zero = np.any(vectors != 0, axis=1)
+
+            for offset, (vector, row_keys) in enumerate(zip(vectors, keys, strict=False)):
+                row = start + offset
+                if not non_zero[offset]:
+                    continue
+                candidates = set()
+                for table, key in enumerate(row_keys):
+                    candidates.update(buckets[table].get(int(key), ()))
+
+                if candidates:
+                    candidate_rows = np.fromiter(candidates, dtype=np.int64)
+                    candidate_rows.sort()
+                    if float(np.max(store[candidate_rows] @ vector)) > threshold:
+                        keep[row] = False
+                        continue
+
+                for table, key in enumerate(row_keys):
+                    buckets[table][int(key)].append(row)
+
+        del store
+
+    return keep
+
+
+def shingle_hashes(text: str, shingle_size: int = 5) -> np.ndarray:
+    """Hachages 32 bits des shingles (n-grammes de caractères) d'un texte normalisé"""
+    text = " ".join(str(text).lower().split())
+    if not text:
+        return np.zeros(0, dtype=np.uint64)
+    if len(text) <= shingle_size:
+        return np.array([zlib.crc32(text.encode())], dtype=np.uint64)
+
+    shingles = {text[i:i + shingle_size] for i in range(len(text) - shingle_size + 1)}
+    hashes = np.fromiter((zlib.crc32(shingle.encode()) for shingle in shingles), dtype=np.uint64, count=len(shingles))
+    # Collisions crc32 possibles: ensemble trié, sans doublon
+    return np.unique(hashes)
+
+
+def _lsh_bands(num_perm: int, threshold: float, min_recall: float = LSH_MIN_RECALL) -> tuple[int, int]:
+    """
+    Choisit (bandes, lignes) pour un rappel élevé au seuil Jaccard.
+
+    Probabilité qu'une paire de similarité s partage une bande: 1 - (1 - s^r)^b.
+    On garde le plus grand r (moins de faux candidats) dont le rappel au seuil
+    atteint min_recall, par exemple 16 bandes x 4 lignes pour 64 permutations à 0.7.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= min_recall:
+            best = (bands, rows)
+    return best
+
+
+def _jaccard(left: np.ndarray, right: np.ndarray) -> float:
+    """Similarité de Jaccard exacte entre deux ensembles de hachages triés uniques"""
+    intersection = len(np.intersect1d(left, right, assume_unique=True))
+    union = len(left) + len(right) - intersection
+    return intersection / union if union else 0.0
+
+
+def minhash_near_duplicates(
+    texts: list[str],
+    threshold: float = 0.7,
+    windows: list | None = None,
+    num_perm: int = 64,
+    shingle_size: int = 5,
+    seed: int = 42
+) -> np.ndarray:
+    """
+    Retourne un masque booléen des textes à conserver.
+
+    Un texte est écarté si un texte conservé avant lui, dans la même fenêtre
+    (windows, optionnel), a une similarité de Jaccard (sur les shingles) au
+    moins égale au seuil. Les candidats proviennent de tables LSH par bandes
+    (MinHash, réglées pour un rappel élevé) puis sont vérifiés exactement:
+    le coût croît linéairement avec le nombre de textes.
+    """
+    n = len(texts)
+    keep = np.ones(n, dtype=bool)
+    if n < 2:
+        return keep
+
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+    bands, rows = _lsh_bands(num_perm, threshold)
+
+    shingles: dict[int, np.ndarray] = {}
+    buckets = [defaultdict(list) for _ in range(bands)]
+
+    for i, text in enumerate(texts):
+        hashes = shingle_hashes(text, shingle_size)
+        if len(hashes) == 0:
+            continue
+
+        # Permutations ((a*h + b) mod p, produit modulo 2^64) tronquées à 32 bits
+        permuted = ((np.outer(hashes, a) + b) % _MERSENNE_PRIME) & _MAX_HASH
+        signature = permuted.min(axis=0)
+
+        window = windows[i] if windows is not None else None
+        band_keys = [(window, signature[band * rows:(band + 1) * rows].tobytes()) for band in range(bands)]
+
+        candidates = set()
+        for band, key in enumerate(band_keys):
+            candidates.update(buckets[band].get(key, ()))
+
+        if any(_jaccard(hashes, shingles[candidate]) >= threshold for candidate in sorted(candidates)):
+            keep[i] = False
+            continue
+
+        shingles[i] = hashes
+        for band, key in enumerate(band_keys):
+            buckets[band][key].append(i)
+
+    return keep
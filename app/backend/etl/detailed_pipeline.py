@@ -6,16 +6,14 @@ Implémentation complète des techniques de Data Engineering
 import json
 import logging
 from datetime import datetime
-from difflib import SequenceMatcher
 from pathlib import Path
 from typing import Any
 
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 from sqlalchemy import create_engine
 
 from app.backend.core.config import settings
+from app.backend.etl.dedup import minhash_near_duplicates
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
@@ -564,54 +562,32 @@ class DetailedETLPipeline:
         """Suppression des doublons exacts"""
         return df.drop_duplicates()
 
-    def _detect_semantic_duplicates(self, df: pd.DataFrame, threshold: float = 0.85) -> pd.DataFrame:
-        """Détection des doublons sémantiques"""
+    def _detect_semantic_duplicates(self, df: pd.DataFrame, threshold: float = None) -> pd.DataFrame:
+        """Détection des doublons sémantiques (MinHash LSH sur les shingles)"""
         if 'text' not in df.columns or len(df) < 2:
             return df
 
-        # Vectorisation TF-IDF
+        threshold = threshold or settings.dedup_jaccard_threshold
         texts = df['text'].fillna('').astype(str).tolist()
-        vectorizer = TfidfVectorizer(max_features=1000, stop_words='french')
-        tfidf_matrix = vectorizer.fit_transform(texts)
+        keep = minhash_near_duplicates(texts, threshold=threshold)
 
-        # Calcul de la similarité cosinus
-        similarity_matrix = cosine_similarity(tfidf_matrix)
+        return df[keep]
 
-        # Détection des paires similaires
-        indices_to_remove = set()
-        for i in range(len(similarity_matrix)):
-            for j in range(i + 1, len(similarity_matrix)):
-                if similarity_matrix[i][j] > threshold:
-                    if i not in indices_to_remove and j not in indices_to_remove:
-                        indices_to_remove.add(j)
-
-        return df.drop(df.index[list(indices_to_remove)])
-
-    def _detect_temporal_duplicates(self, df: pd.DataFrame, time_window: str = '1H') -> pd.DataFrame:
-        """Détection des doublons temporels"""
+    def _detect_temporal_duplicates(self, df: pd.DataFrame, time_window: str = None, threshold: float = None) -> pd.DataFrame:
+        """Détection des doublons temporels (MinHash LSH par fenêtre de temps)"""
         if 'timestamp' not in df.columns or 'text' not in df.columns:
             return df
 
-        # Tri par timestamp
-        df_sorted = df.sort_values('timestamp').reset_index(drop=True)
-        df_sorted['time_window'] = df_sorted['timestamp'].dt.floor(time_window)
-
-        # Détection des doublons dans chaque fenêtre
-        duplicates_to_remove = []
-
-        for _time_group, group in df_sorted.groupby('time_window'):
-            if len(group) > 1:
-                texts = group['text'].fillna('').astype(str).tolist()
+        time_window = time_window or settings.dedup_time_window
+        threshold = threshold or settings.dedup_jaccard_threshold
 
-                if len(texts) > 1:
-                    for i in range(len(texts)):
-                        for j in range(i + 1, len(texts)):
-                            similarity = SequenceMatcher(None, texts[i], texts[j]).ratio()
-                            if similarity > 0.8:
-                                original_index = group.iloc[j].name
-                                duplicates_to_remove.append(original_index)
+        # Tri par timestamp, les candidats ne sont comparés que dans leur fenêtre
+        df_sorted = df.sort_values('timestamp').reset_index(drop=True)
+        windows = df_sorted['timestamp'].dt.floor(time_window).tolist()
+        texts = df_sorted['text'].fillna('').astype(str).tolist()
+        keep = minhash_near_duplicates(texts, threshold=threshold, windows=windows)
 
-        return df_sorted.drop(duplicates_to_remove)
+        return df_sorted[keep]
 
     # Méthodes d'homogénéisation
     def _normalize_emotions(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -4,17 +4,20 @@ Orchestration et traitement des données
 """
 
 import logging
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-import numpy as np
 import pandas as pd
 
 from app.backend.ai.embeddings import embedding_engine
-from app.backend.ai.emotion_classifier import emotion_classifier
+from app.backend.ai.emotion_classifier import classify_emotions, emotion_classifier
+from app.backend.ai.prediction_cache import prediction_cache
 from app.backend.ai.topic_clustering import topic_clustering
+from app.backend.core.config import settings
 from app.backend.etl.data_sources import data_source_manager
+from app.backend.etl.dedup import simhash_near_duplicates
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
@@ -29,6 +32,7 @@ class ETLPipeline:
         self.raw_dir = self.data_dir / "raw"
         self.processed_dir = self.data_dir / "processed"
         self.models_dir = self.data_dir / "models"
+        self.dedup_stats = {}
 
         # Créer les répertoires
         for dir_path in [self.raw_dir, self.processed_dir, self.models_dir]:
@@ -173,40 +177,27 @@ class ETLPipeline:
         return df
 
     def _remove_similar_texts(self, df: pd.DataFrame, similarity_threshold: float = 0.9) -> pd.DataFrame:
-        """Supprime les textes trop similaires"""
+        """Supprime les textes trop similaires (LSH sur les embeddings, tout le DataFrame)"""
         if len(df) < 2:
             return df
 
-        # Échantillonner pour éviter les calculs trop lourds
-        sample_size = min(1000, len(df))
-        df_sample = df.sample(n=sample_size, random_state=42)
-
-        # Calculer les similarités
-        texts = df_sample['text'].tolist()
-        embeddings = embedding_engine.encode_batch(texts)
-
-        if len(embeddings) == 0:
-            return df
-
-        # Matrice de similarité
-        similarity_matrix = np.dot(embeddings, embeddings.T)
-
-        # Trouver les paires similaires
-        similar_pairs = []
-        for i in range(len(similarity_matrix)):
-            for j in range(i+1, len(similarity_matrix)):
-                if similarity_matrix[i][j] > similarity_threshold:
-                    similar_pairs.append((i, j))
-
-        # Supprimer les doublons
-        indices_to_remove = set()
-        for _i, j in similar_pairs:
-            indices_to_remove.add(j)  # Garder le premier, supprimer le second
+        keep = simhash_near_duplicates(
+            df['text'].tolist(),
+            embedding_engine.encode_aligned,
+            threshold=similarity_threshold,
+            chunk_size=settings.batch_size
+        )
 
-        # Filtrer
-        df_sample = df_sample.drop(df_sample.index[list(indices_to_remove)])
+        # Rapport des suppressions par source
+        removed = df.loc[~keep, 'source_type'].value_counts().to_dict() if 'source_type' in df.columns else {}
+        self.dedup_stats = {
+            "total_before": len(df),
+            "total_removed": int((~keep).sum()),
+            "removed_by_source": {source: int(count) for source, count in removed.items()}
+        }
+        logger.info(f"🧹 Quasi-doublons supprimés: {self.dedup_stats['total_removed']}/{len(df)} {self.dedup_stats['removed_by_source']}")
 
-        return df_sample
+        return df[keep]
 
     def _load_data(self, df: pd.DataFrame) -> dict[str, Any]:
         """Charge les données dans la base"""
@@ -244,7 +235,11 @@ class ETLPipeline:
             # Classification émotionnelle
             logger.info("🎭 Classification émotionnelle...")
             texts = df['text'].tolist()
-            emotion_results = emotion_classifier.classify_batch(texts)
+            # Mode rapide (settings.emotion_fast_mode): modèle distillé, le transformer n'est pas chargé
+            emotion_results = classify_emotions(texts)
+            cascade_stats = None
+            if settings.emotion_cascade and not settings.emotion_fast_mode:
+                cascade_stats = dict(emotion_classifier.cascade_stats)
 
             # Mettre à jour les données avec les résultats IA
             df['ai_emotion'] = [r['emotion_principale'] for r in emotion_results]
@@ -253,8 +248,13 @@ class ETLPipeline:
 
             results['emotion_classification'] = {
                 "total_processed": len(emotion_results),
-                "emotion_distribution": emotion_classifier.get_emotion_distribution(texts)
+                "emotion_distribution": dict(Counter(r['emotion_principale'] for r in emotion_results))
             }
+            if settings.prediction_cache_enabled and not settings.emotion_fast_mode:
+                results['emotion_classification']['prediction_cache'] = prediction_cache.get_stats()
+            if cascade_stats:
+                results['emotion_classification']['cascade'] = cascade_stats
+                logger.info(f"🎭 Cascade: {cascade_stats['escalation_rate']:.1%} escaladés vers le transformer")
 
             # Clustering thématique
             logger.info("📊 Clustering thématique...")
@@ -287,6 +287,7 @@ class ETLPipeline:
                 "memory_usage": processed_data.memory_usage(deep=True).sum()
             },
             "ai_analysis": ai_results,
+            "deduplication": self.dedup_stats,
             "data_quality": {
                 "missing_values": processed_data.isnull().sum().to_dict(),
                 "duplicate_rate": processed_data.duplicated().sum() / len(processed_data),
@@ -13,9 +13,14 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.backend.api.routes import data_sources, emotions, predictions
+from app.backend.ai.micro_batching import emotion_batcher
+from app.backend.ai.model_registry import model_registry
+from app.backend.ai.prediction_cache import prediction_cache
+from app.backend.api.routes import data_sources, emotions, predictions, search
 from app.backend.api.wordcloud_routes import wordcloud_router
-from app.backend.core.database import init_db
+from app.backend.core.concurrency import shutdown_model_executor
+from app.backend.core.config import settings
+from app.backend.core.database import close_db, init_db, pool_status
 
 
 @asynccontextmanager
@@ -23,9 +28,16 @@ async def lifespan(app: FastAPI):
     """Gestion du cycle de vie de l'application"""
     # Startup
     await init_db()
+    # Les modèles se chargent en arrière-plan: / et /health répondent immédiatement
+    if settings.model_warmup:
+        model_registry.warm_up_in_background()
+    model_registry.start_idle_reaper()
     yield
     # Shutdown
-    pass
+    model_registry.stop_idle_reaper()
+    await emotion_batcher.stop()
+    await close_db()
+    shutdown_model_executor()
 
 
 app = FastAPI(
@@ -48,6 +60,7 @@ app.add_middleware(
 app.include_router(emotions, prefix="/api/v1/emotions", tags=["emotions"])
 app.include_router(predictions, prefix="/api/v1/predictions", tags=["predictions"])
 app.include_router(data_sources, prefix="/api/v1/sources", tags=["data-sources"])
+app.include_router(search, prefix="/api/v1/search", tags=["search"])
 app.include_router(wordcloud_router, prefix="/api/v1/wordcloud", tags=["wordcloud"])
 
 
@@ -62,4 +75,11 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "semantic-pulse-x"}
+    # Sonde de vivacité: uniquement des états en mémoire, aucune requête bloquante
+    return {
+        "status": "healthy",
+        "service": "semantic-pulse-x",
+        "models": model_registry.status(),
+        "database_pool": pool_status(),
+        "prediction_cache": prediction_cache.get_stats(count_entries=False)
+    }
@@ -8,7 +8,7 @@ from typing import Any
 
 from prefect import flow, get_run_logger, task
 
-from app.backend.ai.emotion_classifier import emotion_classifier
+from app.backend.ai.emotion_classifier import classify_emotions, emotion_classifier
 from app.backend.ai.langchain_agent import semantic_agent
 from app.backend.ai.topic_clustering import topic_clustering
 from app.backend.core.metrics import track_data_ingestion, track_emotion_processing
@@ -77,7 +77,7 @@ async def ai_analysis_task(processed_data: dict[str, Any]) -> dict[str, Any]:
 
         # Classification émotionnelle
         logger.info("🎭 Classification émotionnelle...")
-        emotion_results = emotion_classifier.classify_batch(texts)
+        emotion_results = classify_emotions(texts)
 
         # Tracker les métriques
         for result in emotion_results:
@@ -207,7 +207,7 @@ async def emotion_analysis_flow(texts: list[str]) -> dict[str, Any]:
 
     try:
         # Classification émotionnelle
-        emotion_results = emotion_classifier.classify_batch(texts)
+        emotion_results = classify_emotions(texts)
 
         # Analyse des tendances
         trend_analysis = emotion_classifier.detect_emotion_trend(
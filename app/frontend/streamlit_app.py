@@ -152,13 +152,11 @@ def _analyze_emotion_with_aggregation(text: str):
     sentences = [s.strip() for s in re.split(r"[.!?\n]", text) if len(s.strip()) > 5]
     if not sentences:
         sentences = [text]
-    results = []
-    for s in sentences:
-        try:
-            res = model.classify_emotion(s)
-            results.append(res)
-        except Exception:
-            continue
+    # Un seul appel batch: recherche groupée dans le cache de prédictions partagé
+    try:
+        results = model.classify_batch(sentences, cascade=False)
+    except Exception:
+        results = []
     if not results:
         return {"status": "error"}
     # agrégation par majorité et moyenne de confiance
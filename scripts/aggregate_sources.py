@@ -8,6 +8,7 @@ Agrégation multi-sources (low-code, indépendante)
 - Déduplication par (url, titre)
 - Gestion des manquants (pays/domaine/langue/auteur/publication_date)
 - Écrit un JSON intégré + Parquet
+- Lecture/écriture en flux (mémoire constante): JSON (tableau) ou JSON Lines
 
 Usage:
   python scripts/aggregate_sources.py --inputs data/raw/scraped/*.json \
@@ -17,6 +18,7 @@ Usage:
 import argparse
 import glob
 import json
+from collections.abc import Iterator
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
@@ -43,15 +45,77 @@ REQUIRED_FIELDS = [
 
 def load_json_list(path: Path) -> list[dict[str, Any]]:
     try:
-        with path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                return data
-            return []
+        return list(iter_json_records(path))
     except Exception:
         return []
 
 
+def iter_json_records(path: Path, read_size: int = 1 << 20) -> Iterator[dict[str, Any]]:
+    """
+    Lit un fichier JSON (tableau d'objets) ou JSON Lines enregistrement par
+    enregistrement, sans charger le fichier entier en mémoire.
+    """
+    with path.open("r", encoding="utf-8") as f:
+        if path.suffix in (".jsonl", ".ndjson"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+
+        decoder = json.JSONDecoder()
+        buffer = ""
+        started = False
+        eof = False
+
+        while not eof:
+            chunk = f.read(read_size)
+            eof = not chunk
+            buffer += chunk
+            pos = 0
+
+            while True:
+                # Sauter les blancs et séparateurs
+                while pos < len(buffer) and (buffer[pos].isspace() or (started and buffer[pos] == ",")):
+                    pos += 1
+                if pos >= len(buffer):
+                    break
+
+                if not started:
+                    if buffer[pos] != "[":
+                        return  # Pas un tableau: rien à lire
+                    started = True
+                    pos += 1
+                    continue
+
+                if buffer[pos] == "]":
+                    return
+
+                try:
+                    record, pos_end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    break  # Objet incomplet: lire la suite
+
+                pos = pos_end
+                if isinstance(record, dict):
+                    yield record
+
+            buffer = buffer[pos:]
+
+
+def iter_json_chunks(path: Path, chunk_size: int = 5000) -> Iterator[list[dict[str, Any]]]:
+    """Regroupe les enregistrements d'un fichier en lots de chunk_size"""
+    chunk = []
+    for record in iter_json_records(path):
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
 def fill_missing(record: dict[str, Any]) -> dict[str, Any]:
     # Valeurs par défaut simples
     record.setdefault("pays", "FR")
@@ -91,6 +155,9 @@ def main() -> int:
     parser.add_argument(
         "--drop-empty-title", action="store_true", help="Supprimer les entrées sans titre"
     )
+    parser.add_argument(
+        "--chunk-size", type=int, default=5000, help="Enregistrements traités par lot (défaut: 5000)"
+    )
     args = parser.parse_args()
 
     # Résoudre globs
@@ -102,54 +169,97 @@ def main() -> int:
         print("⚠️ Aucun fichier en entrée")
         return 2
 
-    records: list[dict[str, Any]] = []
-    for fp in files:
-        items = load_json_list(Path(fp))
-        for it in items:
-            # garder seulement les champs utiles
-            norm: dict[str, Any] = {k: it.get(k) for k in REQUIRED_FIELDS}
-            filled = fill_missing(norm)
+    out_dir = Path(args.output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    ts = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+    out_json = out_dir / f"integrated_all_sources_{ts}.json"
+    out_parquet = out_dir / "integrated_all_sources.parquet"
 
-            # Filtres qualité
-            if args.drop_empty_title and not (filled.get("titre") or "").strip():
-                continue
-            texte = filled.get("texte", "") or ""
-            if len(texte) < args.min_text_len:
-                continue
+    # Traitement en flux: lecture, normalisation, filtres et dédup (url, titre)
+    # par lots, écriture incrémentale JSON + Parquet (snapshot réécrit)
+    seen_keys: set[tuple[Any, Any]] = set()
+    loaded = 0
+    written = 0
+    parquet_writer = None
 
-            records.append(filled)
+    with out_json.open("w", encoding="utf-8") as out:
+        out.write("[\n")
+        try:
+            for fp in files:
+                try:
+                    for chunk in iter_json_chunks(Path(fp), args.chunk_size):
+                        batch = []
+                        for it in chunk:
+                            # garder seulement les champs utiles
+                            norm: dict[str, Any] = {k: it.get(k) for k in REQUIRED_FIELDS}
+                            filled = fill_missing(norm)
 
-    if not records:
-        print("⚠️ Aucune donnée après chargement")
-        return 0
+                            # Filtres qualité
+                            if args.drop_empty_title and not (filled.get("titre") or "").strip():
+                                continue
+                            texte = filled.get("texte", "") or ""
+                            if len(texte) < args.min_text_len:
+                                continue
+                            loaded += 1
 
-    print(f"✅ {len(records)} enregistrements chargés (après filtres qualité)")
+                            key = (filled.get("url"), filled.get("titre"))
+                            if key in seen_keys:
+                                continue
+                            seen_keys.add(key)
+                            batch.append(filled)
 
-    # Déduplication (url, titre)
-    df = pd.DataFrame.from_records(records)
-    df = df.drop_duplicates(subset=["url", "titre"], keep="first")
+                        if not batch:
+                            continue
 
-    out_dir = Path(args.output_dir)
-    out_dir.mkdir(parents=True, exist_ok=True)
-    ts = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
-    out_json = out_dir / f"integrated_all_sources_{ts}.json"
-    out_parquet = out_dir / "integrated_all_sources.parquet"
+                        for record in batch:
+                            out.write(",\n" if written else "")
+                            out.write(json.dumps(record, ensure_ascii=False, default=str))
+                            written += 1
 
-    # Sauvegarde JSON
-    data = df.to_dict(orient="records")
-    with out_json.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+                        parquet_writer = write_parquet_chunk(parquet_writer, out_parquet, batch)
+                except Exception as e:
+                    print(f"⚠️ Lecture impossible {fp}: {e}")
+        finally:
+            if parquet_writer is not None:
+                parquet_writer.close()
+        out.write("\n]\n")
 
-    # Sauvegarde Parquet (append-overwrite simple: on réécrit un snapshot)
-    df.to_parquet(out_parquet, index=False)
+    if not written:
+        out_json.unlink(missing_ok=True)
+        print("⚠️ Aucune donnée après chargement")
+        return 0
 
+    print(f"✅ {loaded} enregistrements chargés (après filtres qualité)")
     print(
-        f"✅ Agrégation: {len(records)} -> {len(df)} (dédupliqués).\n" \
+        f"✅ Agrégation: {loaded} -> {written} (dédupliqués).\n" \
         f"   Écrit: {out_json} et {out_parquet}"
     )
     return 0
 
 
+def write_parquet_chunk(writer, out_parquet: Path, records: list[dict[str, Any]]):
+    """Ajoute un lot au fichier Parquet (schéma fixé par REQUIRED_FIELDS)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    df = pd.DataFrame.from_records(records, columns=REQUIRED_FIELDS)
+    df["confidence"] = pd.to_numeric(df["confidence"], errors="coerce").fillna(0.0)
+    for column in REQUIRED_FIELDS:
+        if column != "confidence":
+            df[column] = df[column].map(lambda v: v if v is None or isinstance(v, str) else str(v))
+
+    schema = pa.schema([
+        (column, pa.float64() if column == "confidence" else pa.string())
+        for column in REQUIRED_FIELDS
+    ])
+    table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+    if writer is None:
+        writer = pq.ParquetWriter(out_parquet, schema)
+    writer.write_table(table)
+    return writer
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
 
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Construction de l'index sémantique ANN sur la table contenus
+- Ajout incrémental: seuls les contenus non indexés (id > max indexé) sont encodés
+- Sauvegarde sur disque (settings.semantic_index_path)
+
+Usage:
+  python scripts/build_semantic_index.py [--retrain] [--batch-size 1000]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+sys.path.append(str(Path(__file__).parent.parent))
+from app.backend.ai.semantic_index import SemanticIndex, build_index_from_database
+from app.backend.core.config import settings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Construction de l'index sémantique")
+    parser.add_argument("--database-url", default=settings.database_url, help="URL de la base")
+    parser.add_argument("--batch-size", type=int, default=settings.batch_size, help="Contenus encodés par lot")
+    parser.add_argument("--retrain", action="store_true", help="Ré-entraîner les centroïdes IVF")
+
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    try:
+        index = build_index_from_database(session, SemanticIndex(), batch_size=args.batch_size, retrain=args.retrain)
+        print(f"SUCCESS: Index sémantique prêt ({len(index)} vecteurs)")
+        return 0
+    except Exception as e:
+        print(f"ERROR: Erreur construction index: {e}")
+        return 1
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Export ONNX + quantification int8 des modèles d'émotions et d'embeddings
+- Artefacts mis en cache dans settings.onnx_cache_dir (export unique)
+- Contrôle de précision ONNX vs PyTorch (accord des labels, cosinus) et débit CPU brut
+  (sessions ONNX et modèles PyTorch appelés directement, hors cache et cascade)
+
+Usage:
+  python scripts/export_onnx_models.py [--sample data/raw/kaggle_tweets/file_source_tweets.csv] [--limit 500]
+  python scripts/export_onnx_models.py --no-quantize   # ONNX fp32 uniquement
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+from app.backend.core.config import settings
+
+
+def measure_throughput(encode_fn, texts: list[str]) -> float:
+    """Textes traités par seconde"""
+    start = time.perf_counter()
+    encode_fn(texts)
+    elapsed = time.perf_counter() - start
+    return len(texts) / elapsed if elapsed > 0 else 0.0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Export ONNX/int8 des modèles")
+    parser.add_argument("--sample", default="data/raw/kaggle_tweets/file_source_tweets.csv",
+                        help="CSV de textes pour le contrôle de précision (colonne text)")
+    parser.add_argument("--limit", type=int, default=500, help="Nombre de textes du contrôle")
+    parser.add_argument("--no-quantize", action="store_true", help="Ne pas quantifier en int8")
+    parser.add_argument("--output", default=None, help="Rapport JSON (défaut: <onnx_cache_dir>/report.json)")
+
+    args = parser.parse_args()
+
+    settings.inference_backend = "onnx"
+    settings.onnx_quantize = not args.no_quantize
+
+    from app.backend.ai.embeddings import EmbeddingEngine
+    from app.backend.ai.emotion_classifier import EmotionClassifier
+    from app.backend.ai.onnx_backend import (
+        compare_embedding_backends,
+        compare_emotion_backends,
+        is_onnx_available,
+    )
+
+    if not is_onnx_available():
+        print("ERROR: onnxruntime n'est pas installé")
+        return 1
+
+    texts = pd.read_csv(args.sample)["text"].dropna().astype(str).head(args.limit).tolist()
+    print(f"LOADING: {len(texts)} textes de contrôle depuis {args.sample}")
+
+    report = {"quantized": settings.onnx_quantize, "samples": len(texts)}
+
+    # Modèle d'émotions
+    classifier = EmotionClassifier()
+    if classifier.onnx_model is None:
+        print("ERROR: Export ONNX du modèle d'émotions impossible")
+        return 1
+
+    # Débit brut des deux backends: sans cache de prédictions ni cascade lexicale
+    def classify_raw(batch: list[str]):
+        return classifier._classify_uncached(classifier._clean_batch(batch))
+
+    onnx_model = classifier.onnx_model
+    onnx_speed = measure_throughput(classify_raw, texts)
+    classifier.onnx_model = None
+    classifier.cache_namespace = classifier._get_cache_namespace()
+    torch_speed = measure_throughput(classify_raw, texts)
+    classifier.onnx_model = onnx_model
+    classifier.cache_namespace = classifier._get_cache_namespace()
+
+    report["emotion"] = {
+        "model": classifier.model_name,
+        "artifact": str(onnx_model.model_path),
+        **compare_emotion_backends(classifier, texts),
+        "torch_texts_per_s": torch_speed,
+        "onnx_texts_per_s": onnx_speed,
+        "speedup": onnx_speed / torch_speed if torch_speed else None
+    }
+
+    # Modèle d'embeddings
+    engine = EmbeddingEngine()
+    if engine.onnx_encoder is not None:
+        cleaned = [text for text in (engine._clean_text(t) for t in texts) if text]
+        torch_speed = measure_throughput(lambda batch: engine.model.encode(batch, convert_to_numpy=True), cleaned)
+        onnx_speed = measure_throughput(engine.onnx_encoder.encode, cleaned)
+
+        report["embedding"] = {
+            "model": engine.model_name,
+            "artifact": str(engine.onnx_encoder.model_path),
+            **compare_embedding_backends(engine, texts),
+            "torch_texts_per_s": torch_speed,
+            "onnx_texts_per_s": onnx_speed,
+            "speedup": onnx_speed / torch_speed if torch_speed else None
+        }
+    else:
+        print("WARNING: Export ONNX du modèle d'embeddings impossible")
+
+    output_path = Path(args.output or Path(settings.onnx_cache_dir) / "report.json")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"SUCCESS: Rapport écrit dans {output_path}")
+
+    agreement = report["emotion"].get("label_agreement", 0.0)
+    if agreement < 0.99:
+        print(f"WARNING: Accord des labels {agreement:.3f} < 0.99 - garder inference_backend=torch")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -6,17 +6,19 @@ Chargement des données agrégées dans la base relationnelle
 
 Usage:
   python scripts/load_aggregated_to_db.py --input data/processed/integrated_all_sources_*.json
+  python scripts/load_aggregated_to_db.py --input ... --mode orm   # chargement ORM ligne à ligne
 """
 
 import argparse
-import json
 
 # Import du schéma mis à jour
 import sys
+from collections.abc import Iterable
 from datetime import UTC, datetime
 from pathlib import Path
+from typing import Any
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, func, insert, select, tuple_
 from sqlalchemy.orm import sessionmaker
 
 sys.path.append(str(Path(__file__).parent.parent))
@@ -28,6 +30,7 @@ from app.backend.models.schema import (
     DimPays,
     Source,
 )
+from scripts.aggregate_sources import iter_json_records
 
 
 def get_or_create_dimension(session, model_class, name_field: str, name_value: str, **kwargs):
@@ -40,8 +43,171 @@ def get_or_create_dimension(session, model_class, name_field: str, name_value: s
     return instance
 
 
-def load_aggregated_data(input_file: Path) -> int:
-    """Charge les données agrégées dans la base relationnelle"""
+def parse_datetime(value: Any) -> datetime:
+    """Parse une date ISO (fallback: maintenant UTC)"""
+    if value and value != "None":
+        try:
+            return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            pass
+    return datetime.now(UTC)
+
+
+class DimensionCache:
+    """Cache mémoire nom -> id d'une table de dimension (créée à la demande)"""
+
+    def __init__(self, connection, model_class, name_field: str = "nom"):
+        self.table = model_class.__table__
+        self.name_field = name_field
+        rows = connection.execute(select(self.table.c.id, self.table.c[name_field]))
+        self.ids = {name: dim_id for dim_id, name in rows}
+
+    def get_id(self, connection, name_value: str, **kwargs) -> int:
+        dim_id = self.ids.get(name_value)
+        if dim_id is None:
+            result = connection.execute(insert(self.table).values(**{self.name_field: name_value, **kwargs}))
+            dim_id = result.inserted_primary_key[0]
+            self.ids[name_value] = dim_id
+        return dim_id
+
+
+# Limite de variables SQLite par requête
+LOOKUP_CHUNK = 500
+
+
+def existing_content_keys(connection, keys: list[tuple[str, str]]) -> set[tuple[str, str]]:
+    """Clés (url, titre) déjà présentes en base parmi celles d'un chunk"""
+    contenus = Contenu.__table__
+    found = set()
+    for start in range(0, len(keys), LOOKUP_CHUNK):
+        chunk = keys[start:start + LOOKUP_CHUNK]
+        found.update(connection.execute(
+            select(contenus.c.url, contenus.c.titre).where(tuple_(contenus.c.url, contenus.c.titre).in_(chunk))
+        ).tuples())
+    return found
+
+
+def print_load_stats(total: int, source_stats: dict[str, int], sentiment_stats: dict[str, int]):
+    """Affiche les statistiques de chargement"""
+    print("\nSTATS par source:")
+    for source, count in sorted(source_stats.items()):
+        print(f"   • {source}: {count} enregistrements")
+
+    print("\nDISTRIBUTION des sentiments:")
+    for sentiment, count in sorted(sentiment_stats.items()):
+        percentage = (count / total) * 100 if total else 0.0
+        print(f"   • {sentiment}: {count} ({percentage:.1f}%)")
+
+
+def load_records_bulk(engine, records: Iterable[dict[str, Any]], chunk_size: int = 5000) -> dict[str, Any]:
+    """
+    Chargement en masse: dimensions préchargées en mémoire, doublons (url, titre)
+    vérifiés en base chunk par chunk (mémoire bornée par chunk_size, les chunks
+    précédents du fichier sont déjà insérés), insertions Core executemany
+    par transactions de chunk_size lignes
+    """
+    contenus = Contenu.__table__
+    source_stats = {}
+    sentiment_stats = {}
+    inserted = 0
+    skipped = 0
+
+    with engine.connect() as connection:
+        pays_cache = DimensionCache(connection, DimPays)
+        domaine_cache = DimensionCache(connection, DimDomaine)
+        humeur_cache = DimensionCache(connection, DimHumeur)
+        source_cache = DimensionCache(connection, Source)
+
+    def flush(batch: list[dict[str, Any]]) -> int:
+        """Écarte les doublons, résout les dimensions et insère un chunk dans une seule transaction"""
+        nonlocal skipped
+        with engine.begin() as connection:
+            seen = existing_content_keys(
+                connection, list(dict.fromkeys((record.get("url", ""), record.get("titre", "")) for record in batch))
+            )
+            rows = []
+            for record in batch:
+                key = (record.get("url", ""), record.get("titre", ""))
+                if key in seen:
+                    skipped += 1
+                    continue
+                seen.add(key)
+
+                source_stats[record["source"]] = source_stats.get(record["source"], 0) + 1
+                sentiment_stats[record["sentiment"]] = sentiment_stats.get(record["sentiment"], 0) + 1
+                pays = record.get("pays", "FR")
+                humeur_cache.get_id(connection, record["sentiment"])
+                rows.append({
+                    "source_id": source_cache.get_id(connection, record["source"], type=record["source_type"], url_base=""),
+                    "pays_id": pays_cache.get_id(connection, pays, code_iso=pays),
+                    "domaine_id": domaine_cache.get_id(connection, record.get("domaine", "inconnu")),
+                    "url": record.get("url", ""),
+                    "titre": record.get("titre", ""),
+                    "resume": record.get("resume", ""),
+                    "texte": record.get("texte", ""),
+                    "publication_date": parse_datetime(record.get("publication_date")),
+                    "auteur": record.get("auteur", ""),
+                    "langue": record.get("langue", "fr"),
+                    "collected_at": parse_datetime(record.get("collected_at")),
+                    "sentiment": record["sentiment"],
+                    "confidence": record.get("confidence", 0.0),
+                    "themes": record.get("themes", ""),
+                    "source_type": record["source_type"]
+                })
+            if rows:
+                connection.execute(insert(contenus), rows)
+            return len(rows)
+
+    batch = []
+    for record in records:
+        record["sentiment"] = record.get("sentiment", "neutre") or "neutre"
+        record["source"] = record.get("source", "Unknown")
+        record["source_type"] = record.get("source_type", "web")
+        batch.append(record)
+
+        if len(batch) >= chunk_size:
+            inserted += flush(batch)
+            batch = []
+
+    if batch:
+        inserted += flush(batch)
+
+    return {
+        "inserted": inserted,
+        "skipped": skipped,
+        "source_stats": source_stats,
+        "sentiment_stats": sentiment_stats
+    }
+
+
+def load_aggregated_data_bulk(input_file: Path, chunk_size: int = 5000) -> int:
+    """Charge les données agrégées en mode bulk"""
+    engine = create_engine("sqlite:///semantic_pulse.db")
+    Base.metadata.create_all(engine)
+
+    try:
+        # Lecture en flux: la mémoire ne dépend pas de la taille du fichier
+        print(f"LOADING: Chargement bulk (flux) de {input_file}")
+        stats = load_records_bulk(engine, iter_json_records(input_file), chunk_size=chunk_size)
+
+        print(f"SUCCESS: {stats['inserted']} enregistrements insérés, {stats['skipped']} existants ignorés")
+        print_load_stats(stats["inserted"], stats["source_stats"], stats["sentiment_stats"])
+
+        with engine.connect() as connection:
+            total_contenus = connection.execute(select(func.count()).select_from(Contenu.__table__)).scalar()
+        print(f"\nDATABASE: Total en base: {total_contenus} contenus")
+
+        return 0
+
+    except Exception as e:
+        print(f"ERROR: Erreur lors du chargement: {e}")
+        return 1
+    finally:
+        engine.dispose()
+
+
+def load_aggregated_data(input_file: Path, chunk_size: int = 5000) -> int:
+    """Charge les données agrégées dans la base relationnelle (ORM, lecture en flux)"""
 
     # Connexion à la base
     engine = create_engine("sqlite:///semantic_pulse.db")
@@ -50,17 +216,16 @@ def load_aggregated_data(input_file: Path) -> int:
     session = Session()
 
     try:
-        # Charger les données JSON
-        with input_file.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        print(f"LOADING: Chargement de {len(data)} enregistrements")
+        # Lecture en flux: la mémoire ne dépend pas de la taille du fichier
+        print(f"LOADING: Chargement ORM (flux) de {input_file}")
 
         # Statistiques par source
         source_stats = {}
         sentiment_stats = {}
+        inserted = 0
+        pending = 0
 
-        for record in data:
+        for record in iter_json_records(input_file):
             # Récupérer ou créer les dimensions
             pays = get_or_create_dimension(session, DimPays, "nom", record.get("pays", "FR"),
                                          code_iso=record.get("pays", "FR"))
@@ -76,7 +241,7 @@ def load_aggregated_data(input_file: Path) -> int:
             source = get_or_create_dimension(session, Source, "nom", source_name,
                                            type=source_type, url_base="")
 
-            # Vérifier si l'enregistrement existe déjà
+            # Vérifier si l'enregistrement existe déjà (autoflush: inclut les ajouts non validés)
             existing = session.query(Contenu).filter_by(
                 url=record.get("url", ""),
                 titre=record.get("titre", "")
@@ -95,10 +260,10 @@ def load_aggregated_data(input_file: Path) -> int:
                 titre=record.get("titre", ""),
                 resume=record.get("resume", ""),
                 texte=record.get("texte", ""),
-                publication_date=datetime.fromisoformat(record.get("publication_date", "").replace("Z", "+00:00")) if record.get("publication_date") and record.get("publication_date") != "None" else datetime.now(UTC),
+                publication_date=parse_datetime(record.get("publication_date")),
                 auteur=record.get("auteur", ""),
                 langue=record.get("langue", "fr"),
-                collected_at=datetime.fromisoformat(record.get("collected_at", "").replace("Z", "+00:00")) if record.get("collected_at") and record.get("collected_at") != "None" else datetime.now(UTC),
+                collected_at=parse_datetime(record.get("collected_at")),
                 # Champs GDELT
                 sentiment=sentiment,
                 confidence=record.get("confidence", 0.0),
@@ -107,25 +272,24 @@ def load_aggregated_data(input_file: Path) -> int:
             )
 
             session.add(contenu)
+            inserted += 1
+            pending += 1
 
             # Statistiques
             source_stats[source_name] = source_stats.get(source_name, 0) + 1
             sentiment_stats[sentiment] = sentiment_stats.get(sentiment, 0) + 1
 
+            # Commit par chunk: la session ne retient pas tout le fichier
+            if pending >= chunk_size:
+                session.commit()
+                session.expunge_all()
+                pending = 0
+
         # Commit des changements
         session.commit()
 
-        print(f"SUCCESS: {len(data)} enregistrements chargés avec succès")
-
-        # Afficher les statistiques
-        print("\nSTATS par source:")
-        for source, count in sorted(source_stats.items()):
-            print(f"   • {source}: {count} enregistrements")
-
-        print("\nDISTRIBUTION des sentiments:")
-        for sentiment, count in sorted(sentiment_stats.items()):
-            percentage = (count / len(data)) * 100
-            print(f"   • {sentiment}: {count} ({percentage:.1f}%)")
+        print(f"SUCCESS: {inserted} enregistrements chargés avec succès")
+        print_load_stats(inserted, source_stats, sentiment_stats)
 
         # Vérifier les données en base
         total_contenus = session.query(Contenu).count()
@@ -143,7 +307,9 @@ def load_aggregated_data(input_file: Path) -> int:
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Chargement données agrégées en base")
-    parser.add_argument("--input", required=True, help="Fichier JSON agrégé")
+    parser.add_argument("--input", required=True, help="Fichier JSON (tableau) ou JSON Lines agrégé")
+    parser.add_argument("--mode", choices=["bulk", "orm"], default="bulk", help="Mode de chargement")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Lignes par transaction")
 
     args = parser.parse_args()
 
@@ -152,7 +318,9 @@ def main() -> int:
         print(f"ERROR: Fichier introuvable: {input_path}")
         return 1
 
-    return load_aggregated_data(input_path)
+    if args.mode == "orm":
+        return load_aggregated_data(input_path, chunk_size=args.chunk_size)
+    return load_aggregated_data_bulk(input_path, chunk_size=args.chunk_size)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Distillation du modèle d'émotions rapide (n-grammes hachés + régression logistique)
+- Labels enseignants: EmotionClassifier (transformer) sur notre propre corpus
+- Modèle sauvegardé dans settings.fast_emotion_model_path, rapport JSON à côté
+- Rapport: accord avec l'enseignant (jeu de test) et débit comparé (textes/s)
+
+Usage:
+  python scripts/train_fast_emotion_model.py --input data/raw/kaggle_tweets/file_source_tweets.csv
+  python scripts/train_fast_emotion_model.py --input data/processed/*.parquet --teacher-labels data/models/teacher_labels.parquet
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+from app.backend.ai.fast_emotion import FastEmotionModel, evaluate_against_teacher
+from app.backend.core.config import settings
+
+TEXT_COLUMNS = ["text", "texte", "resume", "titre"]
+
+
+def load_texts(paths: list[str], limit: int | None = None) -> list[str]:
+    """Charge les textes (CSV, Parquet, JSON/JSON Lines) depuis la première colonne texte trouvée"""
+    texts = []
+    for path in paths:
+        suffix = Path(path).suffix.lower()
+        if suffix == ".csv":
+            df = pd.read_csv(path)
+        elif suffix == ".parquet":
+            df = pd.read_parquet(path)
+        elif suffix in (".jsonl", ".ndjson"):
+            df = pd.read_json(path, lines=True)
+        else:
+            df = pd.read_json(path)
+
+        column = next((c for c in TEXT_COLUMNS if c in df.columns), None)
+        if column is None:
+            print(f"WARNING: Aucune colonne texte dans {path}")
+            continue
+        texts.extend(df[column].dropna().astype(str).tolist())
+
+    texts = [text for text in dict.fromkeys(texts) if text.strip()]
+    return texts[:limit] if limit else texts
+
+
+def label_with_teacher(texts: list[str], cache_path: Path | None) -> tuple[list[str], float]:
+    """Labels du transformer (réutilise le cache parquet si présent), débit enseignant"""
+    if cache_path and cache_path.exists():
+        cached = pd.read_parquet(cache_path)
+        known = dict(zip(cached["text"], cached["label"], strict=False))
+    else:
+        known = {}
+
+    missing = [text for text in texts if text not in known]
+    teacher_speed = None
+
+    if missing:
+        from app.backend.ai.emotion_classifier import EmotionClassifier
+
+        teacher = EmotionClassifier()
+        # Modèle appelé directement: ni cache de prédictions ni cascade dans la mesure du débit
+        start = time.perf_counter()
+        computed = teacher._classify_uncached(teacher._clean_batch(missing))
+        elapsed = time.perf_counter() - start
+        teacher_speed = len(missing) / elapsed if elapsed > 0 else None
+
+        neutral = teacher._get_neutral_emotion()
+        known.update({text: computed.get(i, neutral)['emotion_principale'] for i, text in enumerate(missing)})
+        if cache_path:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            pd.DataFrame({"text": list(known), "label": list(known.values())}).to_parquet(cache_path, index=False)
+
+    return [known[text] for text in texts], teacher_speed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Distillation du modèle d'émotions rapide")
+    parser.add_argument("--input", nargs="+", default=["data/raw/kaggle_tweets/file_source_tweets.csv"],
+                        help="Fichiers corpus (CSV, Parquet, JSON)")
+    parser.add_argument("--limit", type=int, default=None, help="Nombre maximum de textes")
+    parser.add_argument("--teacher-labels", default=None, help="Cache parquet des labels enseignants")
+    parser.add_argument("--test-size", type=float, default=0.1, help="Part réservée à l'évaluation")
+    parser.add_argument("--epochs", type=int, default=5, help="Passes SGD")
+    parser.add_argument("--output", default=settings.fast_emotion_model_path, help="Chemin du modèle (.npz)")
+
+    args = parser.parse_args()
+
+    texts = load_texts(args.input, args.limit)
+    if len(texts) < 10:
+        print("ERROR: Corpus insuffisant pour la distillation")
+        return 1
+    print(f"LOADING: {len(texts)} textes uniques")
+
+    cache_path = Path(args.teacher_labels) if args.teacher_labels else None
+    labels, teacher_speed = label_with_teacher(texts, cache_path)
+
+    order = np.random.default_rng(42).permutation(len(texts))
+    n_test = max(1, int(len(texts) * args.test_size))
+    test_ids, train_ids = order[:n_test], order[n_test:]
+
+    start = time.perf_counter()
+    model = FastEmotionModel().fit([texts[i] for i in train_ids], [labels[i] for i in train_ids], epochs=args.epochs)
+    train_seconds = time.perf_counter() - start
+
+    report = evaluate_against_teacher(model, [texts[i] for i in test_ids], [labels[i] for i in test_ids])
+    report.update({
+        "train_samples": len(train_ids),
+        "train_seconds": train_seconds,
+        "labels": model.labels,
+        "n_features": model.n_features,
+        "teacher_texts_per_second": teacher_speed
+    })
+    if teacher_speed and report["texts_per_second"]:
+        report["speedup"] = report["texts_per_second"] / teacher_speed
+
+    model_path = model.save(args.output)
+    report_path = model_path.with_suffix(".report.json")
+    report_path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"SUCCESS: Modèle rapide sauvegardé dans {model_path} (rapport: {report_path})")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())